@@ -14,9 +14,11 @@ Each peer runs as a web application with HTML UI.
 import socket
 import threading
 import argparse
+import asyncio
 import json
 import time
 from daemon.weaprous import WeApRous
+from daemon.timers import default_wheel, socket_deadline
 
 # Peer configuration
 peer_config = {
@@ -98,8 +100,12 @@ def send_p2p_message(peer_ip, peer_port, message_data):
 
 def handle_p2p_connection(conn, addr):
     """Handle incoming P2P connection."""
+    # A peer that never sends or never reads must not hold the thread
+    deadline = socket_deadline(default_wheel(), conn)
     try:
+        deadline.start("header")
         request = conn.recv(2048).decode()
+        deadline.start("write")
         if '\r\n\r\n' in request:
             # Parse request line to get path
             lines = request.split('\r\n')
@@ -166,8 +172,12 @@ def handle_p2p_connection(conn, addr):
             response = "HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n\r\n{}"
             conn.sendall(response.format(json.dumps({'status': 'ok'})).encode())
     except Exception as e:
-        print("[Peer] P2P error: {}".format(e))
+        if deadline.expired:
+            print("[Peer] P2P connection from {} timed out".format(addr))
+        else:
+            print("[Peer] P2P error: {}".format(e))
     finally:
+        deadline.stop()
         conn.close()
 
 def start_p2p_listener():
@@ -462,7 +472,7 @@ def get_channels(headers="guest", body="anonymous"):
     return json.dumps(result)
 
 @app.route('/api/messages/poll', methods=['GET'])
-def poll_messages(headers="guest", body="anonymous"):
+async def poll_messages(headers="guest", body="anonymous"):
     """Long polling endpoint for real-time message notifications.
     
     Holds the connection open until:
@@ -470,6 +480,8 @@ def poll_messages(headers="guest", body="anonymous"):
     2. Timeout reached (30 seconds)
     
     This enables real-time notifications with minimal network overhead.
+    Written as a coroutine so the asyncio engine can hold many pending
+    polls without a thread each.
     """
     global message_update_flag, message_lock
     
@@ -492,7 +504,7 @@ def poll_messages(headers="guest", body="anonymous"):
                 })
         
         # Sleep briefly to avoid busy waiting
-        time.sleep(0.5)
+        await asyncio.sleep(0.5)
     
     # Timeout reached, no new messages
     return json.dumps({
@@ -519,6 +531,8 @@ if __name__ == "__main__":
     parser.add_argument('--peer-port', type=int, required=True)
     parser.add_argument('--server-ip', default='127.0.0.1')
     parser.add_argument('--server-port', type=int, default=8000)
+    parser.add_argument('--engine', choices=['thread', 'pool', 'asyncio'],
+                        default='thread')
     
     args = parser.parse_args()
     
@@ -554,4 +568,4 @@ if __name__ == "__main__":
         args.username, args.peer_port))
     print("[Peer] P2P Port: {}".format(args.peer_port + 1000))
     print("=" * 60)
-    app.run()
\ No newline at end of file
+    app.run(engine=args.engine)
\ No newline at end of file
@@ -0,0 +1,212 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.admission
+~~~~~~~~~~~~~~~~~
+
+This module provides admission control for the backend accept loop.
+
+Under overload it is better to refuse the excess connections right away than
+to let every client wait longer. The :class:`AdmissionController
+<AdmissionController>` caps the number of connections in flight and sheds
+connections that waited too long in the worker pool queue. Refused clients
+receive a prebuilt ``503 Service Unavailable`` with ``Retry-After``, so
+shedding costs one ``sendall``. Every shed connection is counted by reason.
+
+``max_inflight`` caps the open connections, idle keep-alive ones included:
+with the thread and pool engines an idle connection holds its thread until
+the keep-alive timeout closes it, so it is counted like a busy one.
+
+A shed connection is not closed at once: closing a socket whose request
+was not read makes the kernel reset the connection, and the client may
+then lose the 503. The write side is shut down after the reply, and the
+socket is closed ``SHED_LINGER`` seconds later, once the request is read
+and dropped, from a timer so the accept loop never waits.
+
+Usage Example:
+--------------
+>>> admission = AdmissionController(max_inflight=200, max_queue_time=0.5,
+>>>                                 schedule=timers.schedule)
+>>> if admission.try_admit():
+>>>     try:
+>>>         serve(conn)
+>>>     finally:
+>>>         admission.release()
+>>> else:
+>>>     admission.shed(conn, "inflight")
+"""
+
+import socket
+import threading
+
+from .shutdown import LINGER_TIMEOUT, discard_input, linger_close
+
+#: Seconds between the 503 of a shed connection and its close.
+SHED_LINGER = LINGER_TIMEOUT
+
+
+def build_shed_response(retry_after):
+    """
+    Builds the 503 reply sent to shed connections.
+
+    :param retry_after (int): seconds the client should wait before retrying.
+
+    :rtype bytes: complete HTTP response.
+    """
+    body = "503 Service Unavailable"
+    return (
+        "HTTP/1.1 503 Service Unavailable\r\n"
+        "Content-Type: text/plain\r\n"
+        "Content-Length: {}\r\n"
+        "Retry-After: {}\r\n"
+        "Cache-Control: no-store\r\n"
+        "Connection: close\r\n"
+        "\r\n"
+        "{}"
+    ).format(len(body), retry_after, body).encode('utf-8')
+
+
+class AdmissionController:
+    """
+    The :class:`AdmissionController <AdmissionController>` deciding which
+    connections are served.
+
+    :attrs max_inflight (int): connections open at once, idle keep-alive
+                               ones included, 0 for no limit.
+    :attrs max_queue_time (float): seconds a connection may wait for a worker, 0 for no limit.
+    :attrs retry_after (int): value of the ``Retry-After`` header of shed replies.
+    :attrs admitted (int): connections admitted so far.
+    :attrs shed_counts (dict): shed connection counts keyed by reason.
+    """
+
+    __attrs__ = [
+        "max_inflight",
+        "max_queue_time",
+        "retry_after",
+        "admitted",
+        "shed_counts",
+    ]
+
+    def __init__(self, max_inflight=0, max_queue_time=0, retry_after=1, schedule=None):
+        """
+        Initialize a new AdmissionController instance.
+
+        :param max_inflight (int): connections open at once, 0 for no limit.
+        :param max_queue_time (float): seconds a queued connection may wait, 0 for no limit.
+        :param retry_after (int): ``Retry-After`` seconds advertised to shed clients.
+        :param schedule (callable): ``schedule(delay, callback)`` of a
+                                    :class:`TimerWheel <daemon.timers.TimerWheel>`,
+                                    closing shed connections later; without
+                                    it :meth:`shed` waits for them.
+        """
+        self.max_inflight = max_inflight
+        self.max_queue_time = max_queue_time
+        self.retry_after = retry_after
+        self.schedule = schedule
+        #: Counters
+        self.admitted = 0
+        self.shed_counts = {"inflight": 0, "queue_full": 0, "queue_time": 0}
+
+        #: Prebuilt reply, shedding must stay cheaper than serving
+        self.response = build_shed_response(retry_after)
+        self._inflight = 0
+        self._lock = threading.Lock()
+
+    def try_admit(self):
+        """
+        Reserve an in-flight slot for a new connection.
+
+        :rtype bool: True if the connection may be served; the caller must
+                     then call :meth:`release` when it is done.
+        """
+        with self._lock:
+            if self.max_inflight and self._inflight >= self.max_inflight:
+                return False
+            self._inflight += 1
+            self.admitted += 1
+            return True
+
+    def release(self):
+        """Free the in-flight slot of a finished connection."""
+        with self._lock:
+            self._inflight -= 1
+
+    def inflight(self):
+        """
+        Number of connections currently open, served, queued or idle.
+
+        :rtype int: in-flight connection count.
+        """
+        return self._inflight
+
+    def record_shed(self, reason):
+        """
+        Count a shed connection.
+
+        :param reason (str): one of ``inflight``, ``queue_full``, ``queue_time``.
+
+        :rtype int: total number of shed connections.
+        """
+        with self._lock:
+            self.shed_counts[reason] = self.shed_counts.get(reason, 0) + 1
+            total = sum(self.shed_counts.values())
+        print("[Admission] Shedding connection ({}), {} shed so far".format(reason, total))
+        return total
+
+    def shed(self, conn, reason):
+        """
+        Answer a refused connection with the prebuilt 503 and close it
+        without a reset, ``SHED_LINGER`` seconds later.
+
+        :param conn (socket.socket): client connection socket.
+        :param reason (str): one of ``inflight``, ``queue_full``, ``queue_time``.
+        """
+        self.record_shed(reason)
+        if self.schedule is None:
+            try:
+                conn.sendall(self.response)
+            except OSError:
+                conn.close()
+                return
+            linger_close(conn, SHED_LINGER)
+            return
+        try:
+            conn.sendall(self.response)
+            conn.shutdown(socket.SHUT_WR)
+        except OSError:
+            conn.close()
+            return
+        self.schedule(SHED_LINGER, lambda: self._close_shed(conn))
+
+    def _close_shed(self, conn):
+        try:
+            discard_input(conn)
+        except OSError:
+            pass
+        finally:
+            conn.close()
+
+    def stats(self):
+        """
+        Snapshot of the admission counters.
+
+        :rtype dict: limits, in-flight count, admitted and shed counts.
+        """
+        with self._lock:
+            return {
+                "max_inflight": self.max_inflight,
+                "max_queue_time": self.max_queue_time,
+                "inflight": self._inflight,
+                "admitted": self.admitted,
+                "shed": dict(self.shed_counts),
+            }
@@ -0,0 +1,262 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.assets
+~~~~~~~~~~~~~~~~~
+
+This module provides the index of the static assets served by the backend.
+
+At startup the asset folders (www/, static/ and apps/) are walked once and
+every servable file is recorded under the URL path it answers, with its
+absolute path, content type, size and validators. Serving a static request
+is then one dict lookup instead of a MIME guess, a chain of folder rules
+and a path join, and an unknown path is a 404 without touching the disk.
+The index is rebuilt by a background thread when it is older than
+``refresh_interval`` seconds, so added, removed or edited files are picked
+up while the server runs without a request ever waiting for the walk. The
+size and validators of an entry are those of the last walk: the response
+builder stats the file itself before sending it.
+
+Precompressed ``.gz`` files are not assets of their own, they are read by
+the :class:`Compressor <daemon.compression.Compressor>` as variants of the
+file they sit next to.
+
+The URL of a file follows the folder rules of the original server:
+HTML pages live in www/, CSS and plain text in static/, icons in
+static/images/, other images anywhere below the base directory, and
+``application/*`` objects in apps/.
+
+Usage Example:
+--------------
+>>> index = AssetIndex()
+>>> asset = index.lookup("/css/chat.css")
+>>> asset.path, asset.content_type, asset.size, asset.etag
+"""
+
+import mimetypes
+import os
+import threading
+import time
+
+from .cache import file_validators
+
+#: Folders scanned for assets, relative to the base directory.
+ASSET_DIRS = ("www", "static", "apps")
+
+
+def guess_mime_type(path):
+    """
+    Determines the MIME type of a file based on its path.
+
+    :param path (str): path or URL of the file.
+
+    :rtype str: MIME type string, ``application/octet-stream`` when unknown.
+    """
+    try:
+        mime_type, _ = mimetypes.guess_type(path)
+    except Exception:
+        return 'application/octet-stream'
+    return mime_type or 'application/octet-stream'
+
+
+def content_location(path, mime_type):
+    """
+    Applies the folder rules of the static server to one object.
+
+    :param path (str): path or URL of the object.
+    :param mime_type (str): MIME type of the object.
+
+    :rtype tuple: (folder relative to the base directory, Content-Type),
+                  or None if such objects are not served.
+    """
+    if path.endswith('.html') or mime_type == 'text/html':
+        return "www/", 'text/html'
+    main_type, _, sub_type = mime_type.partition('/')
+    if main_type == 'text' and sub_type in ('plain', 'css'):
+        return "static/", mime_type
+    if main_type == 'image':
+        if sub_type == 'x-icon':
+            return "static/images/", mime_type
+        return "", mime_type
+    if main_type == 'application' and sub_type != 'octet-stream':
+        return "apps/", mime_type
+    return None
+
+
+class Asset:
+    """
+    One servable file of the :class:`AssetIndex <AssetIndex>`.
+
+    :attrs url (str): URL path answered by the file.
+    :attrs path (str): absolute path of the file.
+    :attrs content_type (str): value of the Content-Type header.
+    :attrs size (int): file size at the last scan.
+    :attrs etag (str): quoted entity tag at the last scan.
+    :attrs last_modified (str): modification time at the last scan, as an HTTP date.
+    """
+
+    __attrs__ = [
+        "url",
+        "path",
+        "content_type",
+        "size",
+        "etag",
+        "last_modified",
+    ]
+
+    def __init__(self, url, path, content_type, st):
+        self.url = url
+        self.path = path
+        self.content_type = content_type
+        self.size = st.st_size
+        self.etag, self.last_modified = file_validators(st)
+
+
+class AssetIndex:
+    """
+    The :class:`AssetIndex <AssetIndex>` mapping URL paths to static files.
+
+    :attrs base_dir (str): directory holding the asset folders.
+    :attrs refresh_interval (float): seconds before the index is rebuilt.
+    :attrs scans (int): number of times the folders were walked.
+    """
+
+    __attrs__ = [
+        "base_dir",
+        "refresh_interval",
+        "scans",
+    ]
+
+    def __init__(self, base_dir="", refresh_interval=2.0):
+        """
+        Initialize a new AssetIndex instance. Nothing is scanned until the
+        first :meth:`refresh` or :meth:`lookup`.
+
+        :param base_dir (str): directory holding www/, static/ and apps/.
+        :param refresh_interval (float): seconds before the index is rebuilt,
+                                         0 to scan only once.
+        """
+        self.base_dir = base_dir
+        self.refresh_interval = refresh_interval
+        self.scans = 0
+
+        self._assets = {}
+        self._scanned = None
+        self._lock = threading.Lock()
+        #: A background rebuild was started and has not finished yet
+        self._refreshing = False
+
+    def lookup(self, url):
+        """
+        Find the file answering a URL path.
+
+        :param url (str): request path, e.g. ``/index.html``.
+
+        :rtype Asset: the asset, or None for an unknown path.
+        """
+        scanned = self._scanned
+        if scanned is None:
+            self.refresh(force=False)
+        elif self.refresh_interval and time.monotonic() - scanned >= self.refresh_interval:
+            self.refresh_later()
+        return self._assets.get(url)
+
+    def refresh_later(self):
+        """
+        Rebuild the index in a background thread, unless a rebuild is
+        already running; lookups keep using the current index meanwhile.
+        """
+        if not self._lock.acquire(blocking=False):
+            # A rebuild holds the lock
+            return
+        try:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        finally:
+            self._lock.release()
+        threading.Thread(target=self._refresh_background, name="AssetIndex",
+                         daemon=True).start()
+
+    def _refresh_background(self):
+        try:
+            self.refresh(force=False)
+        except Exception as e:
+            print("[AssetIndex] Refresh failed: {}".format(e))
+        finally:
+            self._refreshing = False
+
+    def refresh(self, force=True):
+        """
+        Rebuild the index from the asset folders.
+
+        :param force (bool): scan even if another thread just did.
+
+        :rtype int: number of indexed assets.
+        """
+        with self._lock:
+            scanned = self._scanned
+            if not force and scanned is not None and (
+                    not self.refresh_interval
+                    or time.monotonic() - scanned < self.refresh_interval):
+                return len(self._assets)
+            # Built aside, then swapped in one assignment for the readers
+            self._assets = self.scan()
+            self._scanned = time.monotonic()
+            self.scans += 1
+            return len(self._assets)
+
+    def scan(self):
+        """
+        Walk the asset folders.
+
+        :rtype dict: URL path -> :class:`Asset <Asset>`.
+        """
+        assets = {}
+        base = os.path.abspath(self.base_dir or os.curdir)
+        for folder in ASSET_DIRS:
+            for dirpath, dirnames, filenames in os.walk(os.path.join(base, folder)):
+                # Bytecode caches and hidden folders are never served
+                dirnames[:] = [d for d in dirnames
+                               if d != '__pycache__' and not d.startswith('.')]
+                for name in filenames:
+                    if mimetypes.guess_type(name)[1] is not None:
+                        # Precompressed variant, e.g. chat.css.gz
+                        continue
+                    path = os.path.join(dirpath, name)
+                    location = content_location(name, guess_mime_type(name))
+                    if location is None:
+                        continue
+                    root = os.path.join(base, location[0])
+                    rel = os.path.relpath(path, root)
+                    if rel.startswith(os.pardir):
+                        # Outside the folder its type is served from
+                        continue
+                    try:
+                        st = os.stat(path)
+                    except OSError:
+                        continue
+                    url = "/" + rel.replace(os.sep, "/")
+                    assets[url] = Asset(url, path, location[1], st)
+        return assets
+
+    def stats(self):
+        """
+        Snapshot of the index counters.
+
+        :rtype dict: asset count and scan count.
+        """
+        return {
+            "assets": len(self._assets),
+            "scans": self.scans,
+        }
@@ -0,0 +1,279 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.asyncbackend
+~~~~~~~~~~~~~~~~~
+
+This module provides the asyncio serving engine of the backend daemon.
+
+All connections are served by a single event loop, which runs the same
+parse -> hook/static -> respond pipeline as the threaded engines through
+:meth:`HttpAdapter.handle_request_async`. An idle or long-polling client
+therefore costs a socket and a coroutine instead of an OS thread.
+
+Hooks written with ``async def`` run directly on the loop; plain hooks and
+the static file pipeline may block, so they are dispatched to a bounded
+thread executor.
+
+Usage Example:
+--------------
+>>> create_backend("127.0.0.1", 9000, routes={}, engine="asyncio")
+
+"""
+
+import asyncio
+import concurrent.futures
+import time
+
+from .httpadapter import HttpAdapter
+from .reader import AsyncHttpReader
+from .response import SegmentedResponse
+from .timers import Deadline, phase_timeouts
+from .shutdown import LINGER_LIMIT, LINGER_TIMEOUT
+
+
+async def handle_client(ip, port, reader, writer, routes, settings, drainer=None):
+    """
+    Serve one client connection on the event loop, including the further
+    requests of a persistent connection. Pipelined requests wait in the
+    stream buffer and are answered in order. The phase timeouts are armed
+    with ``loop.call_later``, the event loop's own timer heap, and abort
+    the transport when they expire.
+
+    :param ip (str): IP address of the server.
+    :param port (int): Port number the server is listening on.
+    :param reader (asyncio.StreamReader): stream reading from the client.
+    :param writer (asyncio.StreamWriter): stream writing to the client.
+    :param routes (dict): Dictionary of route handlers.
+    :param settings (dict): resolved backend options.
+    :param drainer (ConnectionDrainer): tracks the connection for shutdown.
+    """
+    addr = writer.get_extra_info('peername')
+    daemon = HttpAdapter(ip, port, None, addr, routes,
+                         keepalive_timeout=settings["keepalive_timeout"],
+                         max_keepalive_requests=settings["max_keepalive_requests"],
+                         drainer=drainer,
+                         timeouts=phase_timeouts(settings),
+                         compressor=settings["compressor"],
+                         file_mode=settings["file_mode"],
+                         cache_policy=settings["cache_policy"],
+                         spool_threshold=settings["spool_threshold"],
+                         max_body_size=settings["max_body_size"])
+    deadline = Deadline(asyncio.get_running_loop().call_later,
+                        writer.transport.abort, daemon.timeouts)
+    stream = AsyncHttpReader(reader, deadline=deadline,
+                             spool_threshold=daemon.spool_threshold,
+                             max_body_size=daemon.max_body_size)
+    if drainer is not None:
+        drainer.register(writer, close=writer.close, abort=writer.transport.abort)
+
+    try:
+        while True:
+            # Between requests, unless a pipelined one is already buffered
+            idle = daemon.served and not stream.buffered()
+            if idle:
+                daemon.set_idle(writer, True)
+            try:
+                message = await stream.read_message(idle=idle)
+            except ValueError as e:
+                if deadline.expired:
+                    raise
+                print("[AsyncBackend] Bad request from {}: {}".format(addr, e))
+                await write_response(writer, daemon.build_bad_request(e), deadline)
+                await linger_close(reader, writer)
+                break
+            finally:
+                if idle:
+                    daemon.set_idle(writer, False)
+            if message is None:
+                break
+
+            req, resp = daemon.next_exchange()
+            req.prepare(message, routes)
+            keep_alive = daemon.prepare_connection(req, resp)
+
+            response = await daemon.handle_request_async(req, resp)
+            await write_response(writer, response, deadline)
+            if not keep_alive or resp.headers.get('Connection') == 'close':
+                break
+    except (ConnectionError, ValueError) as e:
+        if deadline.expired:
+            print("[AsyncBackend] {} timed out in {} phase".format(addr, deadline.expired))
+        else:
+            print("[AsyncBackend] Connection error from {}: {}".format(addr, e))
+    finally:
+        deadline.stop()
+        writer.close()
+        if drainer is not None:
+            drainer.unregister(writer)
+
+
+async def linger_close(reader, writer, timeout=LINGER_TIMEOUT, limit=LINGER_LIMIT):
+    """
+    Asyncio counterpart of :func:`daemon.shutdown.linger_close`: end the
+    write side, then drop what the client still sends, so closing does not
+    reset the connection before the last response is read.
+
+    :param reader (asyncio.StreamReader): stream reading from the client.
+    :param writer (asyncio.StreamWriter): stream writing to the client.
+    :param timeout (float): seconds spent reading at most.
+    :param limit (int): bytes read at most.
+    """
+    async def discard():
+        left = limit
+        while left > 0:
+            data = await reader.read(min(left, 16384))
+            if not data:
+                return
+            left -= len(data)
+
+    try:
+        if writer.can_write_eof():
+            writer.write_eof()
+        await asyncio.wait_for(discard(), timeout)
+    except (ConnectionError, asyncio.TimeoutError):
+        pass
+
+
+async def drain(writer, deadline=None):
+    """
+    Wait until the client has read enough of the written bytes, within the
+    write timeout.
+
+    :param writer (asyncio.StreamWriter): stream writing to the client.
+    :param deadline (Deadline): timeouts of the connection, or None.
+    """
+    if deadline is None:
+        await writer.drain()
+        return
+    deadline.start("write")
+    await writer.drain()
+    deadline.stop()
+
+
+async def write_response(writer, response, deadline=None):
+    """
+    Write a response built by the adapter to the client.
+
+    :param writer (asyncio.StreamWriter): stream writing to the client.
+    :param response: bytes, a :class:`SegmentedResponse <SegmentedResponse>`,
+                     or an (async) iterator of response parts for a
+                     streamed hook body. A synchronous iterator may block, so
+                     each part is produced in the executor.
+    :param deadline (Deadline): timeouts of the connection, or None.
+    """
+    if isinstance(response, (bytes, bytearray)):
+        response = SegmentedResponse(response, [])
+    if isinstance(response, SegmentedResponse):
+        if deadline is None:
+            await response.send_async(writer)
+            return
+        deadline.start("write")
+        await response.send_async(writer, deadline.touch)
+        deadline.stop()
+    elif hasattr(response, '__aiter__'):
+        async for part in response:
+            writer.write(part)
+            await drain(writer, deadline)
+    else:
+        loop = asyncio.get_running_loop()
+        parts = iter(response)
+        while True:
+            part = await loop.run_in_executor(None, next, parts, None)
+            if part is None:
+                break
+            writer.write(part)
+            await drain(writer, deadline)
+
+
+async def admit_client(ip, port, reader, writer, routes, settings, admission,
+                       drainer=None):
+    """
+    Apply the in-flight limit to a new connection, then serve it.
+
+    :param admission (AdmissionController): the backend admission control.
+    :param drainer (ConnectionDrainer): tracks the connection for shutdown.
+    """
+    if not admission.try_admit():
+        admission.record_shed("inflight")
+        writer.write(admission.response)
+        try:
+            await writer.drain()
+            await linger_close(reader, writer)
+        except ConnectionError:
+            pass
+        writer.close()
+        return
+    try:
+        await handle_client(ip, port, reader, writer, routes, settings, drainer)
+    finally:
+        admission.release()
+
+
+async def serve(server, ip, port, routes, settings, admission, drainer):
+    """
+    Start the asyncio server on a listening socket and serve until a stop
+    signal, then drain the open connections.
+
+    :param server (socket.socket): bound and listening socket.
+    :param ip (str): IP address the server is bound to.
+    :param port (int): Port number the server is listening on.
+    :param routes (dict): Dictionary of route handlers.
+    :param settings (dict): resolved backend options.
+    :param admission (AdmissionController): the backend admission control.
+    :param drainer (ConnectionDrainer): tracks connections for shutdown.
+    """
+    loop = asyncio.get_running_loop()
+    stop = asyncio.Event()
+    drainer.install_signal_handlers(on_stop=lambda: loop.call_soon_threadsafe(stop.set))
+    loop.set_default_executor(concurrent.futures.ThreadPoolExecutor(
+        max_workers=settings["pool_size"],
+        thread_name_prefix="backend-hook"
+    ))
+
+    aserver = await asyncio.start_server(
+        lambda reader, writer: admit_client(ip, port, reader, writer, routes,
+                                            settings, admission, drainer),
+        sock=server
+    )
+    print("[Backend] Listening on port {} (asyncio engine)".format(port))
+    if routes:
+        print("[Backend] route settings {}".format(routes))
+
+    await stop.wait()
+    aserver.close()
+    drainer.close_idle()
+    deadline = time.monotonic() + settings["drain_timeout"]
+    while drainer.pending() and not drainer.deadline_passed(deadline):
+        await asyncio.sleep(0.05)
+    drainer.abort_all()
+    drainer.report()
+    await aserver.wait_closed()
+
+
+def run_async_backend(server, ip, port, routes, settings, admission, drainer):
+    """
+    Entry point of the asyncio engine, blocks until the server stops.
+
+    :param server (socket.socket): bound and listening socket.
+    :param ip (str): IP address the server is bound to.
+    :param port (int): Port number the server is listening on.
+    :param routes (dict): Dictionary of route handlers.
+    :param settings (dict): resolved backend options.
+    :param admission (AdmissionController): the backend admission control.
+    :param drainer (ConnectionDrainer): tracks connections for shutdown.
+    """
+    try:
+        asyncio.run(serve(server, ip, port, routes, settings, admission, drainer))
+    except OSError as e:
+        print("Socket error: {}".format(e))
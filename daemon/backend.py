@@ -30,13 +30,23 @@ Requirements:
 
 Notes:
 ------
-- The server create daemon threads for client handling.
+- The server create daemon threads for client handling. SIGTERM/SIGINT stop
+  the accept loop and drain the open connections, see :mod:`daemon.shutdown`. With ``engine="pool"``
+  a fixed :class:`WorkerPool <WorkerPool>` with a bounded accept queue is used
+  instead, and connections beyond the queue capacity receive a fast 503.
+- Admission control (``max_inflight``, ``max_queue_time``) sheds excess
+  connections with a prebuilt 503 and Retry-After, see :mod:`daemon.admission`.
+- With ``engine="asyncio"`` all connections share one event loop, see
+  :mod:`daemon.asyncbackend`.
+- With ``workers=N`` the engine runs in N forked processes sharing the port,
+  see :mod:`daemon.prefork`.
 - The current implementation error handling is minimal, socket errors are printed to the console.
 - The actual request processing is delegated to the HttpAdapter class.
 
 Usage Example:
 --------------
 >>> create_backend("127.0.0.1", 9000, routes={})
+>>> create_backend("127.0.0.1", 9000, routes={}, engine="pool", pool_size=8)
 
 """
 
@@ -45,10 +55,97 @@ import threading
 import argparse
 
 from .response import *
-from .httpadapter import HttpAdapter
+from .httpadapter import HttpAdapter, worker_exchange
 from .dictionary import CaseInsensitiveDict
+from .workerpool import WorkerPool
+from .admission import AdmissionController
+from .shutdown import ConnectionDrainer
+from .timers import TimerWheel, phase_timeouts
+from .cache import STATIC_CACHE
+from .response import ASSET_INDEX
+from .filemap import FILE_MAP
+from .cachepolicy import CachePolicy
+from .router import compile_routes
+from .compression import Compressor
+from .asyncbackend import run_async_backend
+from .prefork import Supervisor, create_listener, supports_prefork
 
-def handle_client(ip, port, conn, addr, routes):
+#: Default serving options, each one can be overridden by keyword
+#: arguments of :func:`create_backend` or :meth:`WeApRous.run`.
+#:
+#: - engine: "thread" spawns one thread per connection, "pool" hands
+#:   connections to a fixed set of worker threads, "asyncio" serves every
+#:   connection from a single event loop.
+#: - pool_size: number of worker threads in "pool" mode, or of executor
+#:   threads for blocking hooks in "asyncio" mode.
+#: - queue_size: accepted connections allowed to wait for a worker.
+#: - keepalive_timeout: seconds an idle persistent connection is kept open.
+#: - max_keepalive_requests: requests served on one connection before closing it.
+#: - workers: number of processes serving the port (pre-fork mode when above 1).
+#: - reuse_port: in pre-fork mode, give every process its own SO_REUSEPORT
+#:   socket instead of sharing one listening socket.
+#: - backlog: listen backlog of the server socket.
+#: - max_inflight: connections open at once, served, queued or idle between
+#:   keep-alive requests, before new ones are shed; 0 for no limit.
+#: - max_queue_time: seconds a connection may wait for a pool worker before
+#:   it is shed, 0 for no limit.
+#: - retry_after: Retry-After seconds advertised in the 503 of shed connections.
+#: - status_path: when set, a GET route answering the serving counters as JSON.
+#: - drain_timeout: seconds open connections may take to finish on SIGTERM/SIGINT.
+#: - header_timeout: seconds a client may take to send the request headers.
+#: - body_timeout, write_timeout: seconds a client may let pass without
+#:   sending a byte of the body, or without reading a byte of the response,
+#:   before it is disconnected; a slow but steady transfer is never cut.
+#:   0 disables a timeout.
+#: - compression_level: gzip/deflate level 1-9 of text responses, 0 disables it.
+#: - compress_min_size: smallest response body worth compressing, in bytes.
+#: - compressor: :class:`Compressor <daemon.compression.Compressor>` shared
+#:   by the connections of a process, built once from compression_level and
+#:   compress_min_size when not given.
+#: - file_mode: "sendfile" sends static files too large for the content
+#:   cache from disk, "mmap" maps them once and writes views of the mapping,
+#:   sharing their pages between threads and worker processes.
+#: - cache_policy: :class:`CachePolicy <daemon.cachepolicy.CachePolicy>` giving
+#:   the Cache-Control directives per path prefix and route, the
+#:   :class:`WeApRous <daemon.weaprous.WeApRous>` app passes its own.
+#: - cache_config: file of Cache-Control rules added to the policy, in the
+#:   syntax of config/cache.conf.
+#: - spool_threshold: request bodies larger than this many bytes are
+#:   spooled to a temporary file instead of being kept in memory.
+#: - max_body_size: request bodies larger than this many bytes are refused
+#:   with 413 before they are stored, 0 for no limit.
+BACKEND_OPTIONS = {
+    "engine": "thread",
+    "pool_size": 16,
+    "queue_size": 64,
+    "keepalive_timeout": 5,
+    "max_keepalive_requests": 100,
+    "workers": 1,
+    "reuse_port": False,
+    "backlog": 50,
+    "max_inflight": 0,
+    "max_queue_time": 0,
+    "retry_after": 1,
+    "status_path": None,
+    "drain_timeout": 10,
+    "header_timeout": 10,
+    "body_timeout": 30,
+    "write_timeout": 30,
+    "compression_level": 6,
+    "compress_min_size": 1024,
+    "compressor": None,
+    "file_mode": "sendfile",
+    "cache_policy": None,
+    "cache_config": None,
+    "spool_threshold": 1024 * 1024,
+    "max_body_size": 64 * 1024 * 1024,
+}
+
+#: Seconds between two checks for a shutdown request in the accept loop.
+ACCEPT_POLL_INTERVAL = 0.5
+
+def handle_client(ip, port, conn, addr, routes, settings=BACKEND_OPTIONS, drainer=None,
+                  timers=None):
     """
     Initializes an HttpAdapter instance and delegates the client handling logic to it.
 
@@ -57,55 +154,219 @@ def handle_client(ip, port, conn, addr, routes):
     :param conn (socket.socket): Client connection socket.
     :param addr (tuple): client address (IP, port).
     :param routes (dict): Dictionary of route handlers.
+    :param settings (dict): resolved backend options.
+    :param drainer (ConnectionDrainer): graceful shutdown tracker.
+    :param timers (TimerWheel): wheel expiring the connection timeouts.
     """
-    daemon = HttpAdapter(ip, port, conn, addr, routes)
+    daemon = HttpAdapter(ip, port, conn, addr, routes,
+                         keepalive_timeout=settings["keepalive_timeout"],
+                         max_keepalive_requests=settings["max_keepalive_requests"],
+                         drainer=drainer,
+                         timers=timers,
+                         timeouts=phase_timeouts(settings),
+                         compressor=settings["compressor"],
+                         file_mode=settings["file_mode"],
+                         cache_policy=settings["cache_policy"],
+                         spool_threshold=settings["spool_threshold"],
+                         max_body_size=settings["max_body_size"],
+                         exchange=worker_exchange())
 
     # Handle client
     daemon.handle_client(conn, addr, routes)
 
-def run_backend(ip, port, routes):
+def mount_status_route(routes, path, sources):
     """
-    Starts the backend server, binds to the specified IP and port, and listens for incoming
-    connections. Each connection is handled in a separate thread. The backend accepts incoming
-    connections and spawns a thread for each client.
+    Adds a GET route answering the serving counters as JSON.
 
+    :param routes (dict): Dictionary of route handlers.
+    :param path (str): URL path of the status route.
+    :param sources (dict): name -> object with a ``stats()`` method.
 
-    :param ip (str): IP address to bind the server.
-    :param port (int): Port number to listen on.
+    :rtype dict: a copy of the routes including the status route.
+    """
+    def status(headers="", body=""):
+        return {name: source.stats() for name, source in sources.items()}
+
+    status._route_path = path
+    status._route_methods = ['GET']
+    routes = dict(routes)
+    routes[('GET', path)] = status
+    return routes
+
+def load_cache_policy(settings):
+    """
+    Resolves the Cache-Control policy of the backend options.
+
+    :param settings (dict): options with ``cache_policy`` and ``cache_config``.
+
+    :rtype CachePolicy: the given policy, or a default one, with the rules
+                        of ``cache_config`` added.
+    """
+    policy = settings["cache_policy"] or CachePolicy()
+    if settings["cache_config"]:
+        count = policy.load(settings["cache_config"])
+        print("[Backend] Loaded {} cache rules from {}".format(count, settings["cache_config"]))
+    return policy
+
+def serve_backend(server, ip, port, routes, settings):
+    """
+    Accepts connections on a listening socket and hands each one to the
+    selected engine. Runs until SIGTERM/SIGINT, then stops accepting and
+    drains the open connections for up to ``drain_timeout`` seconds.
+
+    Each connection first goes through admission control: beyond
+    ``max_inflight`` connections, when the pool queue is full, or after
+    waiting more than ``max_queue_time`` for a worker, it is shed with a
+    prebuilt 503.
+
+    :param server (socket.socket): bound and listening socket.
+    :param ip (str): IP address the server is bound to.
+    :param port (int): Port number the server is listening on.
     :param routes (dict): Dictionary of route handlers.
+    :param settings (dict): resolved backend options.
     """
-    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    settings = dict(settings, cache_policy=load_cache_policy(settings),
+                    compressor=settings["compressor"] or Compressor(
+                        settings["compression_level"], settings["compress_min_size"]))
+    engine = settings["engine"]
+    # One wheel expires the timeouts of every connection of this process
+    timers = TimerWheel()
+    admission = AdmissionController(
+        max_inflight=settings["max_inflight"],
+        max_queue_time=settings["max_queue_time"],
+        retry_after=settings["retry_after"],
+        schedule=timers.schedule
+    )
+    sources = {"admission": admission, "static_cache": STATIC_CACHE, "assets": ASSET_INDEX}
+    if settings["file_mode"] == "mmap":
+        sources["file_map"] = FILE_MAP
+    # Walked once here, so no request pays for the first scan
+    print("[Backend] Indexed {} static assets".format(ASSET_INDEX.refresh()))
+    drainer = ConnectionDrainer("Backend")
+
+    def serve_admitted(conn, addr):
+        try:
+            handle_client(ip, port, conn, addr, routes, settings, drainer, timers)
+        finally:
+            drainer.unregister(conn)
+            admission.release()
+
+    def expire(conn, addr):
+        drainer.unregister(conn)
+        admission.release()
+        admission.shed(conn, "queue_time")
+
+    pool = None
+    if engine == "pool":
+        pool = WorkerPool(
+            serve_admitted,
+            size=settings["pool_size"],
+            queue_size=settings["queue_size"],
+            max_wait=settings["max_queue_time"],
+            on_expired=expire
+        )
+        sources["pool"] = pool
+
+    if settings["status_path"]:
+        routes = mount_status_route(routes, settings["status_path"], sources)
+    # Compiled once, every connection of the process matches against it
+    routes = compile_routes(routes)
 
+    if engine == "asyncio":
+        run_async_backend(server, ip, port, routes, settings, admission, drainer)
+        return
+
+    timers.start()
+
+    if pool is not None:
+        pool.start()
+
+    drainer.install_signal_handlers()
+    # Wake up regularly to notice a shutdown request
+    server.settimeout(ACCEPT_POLL_INTERVAL)
     try:
-        server.bind((ip, port))
-        server.listen(50)
-        print("[Backend] Listening on port {}".format(port))
-        if routes != {}:
+        print("[Backend] Listening on port {} ({} engine)".format(port, engine))
+        if routes:
             print("[Backend] route settings {}".format(routes))
 
-        while True:
-            conn, addr = server.accept()
-            #
-            #  TODO: implement the step of the client incomping connection
-            #        using multi-thread programming with the
-            #        provided handle_client routine
-            #
+        while not drainer.stopping.is_set():
+            try:
+                conn, addr = server.accept()
+            except socket.timeout:
+                continue
+            conn.settimeout(None)
+            if not admission.try_admit():
+                admission.shed(conn, "inflight")
+                continue
+
+            drainer.register(conn)
+            if pool is not None:
+                if not pool.submit(conn, addr):
+                    drainer.unregister(conn)
+                    admission.release()
+                    admission.shed(conn, "queue_full")
+                continue
+
             client_thread = threading.Thread(
-                target=handle_client,
-                args=(ip, port, conn, addr, routes)
+                target=serve_admitted,
+                args=(conn, addr)
             )
             client_thread.daemon = True
             client_thread.start()
     except socket.error as e:
       print("Socket error: {}".format(e))
+    finally:
+        server.close()
+
+    drainer.drain(settings["drain_timeout"])
+
+def run_backend(ip, port, routes, **options):
+    """
+    Starts the backend server, binds to the specified IP and port, and listens for incoming
+    connections. Each connection is handled in a separate thread. The backend accepts incoming
+    connections and spawns a thread for each client, or queues it to a bounded worker pool
+    when ``engine="pool"`` is selected. With ``workers`` above 1 a supervisor forks that many
+    processes serving the same port.
+
+
+    :param ip (str): IP address to bind the server.
+    :param port (int): Port number to listen on.
+    :param routes (dict): Dictionary of route handlers.
+    :param options: overrides of :data:`BACKEND_OPTIONS`.
+    """
+    settings = dict(BACKEND_OPTIONS, **options)
+    if settings["engine"] not in ("thread", "pool", "asyncio"):
+        raise ValueError("Unknown backend engine: {}".format(settings["engine"]))
+
+    workers = settings["workers"]
+    try:
+        if workers > 1 and supports_prefork():
+            Supervisor(
+                ip, port,
+                lambda server: serve_backend(server, ip, port, routes, settings),
+                workers,
+                reuse_port=settings["reuse_port"],
+                backlog=settings["backlog"]
+            ).run()
+            return
+
+        if workers > 1:
+            print("[Backend] os.fork is not available, running a single process")
+        server = create_listener(ip, port, backlog=settings["backlog"])
+    except socket.error as e:
+      print("Socket error: {}".format(e))
+      return
+
+    serve_backend(server, ip, port, routes, settings)
 
-def create_backend(ip, port, routes={}):
+def create_backend(ip, port, routes={}, **options):
     """
     Entry point for creating and running the backend server.
 
     :param ip (str): IP address to bind the server.
     :param port (int): Port number to listen on.
     :param routes (dict, optional): Dictionary of route handlers. Defaults to empty dict.
+    :param options: serving options, see :data:`BACKEND_OPTIONS`.
     """
 
-    run_backend(ip, port, routes)
\ No newline at end of file
+    run_backend(ip, port, routes, **options)
@@ -0,0 +1,434 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.body
+~~~~~~~~~~~~~~~~~
+
+This module provides the request body interface of the backend.
+
+A :class:`RequestBody <RequestBody>` is read like a binary file, with
+``read(n)`` or by iterating over it in chunks, and keeps its bytes in
+memory up to ``spool_threshold``; a larger body is spooled to an anonymous
+temporary file as it arrives, so a multi-megabyte upload never sits in RAM
+and is never decoded as text unless a handler asks for it.
+
+A ``multipart/form-data`` body is split into :class:`FormPart <FormPart>`
+objects by the incremental :class:`MultipartParser <MultipartParser>`,
+which is fed the body chunk by chunk; the content of each part is itself a
+:class:`RequestBody <RequestBody>`, so uploaded files are spooled too.
+
+Usage Example:
+--------------
+>>> @app.route('/upload', methods=['POST'], stream=True)
+>>> def upload(headers, body):
+>>>     form = body.form()
+>>>     form['file'].save('uploads/' + form['file'].filename)
+>>>     return {'size': len(form['file'].body)}
+"""
+
+import re
+import shutil
+import tempfile
+import urllib.parse
+
+#: Bodies larger than this are spooled to a temporary file, in bytes.
+SPOOL_THRESHOLD = 1024 * 1024
+#: Bytes produced at once when iterating over a body.
+CHUNK_SIZE = 65536
+#: Largest accepted header block of a multipart part.
+MAX_PART_HEADER_SIZE = 16384
+
+#: ``name=value`` or ``name="quoted value"`` parameters of a header value.
+_PARAM = re.compile(r';\s*([\w!#$%&\'*+.^`|~-]+)\s*=\s*("(?:[^"\\]|\\.)*"|[^;]*)')
+
+
+def header_params(value):
+    """
+    Splits a header value into its main value and parameters.
+
+    :param value (str): e.g. ``form-data; name="file"; filename="a.txt"``.
+
+    :rtype tuple: (main value (str), parameters (dict) by lowercased name).
+    """
+    main, sep, rest = value.partition(';')
+    params = {}
+    for name, param in _PARAM.findall(sep + rest):
+        param = param.strip()
+        if param.startswith('"'):
+            param = re.sub(r'\\(.)', r'\1', param[1:-1])
+        params[name.lower()] = param
+    return main.strip().lower(), params
+
+
+class RequestBody:
+    """
+    The :class:`RequestBody <RequestBody>` of one request, readable like a
+    binary file.
+
+    :attrs content_type (str): Content-Type of the request, or None.
+    :attrs spool_threshold (int): bytes kept in memory before spooling.
+    :attrs size (int): length of the body.
+    """
+
+    __attrs__ = [
+        "content_type",
+        "spool_threshold",
+        "size",
+    ]
+
+    def __init__(self, data=b"", content_type=None, spool_threshold=SPOOL_THRESHOLD):
+        """
+        Initialize a new RequestBody instance.
+
+        :param data (bytes-like): bytes of the body received so far.
+        :param content_type (str): Content-Type of the request.
+        :param spool_threshold (int): bytes kept in memory before spooling,
+                                      0 spools from the first byte.
+        """
+        self.content_type = content_type
+        self.spool_threshold = spool_threshold
+        self.size = len(data)
+
+        self._data = data
+        self._file = None
+        self._pos = 0
+        if self.size > spool_threshold:
+            self.spool()
+
+    @property
+    def in_memory(self):
+        """True while the body is not spooled to disk."""
+        return self._file is None
+
+    def __len__(self):
+        return self.size
+
+    def spool(self):
+        """Move the body to an anonymous temporary file, if not done yet."""
+        if self._file is not None:
+            return
+        f = tempfile.TemporaryFile(prefix="weaprous-body-")
+        if self._data:
+            f.write(self._data)
+        self._data = None
+        self._file = f
+
+    def write(self, data):
+        """
+        Append bytes to the body, spooling it once it grows too large.
+
+        :param data (bytes-like): bytes to append.
+        """
+        if not data:
+            return
+        self.size += len(data)
+        if self._file is not None:
+            self._file.seek(0, 2)
+            self._file.write(data)
+            return
+        if not isinstance(self._data, bytearray):
+            self._data = bytearray(self._data)
+        self._data += data
+        if self.size > self.spool_threshold:
+            self.spool()
+
+    def seek(self, pos=0):
+        """
+        Move the read position.
+
+        :param pos (int): offset from the start of the body.
+        """
+        self._pos = max(0, min(pos, self.size))
+
+    def tell(self):
+        """
+        :rtype int: the read position.
+        """
+        return self._pos
+
+    def read(self, n=-1):
+        """
+        Read from the current position.
+
+        :param n (int): number of bytes to read, all the rest if negative.
+
+        :rtype bytes: up to ``n`` bytes, empty at the end of the body.
+        """
+        if n is None or n < 0 or n > self.size - self._pos:
+            n = self.size - self._pos
+        if n <= 0:
+            return b""
+        if self._file is None:
+            data = bytes(self._data[self._pos:self._pos + n])
+        else:
+            self._file.seek(self._pos)
+            data = self._file.read(n)
+        self._pos += len(data)
+        return data
+
+    def __iter__(self):
+        """Iterate over the rest of the body in chunks of ``CHUNK_SIZE`` bytes."""
+        while True:
+            chunk = self.read(CHUNK_SIZE)
+            if not chunk:
+                return
+            yield chunk
+
+    def getvalue(self):
+        """
+        The whole body, read into memory.
+
+        :rtype bytes: the body.
+        """
+        if self._file is None:
+            return bytes(self._data)
+        self._file.seek(0)
+        return self._file.read()
+
+    def text(self, encoding='utf-8'):
+        """
+        The whole body decoded, invalid bytes replaced.
+
+        :param encoding (str): charset of the body.
+
+        :rtype str: the body text.
+        """
+        return self.getvalue().decode(encoding, errors='replace')
+
+    def save(self, path):
+        """
+        Copy the body to a file, chunk by chunk.
+
+        :param path (str): path of the file written.
+        """
+        with open(path, 'wb') as f:
+            if self._file is None:
+                f.write(self._data)
+                return
+            self._file.seek(0)
+            shutil.copyfileobj(self._file, f, CHUNK_SIZE)
+
+    def parts(self):
+        """
+        Parse a ``multipart/form-data`` or url-encoded form body.
+
+        :rtype list: :class:`FormPart <FormPart>` objects in body order.
+
+        :raises ValueError: If the body is not a form or is malformed.
+        """
+        kind, params = header_params(self.content_type or '')
+        if kind == 'application/x-www-form-urlencoded':
+            return [FormPart(name, RequestBody(value.encode('utf-8')))
+                    for name, value in urllib.parse.parse_qsl(
+                        self.text(), keep_blank_values=True)]
+        if kind != 'multipart/form-data' or not params.get('boundary'):
+            raise ValueError("Not a form body: {}".format(self.content_type))
+        parser = MultipartParser(params['boundary'], self.spool_threshold)
+        pos = self._pos
+        self._pos = 0
+        try:
+            for chunk in self:
+                parser.feed(chunk)
+        finally:
+            self._pos = pos
+        return parser.close()
+
+    def form(self):
+        """
+        Parse a form body into its fields by name, the last part of a
+        repeated name wins; see :meth:`parts` to get them all.
+
+        :rtype dict: name -> :class:`FormPart <FormPart>`.
+
+        :raises ValueError: If the body is not a form or is malformed.
+        """
+        return {part.name: part for part in self.parts()}
+
+    def close(self):
+        """Release the temporary file of a spooled body."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._data = b""
+            self.size = self._pos = 0
+
+
+class FormPart:
+    """
+    One field of a form body.
+
+    :attrs name (str): field name.
+    :attrs filename (str): name of the uploaded file, None for other fields.
+    :attrs content_type (str): Content-Type of the part, None if not sent.
+    :attrs headers (dict): part header fields by lowercased name.
+    :attrs body (RequestBody): content of the part.
+    """
+
+    __attrs__ = [
+        "name",
+        "filename",
+        "content_type",
+        "headers",
+        "body",
+    ]
+
+    def __init__(self, name, body, filename=None, content_type=None, headers=None):
+        self.name = name
+        self.body = body
+        self.filename = filename
+        self.content_type = content_type
+        self.headers = headers or {}
+
+    @property
+    def value(self):
+        """The content decoded as UTF-8 text."""
+        return self.body.text()
+
+    def save(self, path):
+        """
+        Write the content to a file.
+
+        :param path (str): path of the file written.
+        """
+        self.body.save(path)
+
+
+class MultipartParser:
+    """
+    The incremental :class:`MultipartParser <MultipartParser>` splitting a
+    ``multipart/form-data`` body fed in arbitrary pieces.
+
+    The state moves from ``preamble`` to ``boundary``, then alternates
+    between ``headers``, ``data`` and ``boundary`` until the closing
+    delimiter, and ends in ``epilogue``. At most one delimiter length of
+    bytes is held back between two feeds, the rest of the content goes to
+    the body of the current part.
+
+    :attrs boundary (bytes): boundary of the body.
+    :attrs spool_threshold (int): bytes of a part kept in memory.
+    :attrs state (str): current state of the parser.
+    :attrs parts (list): :class:`FormPart <FormPart>` objects found so far.
+    """
+
+    __attrs__ = [
+        "boundary",
+        "spool_threshold",
+        "state",
+        "parts",
+    ]
+
+    def __init__(self, boundary, spool_threshold=SPOOL_THRESHOLD):
+        """
+        Initialize a new MultipartParser instance.
+
+        :param boundary (str): ``boundary`` parameter of the Content-Type.
+        :param spool_threshold (int): bytes of a part kept in memory.
+        """
+        if isinstance(boundary, str):
+            boundary = boundary.encode('latin-1')
+        self.boundary = boundary
+        self.spool_threshold = spool_threshold
+        self.state = "preamble"
+        self.parts = []
+
+        self._delimiter = b"\r\n--" + boundary
+        # The first delimiter may start the body, without the CRLF
+        self._buf = bytearray(b"\r\n")
+
+    def feed(self, data):
+        """
+        Parse the next piece of the body.
+
+        :param data (bytes-like): bytes following the previous piece.
+
+        :raises ValueError: If the body is malformed.
+        """
+        buf = self._buf
+        buf += data
+        delimiter = self._delimiter
+        while True:
+            state = self.state
+            if state == "preamble" or state == "data":
+                found = buf.find(delimiter)
+                if found == -1:
+                    # Keep what may be the start of a delimiter
+                    keep = len(delimiter) - 1
+                    if state == "data" and len(buf) > keep:
+                        self.parts[-1].body.write(memoryview(buf)[:len(buf) - keep])
+                    if len(buf) > keep:
+                        del buf[:len(buf) - keep]
+                    return
+                if state == "data":
+                    self.parts[-1].body.write(memoryview(buf)[:found])
+                del buf[:found + len(delimiter)]
+                self.state = "boundary"
+            elif state == "boundary":
+                if len(buf) < 2:
+                    return
+                if buf[:2] == b"--":
+                    self.state = "epilogue"
+                    continue
+                # Transport padding may follow the boundary
+                end = buf.find(b"\r\n")
+                if end == -1:
+                    if len(buf) > MAX_PART_HEADER_SIZE:
+                        raise ValueError("Malformed multipart boundary")
+                    return
+                if buf[:end].strip(b" \t"):
+                    raise ValueError("Malformed multipart boundary")
+                del buf[:end + 2]
+                self.state = "headers"
+            elif state == "headers":
+                if buf[:2] == b"\r\n":
+                    end = 0
+                else:
+                    end = buf.find(b"\r\n\r\n")
+                    if end == -1:
+                        if len(buf) > MAX_PART_HEADER_SIZE:
+                            raise ValueError("Multipart part header too large")
+                        return
+                    end += 2
+                self.parts.append(self._new_part(bytes(buf[:end])))
+                del buf[:end + 2]
+                self.state = "data"
+            else:
+                # Epilogue, ignored
+                buf.clear()
+                return
+
+    def _new_part(self, head):
+        """Create the part described by a header block."""
+        headers = {}
+        for line in head.split(b"\r\n"):
+            name, sep, value = line.partition(b":")
+            if sep:
+                headers[name.strip().lower().decode('latin-1')] = value.strip().decode('utf-8', 'replace')
+        disposition, params = header_params(headers.get('content-disposition', ''))
+        if disposition != 'form-data' or 'name' not in params:
+            raise ValueError("Multipart part without a form-data name")
+        return FormPart(params['name'], RequestBody(spool_threshold=self.spool_threshold),
+                        filename=params.get('filename'),
+                        content_type=headers.get('content-type'),
+                        headers=headers)
+
+    def close(self):
+        """
+        End of the body.
+
+        :rtype list: the :class:`FormPart <FormPart>` objects of the body.
+
+        :raises ValueError: If the closing delimiter was not seen.
+        """
+        if self.state != "epilogue":
+            raise ValueError("Truncated multipart body")
+        return self.parts
@@ -0,0 +1,283 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.cache
+~~~~~~~~~~~~~~~~~
+
+This module provides the in-memory cache of static files served by
+:meth:`Response.build_content <daemon.response.Response.build_content>`.
+
+Files are kept by normalized path within a byte budget, the least recently
+used ones being evicted first. An entry remembers the modification time
+and size of its file: after ``check_interval`` seconds it is revalidated
+with one ``stat`` and reloaded if the file changed, so an edited page is
+picked up without restarting the server while a hot page such as
+index.html is served from memory with no system call in between.
+
+Every entry also carries the validators of its file, an ``ETag`` built from
+size and modification time and a ``Last-Modified`` date, so conditional
+requests are answered without reading the file again.
+
+Usage Example:
+--------------
+>>> cache = ContentCache(max_bytes=32 * 1024 * 1024)
+>>> entry = cache.get("www/index.html")
+>>> entry.content, entry.etag, entry.last_modified
+>>> cache.stats()
+"""
+
+import collections
+import os
+import threading
+import time
+
+
+def file_validators(st):
+    """
+    Computes the cache validators of a file.
+
+    :param st (os.stat_result): status of the file.
+
+    :rtype tuple: (etag (str), last_modified (str)), the ETag is quoted as
+                  sent on the wire.
+    """
+    etag = '"{:x}-{:x}"'.format(st.st_size, st.st_mtime_ns)
+    last_modified = time.strftime("%a, %d %b %Y %H:%M:%S GMT", time.gmtime(st.st_mtime))
+    return etag, last_modified
+
+
+class CacheEntry:
+    """
+    One cached file.
+
+    :attrs content (bytes): file content.
+    :attrs mtime (float): modification time of the file when it was read.
+    :attrs size (int): size of the file when it was read.
+    :attrs checked (float): ``time.monotonic()`` of the last validation.
+    :attrs etag (str): quoted entity tag of this version of the file.
+    :attrs last_modified (str): modification time formatted as an HTTP date.
+    :attrs path (str): cache key of the entry.
+    :attrs variants (dict): encoded versions of the content, e.g. gzip.
+    """
+
+    __attrs__ = [
+        "content",
+        "mtime",
+        "size",
+        "checked",
+        "etag",
+        "last_modified",
+        "path",
+        "variants",
+    ]
+
+    def __init__(self, content, st, checked, path=None):
+        self.content = content
+        self.mtime = st.st_mtime
+        self.size = st.st_size
+        self.checked = checked
+        self.etag, self.last_modified = file_validators(st)
+        self.path = path
+        self.variants = {}
+
+    def nbytes(self):
+        """
+        Memory held by the entry.
+
+        :rtype int: bytes of the content and of its variants.
+        """
+        return len(self.content) + sum(len(data) for data in self.variants.values())
+
+
+class ContentCache:
+    """
+    A thread-safe :class:`ContentCache <ContentCache>` of file contents with
+    LRU eviction and mtime based invalidation.
+
+    :attrs max_bytes (int): byte budget of the cached contents.
+    :attrs max_entry_size (int): larger files are read but never cached.
+    :attrs check_interval (float): seconds an entry is trusted before its
+                                   file is checked again, 0 checks every time.
+    :attrs hits (int): lookups answered from memory.
+    :attrs misses (int): lookups that read the file.
+    :attrs evictions (int): entries dropped to stay within the budget.
+    """
+
+    __attrs__ = [
+        "max_bytes",
+        "max_entry_size",
+        "check_interval",
+        "hits",
+        "misses",
+        "evictions",
+    ]
+
+    def __init__(self, max_bytes=32 * 1024 * 1024, max_entry_size=1024 * 1024,
+                 check_interval=1.0):
+        """
+        Initialize a new ContentCache instance.
+
+        :param max_bytes (int): byte budget of the cached contents.
+        :param max_entry_size (int): largest file kept in the cache.
+        :param check_interval (float): seconds between two validations of an entry.
+        """
+        self.max_bytes = max_bytes
+        self.max_entry_size = max_entry_size
+        self.check_interval = check_interval
+        #: Counters
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._entries = collections.OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def peek(self, filepath):
+        """
+        Return the entry of a file only if it is cached and was validated
+        less than ``check_interval`` seconds ago; never touches the disk.
+
+        :param filepath (str): path of the file.
+
+        :rtype CacheEntry: the entry, or None.
+        """
+        key = os.path.normpath(filepath)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry.checked >= self.check_interval:
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def get(self, filepath):
+        """
+        Return the entry of a file, from memory when it is still valid.
+
+        :param filepath (str): path of the file.
+
+        :rtype CacheEntry: the entry; for a file larger than
+                           ``max_entry_size`` it is not kept in the cache.
+
+        :raises OSError: If the file cannot be read, e.g. FileNotFoundError.
+        """
+        # Normalized without system calls, unlike os.path.realpath
+        key = os.path.normpath(filepath)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry.checked < self.check_interval:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+
+        try:
+            st = os.stat(key)
+        except OSError:
+            self.invalidate(key)
+            raise
+        if entry is not None and entry.mtime == st.st_mtime and entry.size == st.st_size:
+            with self._lock:
+                entry.checked = now
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                self.hits += 1
+            return entry
+
+        with open(key, 'rb') as f:
+            content = f.read()
+        entry = CacheEntry(content, st, now, key)
+        with self._lock:
+            self.misses += 1
+            if len(content) <= self.max_entry_size:
+                self._store(key, entry)
+        return entry
+
+    def variant(self, entry, name, build):
+        """
+        Return an encoded version of an entry, building it once.
+
+        :param entry (CacheEntry): entry returned by :meth:`get` or :meth:`peek`.
+        :param name (str): variant key, e.g. ``gzip:6``.
+        :param build (callable): ``build(content)`` producing the variant.
+
+        :rtype bytes: the variant.
+        """
+        data = entry.variants.get(name)
+        if data is not None:
+            return data
+        data = build(entry.content)
+        with self._lock:
+            if name in entry.variants:
+                return entry.variants[name]
+            entry.variants[name] = data
+            # Only an entry still in the cache counts against the budget
+            if self._entries.get(entry.path) is entry:
+                self._bytes += len(data)
+                self._evict()
+        return data
+
+    def invalidate(self, filepath):
+        """
+        Drop the entry of a file, if cached.
+
+        :param filepath (str): path of the file.
+        """
+        key = os.path.normpath(filepath)
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._bytes -= entry.nbytes()
+
+    def clear(self):
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """
+        Snapshot of the cache counters.
+
+        :rtype dict: entry count, bytes used, budget, hits, misses and evictions.
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def _store(self, key, entry):
+        """Insert an entry and evict the least recently used ones over budget."""
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= old.nbytes()
+        self._entries[key] = entry
+        self._bytes += entry.nbytes()
+        self._evict()
+
+    def _evict(self):
+        """Drop the least recently used entries until the budget is met."""
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.nbytes()
+            self.evictions += 1
+
+
+#: Cache shared by every connection of the process.
+STATIC_CACHE = ContentCache()
@@ -0,0 +1,208 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.cachepolicy
+~~~~~~~~~~~~~~~~~
+
+This module provides the ``Cache-Control`` policy of the backend.
+
+A :class:`CachePolicy <CachePolicy>` maps request paths to cache
+directives, so static assets such as the images of static/images/ can be
+kept by browsers and intermediate proxies instead of being revalidated on
+every page load. A path ending with ``/`` is a prefix rule, any other path
+matches exactly (typically a route); an exact rule wins over prefixes and
+the longest prefix wins among them. Paths without a rule get ``default``,
+``no-cache`` unless configured otherwise.
+
+Rules come from the :class:`WeApRous <daemon.weaprous.WeApRous>` app or
+from a configuration file in the syntax of config/proxy.conf::
+
+    path "/static/images/" {
+        cache_control public, max-age=31536000, immutable;
+    }
+
+Usage Example:
+--------------
+>>> policy = CachePolicy()
+>>> policy.add("/static/images/", max_age=31536000, immutable=True)
+>>> policy.add("/login", no_store=True)
+>>> policy.lookup("/static/images/welcome.png")
+'max-age=31536000, immutable'
+"""
+
+import re
+import threading
+
+
+def cache_directives(max_age=None, public=False, private=False, immutable=False,
+                     no_cache=False, no_store=False):
+    """
+    Formats the value of a ``Cache-Control`` header.
+
+    :param max_age (int): seconds the response stays fresh.
+    :param public (bool): shared caches may store the response.
+    :param private (bool): only the browser may store the response.
+    :param immutable (bool): the response never changes while fresh.
+    :param no_cache (bool): caches must revalidate before every use.
+    :param no_store (bool): the response must not be stored at all.
+
+    :rtype str: e.g. ``"public, max-age=3600"``.
+
+    :raises ValueError: If no directive is given.
+    """
+    directives = []
+    if public:
+        directives.append("public")
+    if private:
+        directives.append("private")
+    if no_cache:
+        directives.append("no-cache")
+    if no_store:
+        directives.append("no-store")
+    if max_age is not None:
+        directives.append("max-age={}".format(int(max_age)))
+    if immutable:
+        directives.append("immutable")
+    if not directives:
+        raise ValueError("Empty Cache-Control policy")
+    return ", ".join(directives)
+
+
+def private_directives(directives):
+    """
+    Restricts directives to the browser, for a response that depends on
+    the credentials of the request: ``public`` becomes ``private``.
+
+    :param directives (str): ``Cache-Control`` value.
+
+    :rtype str: the value, without any directive allowing shared caches.
+    """
+    names = [directive.strip() for directive in directives.split(',')]
+    if "public" not in names:
+        return directives
+    names = [name for name in names if name != "public"]
+    if "private" not in names:
+        names.insert(0, "private")
+    return ", ".join(names)
+
+
+class CachePolicy:
+    """
+    The :class:`CachePolicy <CachePolicy>` choosing the ``Cache-Control``
+    directives of a response from its path.
+
+    :attrs default (str): directives of paths without a rule.
+    """
+
+    __attrs__ = [
+        "default",
+    ]
+
+    #: Lookups remembered per path, bounded as request paths are client input
+    max_memo = 1024
+
+    def __init__(self, default="no-cache"):
+        """
+        Initialize a new CachePolicy instance.
+
+        :param default (str): directives of paths without a rule.
+        """
+        self.default = default
+
+        self._exact = {}
+        self._prefixes = []
+        self._memo = {}
+        self._lock = threading.Lock()
+
+    def add(self, path, directives=None, **options):
+        """
+        Set the directives of a path.
+
+        :param path (str): exact path, or prefix when it ends with ``/``.
+        :param directives (str): ``Cache-Control`` value, e.g. ``"no-store"``;
+                                 otherwise built from ``options``, see
+                                 :func:`cache_directives`.
+        """
+        if directives is None:
+            directives = cache_directives(**options)
+        with self._lock:
+            if path.endswith('/'):
+                self._prefixes = [rule for rule in self._prefixes if rule[0] != path]
+                self._prefixes.append((path, directives))
+                # Longest prefix first
+                self._prefixes.sort(key=lambda rule: len(rule[0]), reverse=True)
+            else:
+                self._exact[path] = directives
+            self._memo = {}
+
+    def lookup(self, path):
+        """
+        Find the directives of a request path.
+
+        :param path (str): request path, without the query string.
+
+        :rtype str: ``Cache-Control`` value.
+        """
+        directives = self._memo.get(path)
+        if directives is not None:
+            return directives
+        directives = self._exact.get(path)
+        if directives is None:
+            directives = self.default
+            for prefix, value in self._prefixes:
+                if path.startswith(prefix):
+                    directives = value
+                    break
+        memo = self._memo
+        if len(memo) >= self.max_memo:
+            memo.clear()
+        memo[path] = directives
+        return directives
+
+    def load(self, config_file):
+        """
+        Add the rules of a configuration file.
+
+        :param config_file (str): path of the file, see the module docstring.
+
+        :rtype int: number of rules read.
+
+        :raises ValueError: If a path block has no ``cache_control`` directive.
+        """
+        with open(config_file, 'r') as f:
+            config_text = f.read()
+
+        # Drop comments, then find the path blocks
+        config_text = re.sub(r'#[^\n]*', '', config_text)
+        blocks = re.findall(r'path\s+"([^"]+)"\s*\{(.*?)\}', config_text, re.DOTALL)
+        for path, block in blocks:
+            match = re.search(r'cache_control\s+([^;]+);', block)
+            if match is None:
+                raise ValueError("No cache_control for path {} in {}".format(path, config_file))
+            self.add(path, " ".join(match.group(1).split()))
+        return len(blocks)
+
+    def rules(self):
+        """
+        Snapshot of the configured rules.
+
+        :rtype dict: path -> directives, prefixes included.
+        """
+        with self._lock:
+            rules = dict(self._prefixes)
+            rules.update(self._exact)
+            return rules
+
+
+#: Policy used when no other is configured: always revalidate.
+DEFAULT_CACHE_POLICY = CachePolicy()
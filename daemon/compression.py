@@ -0,0 +1,201 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.compression
+~~~~~~~~~~~~~~~~~
+
+This module provides the ``Accept-Encoding`` negotiation and the gzip and
+deflate codings of response bodies, using only ``gzip`` and ``zlib`` from
+the standard library.
+
+Text, CSS, JavaScript and JSON bodies compress 5-10x, which matters more
+than the CPU spent when many requests share the link. Static files are
+compressed once, the compressed variant being cached next to the raw
+bytes (or read from a ``.gz`` file placed next to the original); dynamic
+hook bodies are compressed on the fly above a size threshold.
+
+Usage Example:
+--------------
+>>> compressor = Compressor(level=6, min_size=1024)
+>>> encoding = compressor.negotiate(req.headers.get('accept-encoding'))
+>>> if encoding and compressor.wants('application/json', len(body)):
+>>>     body = compressor.compress(body, encoding)
+"""
+
+import gzip
+import os
+import zlib
+
+#: Content types worth compressing; images and archives are already compressed.
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+)
+
+#: Codings produced by the server, by order of preference.
+ENCODINGS = ("gzip", "deflate")
+
+
+def is_compressible(content_type):
+    """
+    Check whether a content type benefits from compression.
+
+    :param content_type (str): value of the Content-Type header.
+
+    :rtype bool: True for text-like types.
+    """
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def parse_accept_encoding(value):
+    """
+    Parses an ``Accept-Encoding`` header.
+
+    :param value (str): header value, e.g. ``gzip, deflate;q=0.5, br``.
+
+    :rtype dict: coding name -> quality value.
+    """
+    accepted = {}
+    for item in value.split(','):
+        name, _, params = item.partition(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name] = quality
+    return accepted
+
+
+class Compressor:
+    """
+    The :class:`Compressor <Compressor>` deciding whether and how to
+    compress a response body.
+
+    :attrs level (int): zlib compression level 1-9, 0 disables compression.
+    :attrs min_size (int): smaller bodies are sent as is.
+    """
+
+    __attrs__ = [
+        "level",
+        "min_size",
+    ]
+
+    def __init__(self, level=6, min_size=1024):
+        """
+        Initialize a new Compressor instance.
+
+        :param level (int): zlib compression level 1-9, 0 disables compression.
+        :param min_size (int): smallest body worth compressing, in bytes.
+        """
+        self.level = level
+        self.min_size = min_size
+
+    def negotiate(self, accept_encoding):
+        """
+        Choose the coding of a response from the client preferences.
+
+        :param accept_encoding (str): ``Accept-Encoding`` header, or None.
+
+        :rtype str: ``gzip`` or ``deflate``, or None for the identity coding.
+        """
+        if not self.level or not accept_encoding:
+            return None
+        accepted = parse_accept_encoding(accept_encoding)
+        wildcard = accepted.get('*', 0.0)
+        best, best_quality = None, 0.0
+        for name in ENCODINGS:
+            quality = accepted.get(name, wildcard)
+            if quality > best_quality:
+                best, best_quality = name, quality
+        return best
+
+    def wants(self, content_type, size):
+        """
+        Check whether a body is worth compressing.
+
+        :param content_type (str): value of the Content-Type header.
+        :param size (int): body length.
+
+        :rtype bool: True if compression is enabled, the type is text-like
+                     and the body reaches ``min_size``.
+        """
+        return bool(self.level) and size >= self.min_size and is_compressible(content_type)
+
+    def compress(self, data, encoding):
+        """
+        Encode a body.
+
+        :param data (bytes): raw body.
+        :param encoding (str): ``gzip`` or ``deflate``.
+
+        :rtype bytes: encoded body.
+        """
+        if encoding == 'gzip':
+            # mtime=0 keeps the output, and so the variant ETag, stable
+            return gzip.compress(data, compresslevel=self.level, mtime=0)
+        # HTTP "deflate" is the zlib format
+        return zlib.compress(data, self.level)
+
+    def variant_name(self, encoding):
+        """
+        Key of a compressed variant in the content cache.
+
+        :rtype str: coding and level, e.g. ``gzip:6``.
+        """
+        return "{}:{}".format(encoding, self.level)
+
+    def compress_file(self, path, data, encoding):
+        """
+        Encode a static file, preferring a precompressed ``path.gz`` that is
+        at least as recent as the file itself.
+
+        :param path (str): path of the file.
+        :param data (bytes): raw file content.
+        :param encoding (str): ``gzip`` or ``deflate``.
+
+        :rtype bytes: encoded content.
+        """
+        if encoding == 'gzip':
+            try:
+                if os.stat(path + '.gz').st_mtime >= os.stat(path).st_mtime:
+                    with open(path + '.gz', 'rb') as f:
+                        return f.read()
+            except OSError:
+                pass
+        return self.compress(data, encoding)
+
+
+#: Compressor used when no other is configured.
+DEFAULT_COMPRESSOR = Compressor()
+
+
+def variant_etag(etag, encoding):
+    """
+    Derives the entity tag of a compressed variant, which must differ from
+    the tag of the raw bytes.
+
+    :param etag (str): quoted tag of the raw content.
+    :param encoding (str): content coding of the variant.
+
+    :rtype str: quoted tag, e.g. ``"1378-1876c-gzip"``.
+    """
+    return '{}-{}"'.format(etag[:-1], encoding)
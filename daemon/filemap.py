@@ -0,0 +1,185 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.filemap
+~~~~~~~~~~~~~~~~~
+
+This module provides the memory-mapped serving mode of large static files.
+
+A file too big for the :class:`ContentCache <daemon.cache.ContentCache>`
+is mapped read-only once and shared by every thread of the process. Full
+and range responses are ``memoryview`` slices of the mapping written
+straight to the socket, so the content is never copied into ``bytes``,
+and since the mapping is backed by the page cache, pre-fork workers
+serving the same file share one copy of it instead of each holding their
+own.
+
+Like the content cache, a mapping is trusted for ``check_interval``
+seconds and then revalidated with one ``stat``; a file that changed is
+mapped again, responses still writing the old mapping keep it alive
+until they finish. A file must be replaced rather than truncated in
+place while it is being served.
+
+Usage Example:
+--------------
+>>> files = FileMap(max_files=64)
+>>> mapped = files.get("static/images/welcome.png")
+>>> conn.sendall(mapped.view[0:100])
+"""
+
+import collections
+import mmap
+import os
+import threading
+import time
+
+from .cache import file_validators
+
+
+class MappedFile:
+    """
+    One memory-mapped file.
+
+    :attrs path (str): path of the file.
+    :attrs view (memoryview): read-only view of the whole file.
+    :attrs mtime (float): modification time of the file when it was mapped.
+    :attrs size (int): size of the file when it was mapped.
+    :attrs checked (float): ``time.monotonic()`` of the last validation.
+    :attrs etag (str): quoted entity tag of this version of the file.
+    :attrs last_modified (str): modification time formatted as an HTTP date.
+    """
+
+    __attrs__ = [
+        "path",
+        "view",
+        "mtime",
+        "size",
+        "checked",
+        "etag",
+        "last_modified",
+    ]
+
+    def __init__(self, path, view, st, checked):
+        self.path = path
+        self.view = view
+        self.mtime = st.st_mtime
+        self.size = st.st_size
+        self.checked = checked
+        self.etag, self.last_modified = file_validators(st)
+
+
+class FileMap:
+    """
+    A thread-safe :class:`FileMap <FileMap>` of read-only file mappings,
+    the least recently used ones being dropped beyond ``max_files``.
+
+    :attrs max_files (int): number of files kept mapped.
+    :attrs check_interval (float): seconds a mapping is trusted before its
+                                   file is checked again, 0 checks every time.
+    :attrs hits (int): lookups answered by an existing mapping.
+    :attrs misses (int): lookups that mapped the file.
+    """
+
+    __attrs__ = [
+        "max_files",
+        "check_interval",
+        "hits",
+        "misses",
+    ]
+
+    def __init__(self, max_files=64, check_interval=1.0):
+        """
+        Initialize a new FileMap instance.
+
+        :param max_files (int): number of files kept mapped.
+        :param check_interval (float): seconds between two validations of a mapping.
+        """
+        self.max_files = max_files
+        self.check_interval = check_interval
+        #: Counters
+        self.hits = 0
+        self.misses = 0
+
+        self._files = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, filepath):
+        """
+        Return the mapping of a file, mapping it on first use.
+
+        :param filepath (str): path of a non-empty file.
+
+        :rtype MappedFile: the mapping.
+
+        :raises OSError: If the file cannot be opened or mapped.
+        """
+        key = os.path.normpath(filepath)
+        now = time.monotonic()
+        with self._lock:
+            mapped = self._files.get(key)
+            if mapped is not None and now - mapped.checked < self.check_interval:
+                self._files.move_to_end(key)
+                self.hits += 1
+                return mapped
+
+        try:
+            st = os.stat(key)
+        except OSError:
+            self.invalidate(key)
+            raise
+        if mapped is not None and mapped.mtime == st.st_mtime and mapped.size == st.st_size:
+            with self._lock:
+                mapped.checked = now
+                self.hits += 1
+            return mapped
+
+        with open(key, 'rb') as f:
+            # Validators of the very file mapped, which outlives the descriptor
+            st = os.fstat(f.fileno())
+            view = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        mapped = MappedFile(key, view, st, now)
+        with self._lock:
+            self.misses += 1
+            # Dropped mappings are unmapped once no response uses them
+            self._files.pop(key, None)
+            self._files[key] = mapped
+            while len(self._files) > self.max_files:
+                self._files.popitem(last=False)
+        return mapped
+
+    def invalidate(self, filepath):
+        """
+        Forget the mapping of a file, if any.
+
+        :param filepath (str): path of the file.
+        """
+        with self._lock:
+            self._files.pop(os.path.normpath(filepath), None)
+
+    def stats(self):
+        """
+        Snapshot of the mapping counters.
+
+        :rtype dict: mapped file count, bytes mapped, hits and misses.
+        """
+        with self._lock:
+            return {
+                "files": len(self._files),
+                "bytes": sum(mapped.size for mapped in self._files.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+#: Mappings shared by every connection of the process.
+FILE_MAP = FileMap()
@@ -21,10 +21,195 @@ Request and Response objects to handle client-server communication.
 """
 
 from .request import Request
-from .response import Response
+from .response import Response, SegmentedResponse, http_date, write_segments
 from .dictionary import CaseInsensitiveDict
+from .reader import HttpReader
+from .parser import BodyTooLarge
+from .timers import DEFAULT_TIMEOUTS, default_wheel, socket_deadline
+from .compression import DEFAULT_COMPRESSOR
+from .cachepolicy import DEFAULT_CACHE_POLICY, private_directives
+from .body import SPOOL_THRESHOLD
+from .shutdown import linger_close
 
+import asyncio
+import inspect
+import itertools
 import json
+import threading
+
+#: Request and Response of each worker thread, see :func:`worker_exchange`
+_worker = threading.local()
+
+def guess_content_type(text):
+    """
+    Guess the Content-Type of a hook body from its first characters.
+
+    :param text (str or bytes): body text, or its first chunk.
+
+    :rtype str: JSON, HTML or plain text content type.
+    """
+    if isinstance(text, (bytes, bytearray)):
+        text = bytes(text[:64]).decode('utf-8', errors='ignore')
+    text = text.lstrip()
+    # Check if it's JSON string
+    if text.startswith('{') or text.startswith('['):
+        return 'application/json'
+    elif text.startswith('<'):
+        return 'text/html; charset=utf-8'
+    return 'text/plain; charset=utf-8'
+
+
+def is_stream(result):
+    """
+    Check whether a hook result is a stream of chunks rather than a body.
+
+    :param result: value returned by a hook.
+
+    :rtype bool: True for generators and other (async) iterables that are
+                 not str, bytes or a JSON container.
+    """
+    if isinstance(result, (str, bytes, bytearray, dict, list, tuple)):
+        return False
+    return hasattr(result, '__iter__') or hasattr(result, '__aiter__')
+
+
+def to_bytes(chunk):
+    """
+    Encode a stream chunk.
+
+    :param chunk (str or bytes): chunk yielded by a hook.
+
+    :rtype bytes: UTF-8 encoded chunk.
+    """
+    if isinstance(chunk, str):
+        return chunk.encode('utf-8')
+    return bytes(chunk)
+
+
+def frame_chunk(data, chunked):
+    """
+    Frame one body chunk for the wire.
+
+    :param data (bytes): non-empty chunk.
+    :param chunked (bool): use the chunked transfer coding.
+
+    :rtype bytes: the framed chunk.
+    """
+    if not chunked:
+        return data
+    return b"".join(("{:x}\r\n".format(len(data)).encode('ascii'), data, b"\r\n"))
+
+
+def iterate_async(stream):
+    """
+    Drive an async iterator from synchronous code on a private event loop.
+
+    :param stream: async iterator.
+
+    :rtype generator: the items of the stream.
+    """
+    loop = asyncio.new_event_loop()
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(stream.__anext__())
+            except StopAsyncIteration:
+                break
+    finally:
+        loop.close()
+
+
+def prefetch_stream(stream):
+    """
+    Pull the first chunk of a hook stream, so that a hook failing before
+    it produced anything raises here, while a 500 can still be answered.
+
+    :param stream: iterable of bytes/str chunks.
+
+    :rtype iterator: the whole stream, first chunk included.
+    """
+    chunks = iter(stream)
+    for first in chunks:
+        return itertools.chain((first,), chunks)
+    return iter(())
+
+
+async def prefetch_async_stream(stream):
+    """
+    Asyncio counterpart of :func:`prefetch_stream`.
+
+    :param stream: async iterable of bytes/str chunks.
+
+    :rtype async iterator: the whole stream, first chunk included.
+    """
+    chunks = stream.__aiter__()
+    try:
+        first = await chunks.__anext__()
+    except StopAsyncIteration:
+        first = None
+    return prepend_async(first, chunks)
+
+
+async def prepend_async(first, chunks):
+    """Async generator of ``first``, unless None, then of ``chunks``."""
+    if first is None:
+        return
+    yield first
+    async for chunk in chunks:
+        yield chunk
+
+
+def without_body(response):
+    """
+    Keep only the header of a response, to answer a HEAD request with the
+    header fields, Content-Length included, that a GET would get.
+
+    :param response: bytes, a :class:`SegmentedResponse <SegmentedResponse>`
+                     or an (async) iterator of response parts, header first.
+
+    :rtype: the response header, in the same form.
+    """
+    if isinstance(response, SegmentedResponse):
+        return SegmentedResponse(response.header, [])
+    if isinstance(response, (bytes, bytearray)):
+        return bytes(response[:response.find(b"\r\n\r\n") + 4])
+    if hasattr(response, '__aiter__'):
+        return stream_header_async(response)
+    return stream_header_sync(response)
+
+
+def stream_header_sync(parts):
+    """Generator of the header of a streamed response, its body dropped."""
+    for part in parts:
+        yield part
+        break
+    parts.close()
+
+
+async def stream_header_async(parts):
+    """Async generator of the header of a streamed response, its body dropped."""
+    async for part in parts:
+        yield part
+        break
+    await parts.aclose()
+
+
+def worker_exchange():
+    """
+    The :class:`Request <Request>` and :class:`Response <Response>` owned by
+    the calling thread, created on its first call.
+
+    A worker thread serves one connection at a time, so it can hand the
+    same pair to each of them instead of allocating new objects. Threads
+    serving several connections at once, like an event loop, must not.
+
+    :rtype tuple: (Request, Response)
+    """
+    exchange = getattr(_worker, "exchange", None)
+    if exchange is None:
+        exchange = _worker.exchange = (Request(), Response())
+    return exchange
+
 
 class HttpAdapter:
     """
@@ -56,7 +241,11 @@ class HttpAdapter:
         "response",
     ]
 
-    def __init__(self, ip, port, conn, connaddr, routes):
+    def __init__(self, ip, port, conn, connaddr, routes,
+                 keepalive_timeout=5, max_keepalive_requests=100, drainer=None,
+                 timers=None, timeouts=None, compressor=None, file_mode="sendfile",
+                 cache_policy=None, spool_threshold=SPOOL_THRESHOLD, max_body_size=0,
+                 exchange=None):
         """
         Initialize a new HttpAdapter instance.
 
@@ -65,6 +254,23 @@ class HttpAdapter:
         :param conn (socket): Active socket connection.
         :param connaddr (tuple): Address of the connected client.
         :param routes (dict): Mapping of route paths to handler functions.
+        :param keepalive_timeout (float): seconds an idle persistent connection is kept.
+        :param max_keepalive_requests (int): requests served before the connection is closed.
+        :param drainer (ConnectionDrainer): shutdown tracker of the daemon, if any.
+        :param timers (TimerWheel): wheel expiring the connection timeouts,
+                                    defaults to the process wide wheel.
+        :param timeouts (dict): header, body and write timeouts in seconds,
+                                see ``daemon.timers.DEFAULT_TIMEOUTS``.
+        :param compressor (Compressor): content coding settings, defaults to
+                                        ``daemon.compression.DEFAULT_COMPRESSOR``.
+        :param file_mode (str): "sendfile" or "mmap", how large static files are served.
+        :param cache_policy (CachePolicy): Cache-Control directives per path, defaults
+                                           to ``daemon.cachepolicy.DEFAULT_CACHE_POLICY``.
+        :param spool_threshold (int): request bodies larger than this are spooled to disk.
+        :param max_body_size (int): request bodies larger than this are
+                                    refused with 413, 0 for no limit.
+        :param exchange (tuple): (Request, Response) to reuse, e.g. from
+                                 :func:`worker_exchange`; new ones by default.
         """
 
         #: IP address.
@@ -77,10 +283,40 @@ class HttpAdapter:
         self.connaddr = connaddr
         #: Routes
         self.routes = routes
-        #: Request
-        self.request = Request()
-        #: Response
-        self.response = Response()
+        if exchange is None:
+            exchange = (Request(), Response())
+        else:
+            exchange[0].reset()
+            exchange[1].reset()
+        #: Request, Response
+        self.request, self.response = exchange
+        #: Persistent connection settings
+        self.keepalive_timeout = keepalive_timeout
+        self.max_keepalive_requests = max_keepalive_requests
+        #: Requests served on this connection
+        self.served = 0
+        #: Pipelined responses batched into one write at most
+        self.max_pipelined = 16
+        #: Graceful shutdown tracker
+        self.drainer = drainer
+        #: Per-phase timeouts, armed on the timer wheel
+        self.timers = timers
+        self.timeouts = dict(DEFAULT_TIMEOUTS, **(timeouts or {}))
+        self.timeouts["keepalive"] = keepalive_timeout
+        self.deadline = None
+        #: Content coding of responses
+        self.compressor = compressor or DEFAULT_COMPRESSOR
+        self.response.compressor = self.compressor
+        #: Serving mode of large static files
+        self.file_mode = file_mode
+        self.response.file_mode = file_mode
+        #: Cache-Control directives per path
+        self.cache_policy = cache_policy or DEFAULT_CACHE_POLICY
+        self.response.cache_policy = self.cache_policy
+        #: Request body size kept in memory
+        self.spool_threshold = spool_threshold
+        #: Largest request body accepted
+        self.max_body_size = max_body_size
 
     def handle_client(self, conn, addr, routes):
         """
@@ -88,7 +324,15 @@ class HttpAdapter:
 
         This method reads the request from the socket, prepares the request object,
         invokes the appropriate route handler if available, builds the response,
-        and sends it back to the client.
+        and sends it back to the client. While the client asks for a persistent
+        connection, further requests are served on the same socket until it
+        stays idle for ``keepalive_timeout`` seconds, ``max_keepalive_requests``
+        is reached or the daemon shuts down. Pipelined requests are answered in order, and responses
+        to requests that were already buffered are batched into one write.
+        A client too slow to send its headers or body, or to read the
+        response, is disconnected when the timeout of that phase expires.
+        A malformed request is answered with 400 Bad Request, and one with
+        a body over ``max_body_size`` with 413, then the connection is closed.
 
         :param conn (socket): The client socket connection.
         :param addr (tuple): The client's address.
@@ -99,87 +343,576 @@ class HttpAdapter:
         self.conn = conn        
         # Connection address.
         self.connaddr = addr
-        # Request handler
-        req = self.request
-        # Response handler
-        resp = self.response
 
-        # Handle the request
-        msg = conn.recv(1024).decode()
-        req.prepare(msg, routes)
+        self.deadline = socket_deadline(self.timers or default_wheel(), conn, self.timeouts)
+        reader = HttpReader(conn, deadline=self.deadline,
+                            spool_threshold=self.spool_threshold,
+                            max_body_size=self.max_body_size)
+        # Responses to pipelined requests, sent in order with one write
+        pending = []
+        try:
+            while True:
+                # Between requests the connection may be closed by a shutdown
+                idle = self.served and not reader.buffered()
+                if idle:
+                    self.set_idle(conn, True)
+                # Handle the request
+                try:
+                    message = reader.read_message(idle=idle)
+                except ValueError as e:
+                    if self.deadline.expired:
+                        raise
+                    self.reject(conn, pending, e)
+                    break
+                if message is None:
+                    if self.deadline.expired == "header":
+                        print("[HttpAdapter] {} sent no request in time".format(addr))
+                    break
+                if idle:
+                    self.set_idle(conn, False)
+
+                req, resp = self.next_exchange()
+                req.prepare(message, routes)
+                keep_alive = self.prepare_connection(req, resp)
+
+                response = self.handle_request(req, resp)
+                pending.append(response)
+                # A streamed body may have turned the connection to close-delimited
+                keep_alive = keep_alive and resp.headers.get('Connection') != 'close'
+                # Never block on the next read while responses are held back,
+                # nor keep a stream whose header reads the reused exchange
+                if (not keep_alive or not reader.has_message()
+                        or len(pending) >= self.max_pipelined
+                        or not isinstance(response, (bytes, bytearray, SegmentedResponse))):
+                    self.flush(conn, pending)
+                if not keep_alive:
+                    break
+        except (OSError, ValueError) as e:
+            if self.deadline.expired:
+                print("[HttpAdapter] {} timed out in {} phase".format(addr, self.deadline.expired))
+            else:
+                print("[HttpAdapter] Connection error from {}: {}".format(addr, e))
+        finally:
+            self.deadline.stop()
+            # The exchange may wait for the next connection of the worker
+            self.request.reset()
+            conn.close()
+
+    def flush(self, conn, pending):
+        """
+        Send the held back responses in request order and clear the list.
+
+        The in-memory segments of consecutive responses go out together
+        with vectored writes, without joining them into one buffer.
+
+        :param conn (socket): The client socket connection.
+        :param pending (list): responses waiting to be sent: byte strings,
+                               streams or :class:`SegmentedResponse <SegmentedResponse>`.
+        """
+        if len(pending) > 1:
+            print("[HttpAdapter] Sending {} pipelined responses".format(len(pending)))
+        batch = []
+        for response in pending:
+            if isinstance(response, (bytes, bytearray)):
+                batch.append(response)
+                continue
+            if isinstance(response, SegmentedResponse) and response.in_memory():
+                batch += response.segments()
+                continue
+            # File or streamed body: send what precedes it, then the body
+            if batch:
+                self.send(conn, batch)
+                batch = []
+            if isinstance(response, SegmentedResponse):
+                self.send(conn, response.segments())
+                continue
+            if hasattr(response, '__aiter__'):
+                response = iterate_async(response)
+            for part in response:
+                self.send(conn, [part])
+        if batch:
+            self.send(conn, batch)
+        pending.clear()
+
+    def send(self, conn, segments):
+        """
+        Send response segments to the client within the write timeout.
+
+        :param conn (socket): The client socket connection.
+        :param segments (list): bytes, memoryview or :class:`FileBody <FileBody>`
+                                segments, see :func:`write_segments`.
+        """
+        self.deadline.start("write")
+        write_segments(conn, segments, self.deadline.touch)
+        self.deadline.stop()
+
+    def set_idle(self, conn, idle):
+        """
+        Tell the shutdown tracker whether the connection waits between requests.
+
+        :param conn: the connection registered with the drainer.
+        :param idle (bool): True while waiting for the next request.
+        """
+        if self.drainer is not None:
+            self.drainer.set_idle(conn, idle)
+
+    def stopping(self):
+        """
+        Check whether the daemon is shutting down.
+
+        :rtype bool: True once a graceful shutdown has begun.
+        """
+        return self.drainer is not None and self.drainer.stopping.is_set()
+
+    def reject(self, conn, pending, error):
+        """
+        Answer a request whose framing cannot be parsed, or whose body is
+        too large, after the responses held back, and close the connection:
+        the next request cannot be found in the byte stream.
+
+        :param conn (socket): The client socket connection.
+        :param pending (list): responses waiting to be sent, see :meth:`flush`.
+        :param error (ValueError): the parse error.
+        """
+        print("[HttpAdapter] Bad request from {}: {}".format(self.connaddr, error))
+        pending.append(self.build_bad_request(error))
+        self.flush(conn, pending)
+        linger_close(conn)
+
+    def next_exchange(self):
+        """
+        Provide the :class:`Request <Request>` and :class:`Response <Response>`
+        for the next request on this connection: the same objects, reset.
+
+        :rtype tuple: (Request, Response)
+        """
+        if self.served:
+            self.request.reset()
+            self.response.reset()
+        return self.request, self.response
+
+    def keep_alive_requested(self, req):
+        """
+        Check whether the client wants the connection to persist.
 
-        # Handle request hook
+        HTTP/1.1 connections persist unless the client sends
+        ``Connection: close``; HTTP/1.0 ones only with ``Connection: keep-alive``.
+
+        :param req (Request): The prepared :class:`Request <Request>`.
+
+        :rtype bool: True if the client asked for a persistent connection.
+        """
+        tokens = [t.strip().lower() for t in req.headers.get('connection', '').split(',')]
+        if req.version == 'HTTP/1.1':
+            return 'close' not in tokens
+        return 'keep-alive' in tokens
+
+    def prepare_connection(self, req, resp):
+        """
+        Decide whether the connection persists after this request and set
+        the ``Connection``/``Keep-Alive`` response headers accordingly.
+
+        :param req (Request): The prepared :class:`Request <Request>`.
+        :param resp (Response): The :class:`Response <Response>` to fill.
+
+        :rtype bool: True if the connection stays open after the response.
+        """
+        self.served += 1
+        keep_alive = (self.keep_alive_requested(req)
+                      and self.served < self.max_keepalive_requests
+                      and not self.stopping())
+        if keep_alive:
+            resp.headers['Connection'] = 'keep-alive'
+            resp.headers['Keep-Alive'] = 'timeout={}, max={}'.format(
+                int(self.keepalive_timeout),
+                self.max_keepalive_requests - self.served)
+        else:
+            resp.headers['Connection'] = 'close'
+        return keep_alive
+
+    def close_if_stopping(self, resp):
+        """
+        Turn the connection to close when a shutdown began while the hook
+        was running, so the client does not send another request.
+
+        :param resp (Response): The :class:`Response <Response>` to fill.
+        """
+        if self.stopping():
+            resp.headers['Connection'] = 'close'
+            resp.headers.pop('Keep-Alive', None)
+
+    def connection_header(self):
+        """
+        Format the connection management header lines of the current response.
+
+        :rtype str: ``Connection`` (and ``Keep-Alive``) header lines.
+        """
+        rsphdr = self.response.headers
+        lines = "Connection: {}\r\n".format(rsphdr.get('Connection', 'close'))
+        if 'Keep-Alive' in rsphdr:
+            lines += "Keep-Alive: {}\r\n".format(rsphdr['Keep-Alive'])
+        return lines
+
+    def handle_request(self, req, resp):
+        """
+        Run the request pipeline (hook or static content) for a prepared request.
+
+        The pipeline does no socket I/O, so it is shared by the threaded
+        engines and by the asyncio engine. A hook defined with ``async def``
+        is run to completion on a private event loop here. A HEAD request
+        gets the header of the GET response only.
+
+        :param req (Request): The prepared :class:`Request <Request>`.
+        :param resp (Response): The :class:`Response <Response>` to fill.
+
+        :rtype: complete HTTP response, bytes or a :class:`SegmentedResponse
+                <SegmentedResponse>`, or an iterator of parts for a streamed body.
+        """
+        response = None
         if req.hook:
-            print("[HttpAdapter] hook in route-path METHOD {} PATH {}".format(req.hook._route_path,req.hook._route_methods))
-            # ????
-            # req.hook(headers = "bksysnet",body = "get in touch")
-            
-            #
-            # TODO: handle for App hook here
-            #
+            try:
+                hook_result = self.call_hook(req)
+                if inspect.iscoroutine(hook_result):
+                    hook_result = asyncio.run(hook_result)
+                if is_stream(hook_result):
+                    if hasattr(hook_result, '__aiter__'):
+                        hook_result = iterate_async(hook_result.__aiter__())
+                    hook_result = prefetch_stream(hook_result)
+                self.close_if_stopping(resp)
+                response = self.build_hook_response(hook_result, req)
+            except Exception as e:
+                response = self.build_hook_error(e)
+        elif req.allowed:
+            response = self.build_not_allowed(req)
+
+        if response is None:
+            response = self.build_static_response(req, resp)
+        if req.method == "HEAD":
+            return without_body(response)
+        return response
+
+    async def handle_request_async(self, req, resp):
+        """
+        Asyncio counterpart of :meth:`handle_request`.
 
+        Coroutine hooks are awaited on the running loop, so a long-poll hook
+        costs no thread while it waits. Plain hooks and the static pipeline
+        may block and are run in the loop's default executor.
+
+        :param req (Request): The prepared :class:`Request <Request>`.
+        :param resp (Response): The :class:`Response <Response>` to fill.
+
+        :rtype: complete HTTP response, bytes or a :class:`SegmentedResponse
+                <SegmentedResponse>`, or an iterator of parts for a streamed body.
+        """
+        loop = asyncio.get_running_loop()
+        response = None
+        if req.hook:
             try:
-                # Call hook handler and get result
-                hook_result = req.hook(headers=req.headers, body=req.body)
-                
-                if hook_result is not None:
-                    print("[HttpAdapter] Hook returned data: {}...".format(
-                        str(hook_result)[:80]))
-                    
-                    # Determine Content-Type based on return type
-                    if isinstance(hook_result, str):
-                        # Check if it's JSON string
-                        if hook_result.strip().startswith('{') or hook_result.strip().startswith('['):
-                            content_type = 'application/json'
-                        elif hook_result.strip().startswith('<'):
-                            content_type = 'text/html; charset=utf-8'
-                        else:
-                            content_type = 'text/plain; charset=utf-8'
-                        
-                        content_bytes = hook_result.encode('utf-8')
-                    else:
-                        # For dict, list, etc - convert to JSON
-                        content_type = 'application/json'
-                        content_bytes = json.dumps(hook_result).encode('utf-8')
-                    
-                    # Build response header
-                    response_header = "HTTP/1.1 200 OK\r\n"
-                    response_header += "Content-Type: {}\r\n".format(content_type)
-                    response_header += "Content-Length: {}\r\n".format(len(content_bytes))
-                    response_header += "Connection: close\r\n"
-                    response_header += "\r\n"
-                    
-                    # Combine header + body
-                    response = response_header.encode('utf-8') + content_bytes
-                    
-                    # Send response
-                    conn.sendall(response)
-                    conn.close()
-                    return
-                    
+                if inspect.iscoroutinefunction(req.hook):
+                    hook_result = await self.call_hook(req)
                 else:
-                    print("[HttpAdapter] Hook executed but returned None")
-                    
+                    hook_result = await loop.run_in_executor(
+                        None, self.call_hook, req)
+                    if inspect.iscoroutine(hook_result):
+                        hook_result = await hook_result
+                if hasattr(hook_result, '__aiter__'):
+                    hook_result = await prefetch_async_stream(hook_result)
+                elif is_stream(hook_result):
+                    hook_result = await loop.run_in_executor(
+                        None, prefetch_stream, hook_result)
+                self.close_if_stopping(resp)
+                response = self.build_hook_response(hook_result, req)
             except Exception as e:
-                print("[HttpAdapter] Hook execution error: {}".format(e))
-                # Return JSON error response
-                error_body = json.dumps({
-                    'status': 'error',
-                    'message': 'Internal Server Error: {}'.format(str(e))
-                })
-                
-                response_header = "HTTP/1.1 500 Internal Server Error\r\n"
-                response_header += "Content-Type: application/json\r\n"
-                response_header += "Content-Length: {}\r\n".format(len(error_body))
-                response_header += "Connection: close\r\n"
-                response_header += "\r\n"
-                
-                response = response_header.encode('utf-8') + error_body.encode('utf-8')
-                conn.sendall(response)
-                conn.close()
-                return
+                response = self.build_hook_error(e)
+        elif req.allowed:
+            response = self.build_not_allowed(req)
+
+        if response is None:
+            # Index lookups, stats and file reads may block as well
+            response = await loop.run_in_executor(
+                None, self.build_static_response, req, resp)
+        if req.method == "HEAD":
+            return without_body(response)
+        return response
+
+    def call_hook(self, req):
+        """
+        Invoke the routed hook of the request.
+
+        The body is passed as text, or as a readable :class:`RequestBody
+        <daemon.body.RequestBody>` to hooks of routes declared with
+        ``stream=True``; the path parameters of the route follow as keyword
+        arguments.
+
+        :param req (Request): The prepared :class:`Request <Request>`.
+
+        :rtype: the hook result (str, JSON-serializable object, None or a coroutine).
+        """
+        print("[HttpAdapter] hook in route-path METHOD {} PATH {}".format(req.hook._route_path,req.hook._route_methods))
+        if getattr(req.hook, '_route_stream', False):
+            return req.hook(headers=req.headers, body=req.stream, **req.params)
+        return req.hook(headers=req.headers, body=req.body, **req.params)
+
+    def build_hook_response(self, hook_result, req=None):
+        """
+        Build the HTTP response for a hook result.
+
+        A hook may return a generator or any other (async) iterable of
+        bytes or str chunks instead of a complete body; the body is then
+        streamed with ``Transfer-Encoding: chunked``, or delimited by closing
+        the connection for HTTP/1.0 clients.
+
+        :param hook_result: value returned by the hook.
+        :param req (Request): The prepared :class:`Request <Request>`.
+
+        :rtype SegmentedResponse: header and body segments, an iterator of
+                                  response parts for a streamed body, or None
+                                  when the hook returned None.
+        """
+        if hook_result is None:
+            print("[HttpAdapter] Hook executed but returned None")
+            return None
+
+        if is_stream(hook_result):
+            return self.build_stream_response(hook_result, req)
+
+        print("[HttpAdapter] Hook returned {}".format(type(hook_result).__name__))
+
+        # Determine Content-Type based on return type
+        if isinstance(hook_result, str):
+            content_type = guess_content_type(hook_result)
+            content_bytes = hook_result.encode('utf-8')
+        elif isinstance(hook_result, (bytes, bytearray)):
+            content_type = 'application/octet-stream'
+            content_bytes = bytes(hook_result)
+        else:
+            # For dict, list, etc - convert to JSON
+            content_type = 'application/json'
+            content_bytes = json.dumps(hook_result).encode('utf-8')
+
+        # Compress large text bodies for clients accepting it
+        coding = ""
+        if self.compressor.wants(content_type, len(content_bytes)):
+            coding = "Vary: Accept-Encoding\r\n"
+            encoding = self.compressor.negotiate(
+                req.headers.get('accept-encoding') if req is not None else None)
+            if encoding:
+                content_bytes = self.compressor.compress(content_bytes, encoding)
+                coding += "Content-Encoding: {}\r\n".format(encoding)
+
+        # Build response header
+        response_header = "".join((
+            "HTTP/1.1 200 OK\r\n",
+            "Content-Type: ", content_type, "\r\n",
+            "Content-Length: ", str(len(content_bytes)), "\r\n",
+            "Date: ", http_date(), "\r\n",
+            "Cache-Control: ", self.path_cache_control(req), "\r\n",
+            coding,
+            self.connection_header(),
+            "\r\n",
+        ))
+
+        # Header and body are written together, never concatenated
+        return SegmentedResponse(response_header.encode('utf-8'), [content_bytes])
+
+    def build_stream_response(self, stream, req=None):
+        """
+        Build a streamed response for an iterable hook result.
+
+        The request pipeline already pulled the first chunk, see
+        :func:`prefetch_stream`, so a hook failing before it got a 500.
+        The returned iterator uses that chunk to guess the Content-Type
+        when the response is written, then frames every further chunk as
+        it is produced.
+
+        :param stream: iterable or async iterable of bytes/str chunks.
+        :param req (Request): The prepared :class:`Request <Request>`.
+
+        :rtype iterator: response parts, header first; an async iterator
+                         when the hook returned an async iterable.
+        """
+        chunked = req is None or req.version == 'HTTP/1.1'
+        if not chunked:
+            # HTTP/1.0 has no chunked coding, the end of body is the close
+            self.response.headers['Connection'] = 'close'
+            self.response.headers.pop('Keep-Alive', None)
+        print("[HttpAdapter] Hook returned a stream ({})".format(
+            "chunked" if chunked else "close-delimited"))
+
+        if hasattr(stream, '__aiter__'):
+            return self.encode_async_stream(stream, chunked)
+        return self.encode_stream(stream, chunked)
+
+    def path_cache_control(self, req):
+        """
+        Cache-Control directives of a hook response.
+
+        :param req (Request): the request answered, or None.
+
+        :rtype str: directives of the route in the cache policy.
+        """
+        if req is None or req.path is None:
+            return self.cache_policy.default
+        return self.cache_policy.lookup(req.route or req.path)
+
+    def stream_header(self, first, chunked):
+        """
+        Format the header of a streamed response.
+
+        :param first (bytes): first body chunk, used to guess the Content-Type.
+        :param chunked (bool): use ``Transfer-Encoding: chunked``.
+
+        :rtype bytes: encoded response header.
+        """
+        return "".join((
+            "HTTP/1.1 200 OK\r\n",
+            "Content-Type: ", guess_content_type(first), "\r\n",
+            "Date: ", http_date(), "\r\n",
+            "Cache-Control: ", self.path_cache_control(self.request), "\r\n",
+            "Transfer-Encoding: chunked\r\n" if chunked else "",
+            self.connection_header(),
+            "\r\n",
+        )).encode('utf-8')
+
+    def encode_stream(self, stream, chunked):
+        """
+        Generator framing the chunks of a synchronous hook stream.
+
+        :param stream: iterable of bytes/str chunks.
+        :param chunked (bool): use the chunked transfer coding.
+
+        :raises ConnectionAbortedError: If the hook fails mid-stream; the
+                                        response cannot be completed then.
+        """
+        try:
+            chunks = iter(stream)
+            first = to_bytes(next(chunks, b""))
+            yield self.stream_header(first, chunked)
+            if first:
+                yield frame_chunk(first, chunked)
+            for chunk in chunks:
+                chunk = to_bytes(chunk)
+                if chunk:
+                    yield frame_chunk(chunk, chunked)
+        except Exception as e:
+            print("[HttpAdapter] Hook stream error: {}".format(e))
+            raise ConnectionAbortedError("hook stream aborted: {}".format(e))
+        if chunked:
+            yield b"0\r\n\r\n"
+
+    async def encode_async_stream(self, stream, chunked):
+        """
+        Async generator framing the chunks of an asynchronous hook stream.
+
+        :param stream: async iterable of bytes/str chunks.
+        :param chunked (bool): use the chunked transfer coding.
+
+        :raises ConnectionAbortedError: If the hook fails mid-stream.
+        """
+        try:
+            chunks = stream.__aiter__()
+            try:
+                first = to_bytes(await chunks.__anext__())
+            except StopAsyncIteration:
+                first = b""
+            yield self.stream_header(first, chunked)
+            if first:
+                yield frame_chunk(first, chunked)
+            async for chunk in chunks:
+                chunk = to_bytes(chunk)
+                if chunk:
+                    yield frame_chunk(chunk, chunked)
+        except Exception as e:
+            print("[HttpAdapter] Hook stream error: {}".format(e))
+            raise ConnectionAbortedError("hook stream aborted: {}".format(e))
+        if chunked:
+            yield b"0\r\n\r\n"
+
+    def build_hook_error(self, e):
+        """
+        Build the JSON 500 response for a failing hook.
+
+        :param e (Exception): The exception raised by the hook.
+
+        :rtype bytes: complete HTTP response.
+        """
+        print("[HttpAdapter] Hook execution error: {}".format(e))
+        # Return JSON error response
+        error_body = json.dumps({
+            'status': 'error',
+            'message': 'Internal Server Error: {}'.format(str(e))
+        })
+
+        response_header = "HTTP/1.1 500 Internal Server Error\r\n"
+        response_header += "Content-Type: application/json\r\n"
+        response_header += "Cache-Control: no-store\r\n"
+        response_header += "Content-Length: {}\r\n".format(len(error_body))
+        response_header += self.connection_header()
+        response_header += "\r\n"
+
+        return response_header.encode('utf-8') + error_body.encode('utf-8')
+
+    def build_bad_request(self, error=None):
+        """
+        Build the 400 response to a malformed request, or the 413 response
+        to a request body too large, closing the connection.
+
+        :param error (ValueError): the parse error.
+
+        :rtype bytes: complete HTTP response.
+        """
+        if isinstance(error, BodyTooLarge):
+            body = "413 Payload Too Large"
+        else:
+            body = "400 Bad Request"
+
+        response_header = "HTTP/1.1 {}\r\n".format(body)
+        response_header += "Content-Type: text/plain\r\n"
+        response_header += "Cache-Control: no-store\r\n"
+        response_header += "Content-Length: {}\r\n".format(len(body))
+        response_header += "Connection: close\r\n"
+        response_header += "\r\n"
+
+        return response_header.encode('utf-8') + body.encode('utf-8')
+
+    def build_not_allowed(self, req):
+        """
+        Build the 405 response for a path routed for other methods only.
+
+        :param req (Request): The prepared :class:`Request <Request>`.
+
+        :rtype bytes: complete HTTP response, with the ``Allow`` header.
+        """
+        print("[HttpAdapter] {} not allowed on {}, allowed {}".format(
+            req.method, req.path, ", ".join(req.allowed)))
+        body = "405 Method Not Allowed"
+
+        response_header = "HTTP/1.1 405 Method Not Allowed\r\n"
+        response_header += "Allow: {}\r\n".format(", ".join(req.allowed))
+        response_header += "Content-Type: text/plain\r\n"
+        response_header += "Cache-Control: no-store\r\n"
+        response_header += "Content-Length: {}\r\n".format(len(body))
+        response_header += self.connection_header()
+        response_header += "\r\n"
+
+        return response_header.encode('utf-8') + body.encode('utf-8')
+
+    def build_static_response(self, req, resp):
+        """
+        Apply the login and cookie access rules, then serve the static object.
+
+        :param req (Request): The prepared :class:`Request <Request>`.
+        :param resp (Response): The :class:`Response <Response>` to fill.
+
+        :rtype SegmentedResponse: the response, or the encoded bytes of a
+                                  304, 404 or 416.
+        """
+        # The rules of the cache policy name the requested path, not the
+        # page it is rewritten to below
+        requested = req.path
+        gated = False
 
-            
         # Task 1A: Login authentication (only for backend server)
         if req.method == "POST" and req.path == "/login":
             if req.auth == True:
@@ -197,9 +930,10 @@ class HttpAdapter:
         if self.port == 9000:  # Only apply to backend server
             # Skip public pages and login redirect
             public_pages = ["/login.html", "/401.html"]
-            if hasattr(req, '_skip_cookie_check') and req._skip_cookie_check:
+            if req._skip_cookie_check:
                 print("[HttpAdapter] Skipping cookie check for login redirect")
-            elif req.method == "GET" and req.path not in public_pages:
+            elif req.method in ("GET", "HEAD") and req.path not in public_pages:
+                gated = True
                 # Re-check cookie value mỗi request
                 cookies = req.headers.get('cookie', '')
                 has_valid_cookie = 'auth=true' in cookies
@@ -210,12 +944,18 @@ class HttpAdapter:
                     resp.status_code = 401
                     resp.reason = "Unauthorized"
 
+        if resp.status_code is None or resp.status_code < 400:
+            directives = self.cache_policy.lookup(requested)
+            if gated:
+                # Served for the auth cookie only, never from a shared cache
+                directives = private_directives(directives)
+        else:
+            # An error page must not be reused once the client logs in
+            directives = "no-store"
+        resp.headers['Cache-Control'] = directives
 
         # Build response
-        response = resp.build_response(req)
-        # print(response)
-        conn.sendall(response)
-        conn.close()
+        return resp.build_response(req)
 
     @property
     def extract_cookies(self, req, resp):
@@ -0,0 +1,385 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.parser
+~~~~~~~~~~~~~~~~~
+
+This module provides the incremental HTTP/1.x request parser shared by the
+backend and the proxy.
+
+An :class:`HttpParser <HttpParser>` is fed bytes as they arrive and answers
+:data:`NEED_MORE` until a whole message has been seen, then
+:data:`COMPLETE`. The header block is scanned once for its end and split
+once into lines, which yields the method, path, version and body framing;
+the other fields are only decoded into :attr:`HttpParser.headers` when
+someone reads them, and the block is never searched again. The body is then
+collected according to ``Content-Length`` or decoded from the chunked
+coding, in as many pieces as the network delivers. A body larger than
+``spool_threshold`` is written to a spooled :class:`RequestBody
+<daemon.body.RequestBody>` as it arrives instead of being kept in memory,
+and a body larger than ``max_body_size`` is refused with
+:class:`BodyTooLarge <BodyTooLarge>` as soon as its size is known.
+
+Feeding stops at the end of the message, so the bytes of a pipelined
+request that follows are left to the caller for the next parser.
+
+Usage Example:
+--------------
+>>> parser = HttpParser()
+>>> status, used = parser.feed(b"GET /index.html HTTP/1.1\\r\\nHost: a\\r\\n\\r\\n")
+>>> status == COMPLETE, parser.method, parser.path, parser.headers['host']
+(True, 'GET', '/index.html', 'a')
+"""
+
+from .body import RequestBody, CHUNK_SIZE, SPOOL_THRESHOLD
+
+#: Largest accepted header block, and longest chunk size or trailer line.
+MAX_HEADER_SIZE = 65536
+
+#: :meth:`HttpParser.feed` results.
+NEED_MORE = "need-more"
+COMPLETE = "complete"
+
+
+class BodyTooLarge(ValueError):
+    """The request body exceeds ``max_body_size``, answered with 413."""
+
+
+class HttpParser:
+    """
+    The :class:`HttpParser <HttpParser>` state machine reading one request.
+
+    The state moves from ``head`` to ``body`` (fixed length) or through
+    ``chunk-size``, ``chunk-data``, ``chunk-end`` and ``trailer`` (chunked),
+    and ends in ``done``.
+
+    :attrs max_header_size (int): largest accepted header block.
+    :attrs state (str): current state of the parser.
+    :attrs received (int): bytes of the message consumed so far.
+    :attrs head (bytes): raw header block without its final blank line.
+    :attrs method (str): request method, e.g. ``GET``.
+    :attrs path (str): request target as sent, e.g. ``/index.html``.
+    :attrs version (str): protocol version, e.g. ``HTTP/1.1``.
+    :attrs headers (dict): header fields by lowercased name, decoded on
+                           first access; repeated fields are joined.
+    :attrs content_length (int): announced body length, 0 when chunked.
+    :attrs chunked (bool): the body uses the chunked transfer coding.
+    :attrs spool_threshold (int): larger bodies are spooled to disk.
+    :attrs max_body_size (int): largest accepted body, 0 for no limit.
+    :attrs body (bytes-like): the body, complete once the state is ``done``;
+                              a :class:`RequestBody <daemon.body.RequestBody>`
+                              once larger than ``spool_threshold``.
+    """
+
+    __attrs__ = [
+        "max_header_size",
+        "state",
+        "received",
+        "head",
+        "method",
+        "path",
+        "version",
+        "headers",
+        "content_length",
+        "chunked",
+        "body",
+    ]
+
+    def __init__(self, max_header_size=MAX_HEADER_SIZE, spool_threshold=SPOOL_THRESHOLD,
+                 max_body_size=0):
+        """
+        Initialize a new HttpParser instance.
+
+        :param max_header_size (int): largest accepted header block.
+        :param spool_threshold (int): larger bodies are spooled to disk.
+        :param max_body_size (int): largest accepted body, 0 for no limit.
+        """
+        self.max_header_size = max_header_size
+        self.spool_threshold = spool_threshold
+        self.max_body_size = max_body_size
+        self.state = "head"
+        self.received = 0
+        self.head = None
+        self.method = None
+        self.path = None
+        self.version = None
+        self.content_length = 0
+        self.chunked = False
+        self.body = b""
+
+        #: Lines of the header block, decoded into headers on first access
+        self._lines = ()
+        self._headers = None
+        #: Partial header block or chunk line carried between two feeds
+        self._line = bytearray()
+        #: Bytes of the body received, or left in the current chunk
+        self._filled = 0
+        self._chunk_left = 0
+        #: Receive buffer of a spooled body, see body_window
+        self._scratch = None
+        self._trailer_size = 0
+        self._error = None
+
+    @property
+    def complete(self):
+        """True once the whole message has been parsed."""
+        return self.state == "done"
+
+    def feed(self, data, start=0, end=None):
+        """
+        Parse the bytes ``data[start:end]``.
+
+        :param data (bytes): newly received bytes, bytes or bytearray; a
+                             memoryview is copied once.
+        :param start (int): first byte to parse.
+        :param end (int): end of the bytes to parse, defaults to ``len(data)``.
+
+        :rtype tuple: (:data:`NEED_MORE` or :data:`COMPLETE`, number of bytes
+                      consumed). Fewer than given are consumed only when the
+                      message completes; the rest belongs to the next one.
+
+        :raises ValueError: If the message is malformed or too large; every
+                            later call raises the same error. A body over
+                            ``max_body_size`` raises :class:`BodyTooLarge`.
+        """
+        if self._error is not None:
+            raise self._error
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        if end is None:
+            end = len(data)
+        pos = start
+        try:
+            while pos < end and self.state != "done":
+                state = self.state
+                if state == "head":
+                    pos = self._feed_head(data, pos, end)
+                elif state == "body":
+                    take = min(self.content_length - self._filled, end - pos)
+                    if self._scratch is not None:
+                        self.body.write(memoryview(data)[pos:pos + take])
+                    else:
+                        self.body[self._filled:self._filled + take] = memoryview(data)[pos:pos + take]
+                    self._filled += take
+                    pos += take
+                    if self._filled == self.content_length:
+                        self.state = "done"
+                elif state == "chunk-data":
+                    take = min(self._chunk_left, end - pos)
+                    body = self.body
+                    if isinstance(body, RequestBody):
+                        body.write(memoryview(data)[pos:pos + take])
+                    else:
+                        body += memoryview(data)[pos:pos + take]
+                        if len(body) > self.spool_threshold:
+                            self.body = RequestBody(body, spool_threshold=self.spool_threshold)
+                    self._chunk_left -= take
+                    pos += take
+                    if not self._chunk_left:
+                        self.state = "chunk-end"
+                else:
+                    pos = self._feed_line(data, pos, end)
+        except ValueError as e:
+            self._error = e
+            self.state = "error"
+            raise
+        self.received += pos - start
+        return (COMPLETE if self.state == "done" else NEED_MORE), pos - start
+
+    def body_window(self):
+        """
+        Free space of a fixed-length body, so a reader can receive the rest
+        of a large body straight into it; report what was written with
+        :meth:`advance`. A spooled body is received through a reusable
+        buffer instead and written to its file by :meth:`advance`.
+
+        :rtype memoryview: the unfilled part of the body, or None outside
+                           the ``body`` state.
+        """
+        if self.state != "body":
+            return None
+        if self._scratch is not None:
+            left = self.content_length - self._filled
+            return memoryview(self._scratch)[:min(left, len(self._scratch))]
+        return memoryview(self.body)[self._filled:]
+
+    def advance(self, n):
+        """
+        Account for ``n`` body bytes written into :meth:`body_window`.
+
+        :param n (int): number of bytes written.
+
+        :rtype str: :data:`NEED_MORE` or :data:`COMPLETE`.
+        """
+        if self._scratch is not None:
+            with memoryview(self._scratch) as view:
+                self.body.write(view[:n])
+        self._filled += n
+        self.received += n
+        if self._filled == self.content_length:
+            self.state = "done"
+            return COMPLETE
+        return NEED_MORE
+
+    def _feed_head(self, data, pos, end):
+        """Look for the end of the header block, then parse the block."""
+        line = self._line
+        if not line:
+            # Stray CRLFs between pipelined messages are ignored
+            while pos < end - 1 and data[pos:pos + 2] == b"\r\n":
+                pos += 2
+            found = data.find(b"\r\n\r\n", pos, end)
+            if found != -1:
+                if found - pos > self.max_header_size:
+                    raise ValueError("Request header block too large")
+                self._parse_head(bytes(data[pos:found]))
+                return found + 4
+            old = 0
+        else:
+            old = len(line)
+        # The block may end in a later feed: keep what came so far
+        line += memoryview(data)[pos:end]
+        found = line.find(b"\r\n\r\n", max(0, old - 3)) if old else -1
+        if found == -1:
+            if len(line) > self.max_header_size:
+                raise ValueError("Request header block too large")
+            return end
+        if found > self.max_header_size:
+            raise ValueError("Request header block too large")
+        head = bytes(line[:found])
+        line.clear()
+        self._parse_head(head)
+        return pos + found + 4 - old
+
+    def _parse_head(self, head):
+        """
+        Split the header block into the request line and the field lines.
+        Only the fields framing the body are decoded now, see :attr:`headers`.
+        """
+        self.head = head = head.lstrip(b"\r\n")
+        lines = head.split(b"\r\n")
+        parts = lines[0].decode('utf-8', 'replace').split()
+        if len(parts) != 3:
+            raise ValueError("Malformed request line")
+        self.method, self.path, self.version = parts
+        self._lines = lines
+
+        length = None
+        for line in lines[1:]:
+            # Cheap first-byte test before looking at the name
+            if line[:1] not in (b"c", b"C", b"t", b"T"):
+                continue
+            name, sep, value = line.partition(b":")
+            name = name.strip().lower()
+            if name == b"content-length":
+                value = value.strip()
+                if not value.isdigit() or (length is not None and value != length):
+                    raise ValueError("Invalid Content-Length: {}".format(value.decode('utf-8', 'replace')))
+                length = value
+            elif name == b"transfer-encoding":
+                self.chunked = value.strip().lower().endswith(b"chunked")
+
+        if self.chunked:
+            self.body = bytearray()
+            self.state = "chunk-size"
+            return
+        self.content_length = int(length) if length else 0
+        if self.max_body_size and self.content_length > self.max_body_size:
+            raise BodyTooLarge("Request body of {} bytes too large".format(self.content_length))
+        if self.content_length > self.spool_threshold:
+            self.body = RequestBody(spool_threshold=self.spool_threshold)
+            self.body.spool()
+            self._scratch = bytearray(min(self.content_length, CHUNK_SIZE))
+            self.state = "body"
+        elif self.content_length:
+            self.body = bytearray(self.content_length)
+            self.state = "body"
+        else:
+            self.state = "done"
+
+    @property
+    def headers(self):
+        """
+        Header fields by lowercased name, decoded on first access; repeated
+        fields are joined. Empty until the header block has been parsed.
+
+        :rtype dict: name -> value.
+        """
+        headers = self._headers
+        if headers is None:
+            headers = {}
+            for line in self._lines[1:]:
+                name, sep, value = line.partition(b":")
+                if not sep:
+                    continue
+                name = name.strip().lower().decode('utf-8', 'replace')
+                value = value.strip().decode('utf-8', 'replace')
+                if name in headers:
+                    value = headers[name] + ("; " if name == "cookie" else ", ") + value
+                headers[name] = value
+            if self.head is not None:
+                self._headers = headers
+        return headers
+
+    def _feed_line(self, data, pos, end):
+        """Collect one CRLF terminated line of the chunked coding."""
+        line = self._line
+        if line.endswith(b"\r") and data[pos:pos + 1] == b"\n":
+            # The CRLF straddles the two feeds
+            text = bytes(line[:-1])
+            line.clear()
+            self._on_line(text)
+            return pos + 1
+        found = data.find(b"\r\n", pos, end)
+        if found == -1:
+            line += memoryview(data)[pos:end]
+            if len(line) > self.max_header_size:
+                raise ValueError("Chunk line too large")
+            return end
+        if line:
+            line += memoryview(data)[pos:found]
+            text = bytes(line)
+            line.clear()
+        else:
+            text = bytes(data[pos:found])
+        self._on_line(text)
+        return found + 2
+
+    def _on_line(self, text):
+        """Advance the chunked coding with one complete line."""
+        state = self.state
+        if state == "chunk-size":
+            try:
+                size = int(text.split(b";", 1)[0].strip(), 16)
+            except ValueError:
+                raise ValueError("Invalid chunk size")
+            if size < 0:
+                raise ValueError("Invalid chunk size")
+            if self.max_body_size and len(self.body) + size > self.max_body_size:
+                raise BodyTooLarge("Chunked request body too large")
+            if size:
+                self._chunk_left = size
+                self.state = "chunk-data"
+            else:
+                self.state = "trailer"
+        elif state == "chunk-end":
+            if text:
+                raise ValueError("Malformed chunk terminator")
+            self.state = "chunk-size"
+        elif state == "trailer":
+            # Trailer fields are discarded, up to the blank line
+            self._trailer_size += len(text)
+            if self._trailer_size > self.max_header_size:
+                raise ValueError("Chunked trailer too large")
+            if not text:
+                self.state = "done"
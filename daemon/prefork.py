@@ -0,0 +1,214 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.prefork
+~~~~~~~~~~~~~~~~~
+
+This module provides the multi-process (pre-fork) mode of the backend daemon.
+
+A supervisor process forks ``workers`` copies of the server which accept on
+the same port, so one backend uses every core instead of the single core the
+GIL allows a process. The port is shared either through one listening socket
+created before forking, or, with ``reuse_port``, through one ``SO_REUSEPORT``
+socket per worker which lets the kernel balance new connections. The
+supervisor restarts workers that exit and stops them all on SIGINT/SIGTERM.
+
+Notes:
+------
+- Worker processes do not share memory: module level state of an app (for
+  example the peer list of chat_server.py) exists once per worker.
+- Platforms without ``os.fork`` fall back to a single process.
+
+Usage Example:
+--------------
+>>> create_backend("127.0.0.1", 9000, routes={}, workers=4)
+
+"""
+
+import os
+import signal
+import socket
+import time
+
+#: A worker exiting sooner than this after its start is considered crash looping.
+MIN_WORKER_LIFETIME = 1.0
+
+
+def create_listener(ip, port, reuse_port=False, backlog=50):
+    """
+    Creates the listening socket of a backend.
+
+    :param ip (str): IP address to bind.
+    :param port (int): Port number to listen on.
+    :param reuse_port (bool): set ``SO_REUSEPORT`` so several sockets share the port.
+    :param backlog (int): listen backlog.
+
+    :rtype socket.socket: bound and listening socket.
+    """
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if reuse_port:
+        server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    server.bind((ip, port))
+    server.listen(backlog)
+    return server
+
+
+def supports_prefork():
+    """
+    Check whether this platform can fork worker processes.
+
+    :rtype bool: True if ``os.fork`` is available.
+    """
+    return hasattr(os, "fork")
+
+
+def supports_reuse_port():
+    """
+    Check whether this platform provides ``SO_REUSEPORT``.
+
+    :rtype bool: True if the socket option is available.
+    """
+    return hasattr(socket, "SO_REUSEPORT")
+
+
+class Supervisor:
+    """
+    The :class:`Supervisor <Supervisor>` forking and watching worker processes.
+
+    :attrs ip (str): IP address to bind.
+    :attrs port (int): Port number to listen on.
+    :attrs serve (callable): ``serve(listener)`` run by every worker, never returns normally.
+    :attrs workers (int): number of worker processes to keep alive.
+    :attrs reuse_port (bool): give every worker its own ``SO_REUSEPORT`` socket.
+    :attrs backlog (int): listen backlog of the worker sockets.
+    :attrs restarts (int): number of workers restarted after an exit.
+    """
+
+    __attrs__ = [
+        "ip",
+        "port",
+        "serve",
+        "workers",
+        "reuse_port",
+        "backlog",
+        "restarts",
+    ]
+
+    def __init__(self, ip, port, serve, workers, reuse_port=False, backlog=50):
+        """
+        Initialize a new Supervisor instance.
+
+        :param ip (str): IP address to bind.
+        :param port (int): Port number to listen on.
+        :param serve (callable): ``serve(listener)`` run by every worker.
+        :param workers (int): number of worker processes.
+        :param reuse_port (bool): use one ``SO_REUSEPORT`` socket per worker.
+        :param backlog (int): listen backlog of the worker sockets.
+        """
+        self.ip = ip
+        self.port = port
+        self.serve = serve
+        self.workers = workers
+        self.reuse_port = reuse_port and supports_reuse_port()
+        self.backlog = backlog
+        self.restarts = 0
+
+        self._listener = None
+        self._children = {}
+        self._stopping = False
+
+    def run(self):
+        """
+        Fork the workers and supervise them until a stop signal arrives.
+        """
+        if not self.reuse_port:
+            # Shared socket: bound once here and inherited by every worker
+            self._listener = create_listener(self.ip, self.port, backlog=self.backlog)
+        else:
+            # Probe the address so a bind error is reported once, not per worker
+            create_listener(self.ip, self.port, reuse_port=True).close()
+
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+
+        print("[Supervisor] Starting {} workers on port {} ({})".format(
+            self.workers, self.port,
+            "SO_REUSEPORT" if self.reuse_port else "shared socket"))
+        for index in range(self.workers):
+            self._spawn(index)
+
+        while self._children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            except InterruptedError:
+                continue
+            index, started = self._children.pop(pid, (None, None))
+            if index is None or self._stopping:
+                continue
+
+            print("[Supervisor] Worker {} (pid {}) exited with status {}, restarting".format(
+                index, pid, status))
+            if time.time() - started < MIN_WORKER_LIFETIME:
+                time.sleep(MIN_WORKER_LIFETIME)
+            self.restarts += 1
+            self._spawn(index)
+
+        if self._listener is not None:
+            self._listener.close()
+        print("[Supervisor] All workers stopped ({} restarts)".format(self.restarts))
+
+    def _spawn(self, index):
+        """
+        Fork one worker process.
+
+        :param index (int): worker slot number, used in log lines.
+        """
+        pid = os.fork()
+        if pid:
+            self._children[pid] = (index, time.time())
+            return
+
+        # Worker process: the supervisor handles Ctrl+C for the whole group
+        # and forwards SIGTERM, which the serving loop turns into a drain
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        code = 0
+        try:
+            listener = self._listener
+            if listener is None:
+                listener = create_listener(self.ip, self.port, reuse_port=True,
+                                           backlog=self.backlog)
+            print("[Supervisor] Worker {} running as pid {}".format(index, os.getpid()))
+            self.serve(listener)
+        except BaseException as e:
+            print("[Supervisor] Worker {} failed: {}".format(index, e))
+            code = 1
+        finally:
+            os._exit(code)
+
+    def _stop(self, signum, frame):
+        """
+        Signal handler: stop every worker and leave the supervision loop.
+        """
+        if self._stopping:
+            return
+        self._stopping = True
+        print("[Supervisor] Received signal {}, stopping workers".format(signum))
+        for pid in list(self._children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
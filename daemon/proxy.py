@@ -32,6 +32,23 @@ import threading
 from .response import *
 from .httpadapter import HttpAdapter
 from .dictionary import CaseInsensitiveDict
+from .reader import HttpReader
+from .body import RequestBody
+from .shutdown import ConnectionDrainer, linger_close
+from .timers import DEFAULT_TIMEOUTS, default_wheel, socket_deadline
+
+#: Seconds between two checks for a stop signal in the accept loop.
+ACCEPT_POLL_INTERVAL = 0.5
+
+#: Answer to a request whose framing cannot be parsed.
+BAD_REQUEST = (
+    "HTTP/1.1 400 Bad Request\r\n"
+    "Content-Type: text/plain\r\n"
+    "Content-Length: 15\r\n"
+    "Connection: close\r\n"
+    "\r\n"
+    "400 Bad Request"
+).encode('utf-8')
 
 #: A dictionary mapping hostnames to backend IP and port tuples.
 #: Used to determine routing targets for incoming requests.
@@ -42,32 +59,47 @@ PROXY_PASS = {
 }
 round_robin_index = {}
 
-def forward_request(host, port, request):
+#: Client timeouts per phase, plus the time a backend may take to answer.
+PROXY_TIMEOUTS = dict(DEFAULT_TIMEOUTS, upstream=60)
+
+def forward_request(host, port, request, timeouts=PROXY_TIMEOUTS):
     """
     Forwards an HTTP request to a backend server and retrieves the response.
 
     :params host (str): IP address of the backend server.
     :params port (int): port number of the backend server.
-    :params request (str): incoming HTTP request.
+    :params request (bytes or list): incoming HTTP request, or its parts as
+                                     built by :func:`build_forward_request`.
+    :params timeouts (dict): the ``upstream`` entry bounds the whole exchange.
 
     :rtype bytes: Raw HTTP response from the backend server. If the connection
                   fails, returns a 404 Not Found response.
     """
 
     backend = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    deadline = socket_deadline(default_wheel(), backend, timeouts)
+    deadline.start("upstream")
 
     try:
         backend.connect((host, port))
-        backend.sendall(request.encode())
-        # print(request.encode())
-        response = b""
+        if isinstance(request, bytes):
+            request = [request]
+        for part in request:
+            if isinstance(part, RequestBody):
+                # A spooled body is forwarded chunk by chunk
+                for chunk in part:
+                    backend.sendall(chunk)
+            else:
+                backend.sendall(part)
+        # print(request)
+        chunks = []
         while True:
-            chunk = backend.recv(4096)
+            chunk = backend.recv(65536)
             if not chunk:
                 break
-            response += chunk
+            chunks.append(chunk)
         # print(response)
-        return response
+        return b"".join(chunks)
     except socket.error as e:
       print("Socket error: {}".format(e))
       return (
@@ -78,6 +110,33 @@ def forward_request(host, port, request):
             "\r\n"
             "404 Not Found"
         ).encode('utf-8')
+    finally:
+        deadline.stop()
+        backend.close()
+
+
+def build_forward_request(head, body):
+    """
+    Rebuilds the request sent to the backend from its framed parts.
+
+    The connection management headers are replaced by ``Connection: close``
+    because the proxy reads the backend response until end-of-stream. A
+    chunked body has already been decoded, so it is forwarded with a plain
+    ``Content-Length``.
+
+    :params head (bytes): request header block.
+    :params body (bytes-like or RequestBody): request body, possibly spooled.
+
+    :rtype list: header block and body of the request to forward.
+    """
+    lines = [line for line in head.split(b'\r\n')
+             if not line.lower().startswith((b'connection:', b'keep-alive:',
+                                             b'transfer-encoding:',
+                                             b'content-length:'))]
+    if body:
+        lines.append('Content-Length: {}'.format(len(body)).encode())
+    lines.append(b'Connection: close')
+    return [b''.join([b'\r\n'.join(lines), b'\r\n\r\n']), body]
 
 
 def resolve_routing_policy(hostname, routes):
@@ -141,7 +200,7 @@ def resolve_routing_policy(hostname, routes):
 
     return proxy_host, proxy_port
 
-def handle_client(ip, port, conn, addr, routes):
+def handle_client(ip, port, conn, addr, routes, timeouts=PROXY_TIMEOUTS):
     """
     Handles an individual client connection by parsing the request,
     determining the target backend, and forwarding the request.
@@ -158,18 +217,34 @@ def handle_client(ip, port, conn, addr, routes):
     :params conn (socket.socket): client connection socket.
     :params addr (tuple): client address (IP, port).
     :params routes (dict): dictionary mapping hostnames and location.
+    :params timeouts (dict): client and upstream timeouts per phase.
     """
 
-    request = conn.recv(1024).decode()
-
-    # Extract hostname
-
-    # Original code did not extract hostname correctly
-    hostname = ""
-    
-    for line in request.splitlines():
-        if line.lower().startswith('host:'):
-            hostname = line.split(':', 1)[1].strip()
+    deadline = socket_deadline(default_wheel(), conn, timeouts)
+    try:
+        message = HttpReader(conn, deadline=deadline).read_message()
+    except (OSError, ValueError) as e:
+        if deadline.expired:
+            print("[Proxy] {} timed out in {} phase".format(addr, deadline.expired))
+        else:
+            print("[Proxy] {} bad request: {}".format(addr, e))
+        if isinstance(e, ValueError) and not deadline.expired:
+            deadline.start("write")
+            try:
+                conn.sendall(BAD_REQUEST)
+            except OSError:
+                pass
+            deadline.stop()
+            linger_close(conn)
+        message = None
+    if message is None:
+        deadline.stop()
+        conn.close()
+        return
+    head, body = message.head, message.body
+
+    # Extract hostname, already parsed with the other header fields
+    hostname = message.headers.get('host', '')
 
     print("[Proxy] {} at Host: {}".format(addr, hostname))
 
@@ -183,7 +258,8 @@ def handle_client(ip, port, conn, addr, routes):
 
     if resolved_host:
         print("[Proxy] Host name {} is forwarded to {}:{}".format(hostname,resolved_host, resolved_port))
-        response = forward_request(resolved_host, resolved_port, request)        
+        response = forward_request(resolved_host, resolved_port,
+                                   build_forward_request(head, body), timeouts)
     else:
         response = (
             "HTTP/1.1 404 Not Found\r\n"
@@ -193,53 +269,87 @@ def handle_client(ip, port, conn, addr, routes):
             "\r\n"
             "404 Not Found"
         ).encode('utf-8')
-    conn.sendall(response)
-    conn.close()
+    deadline.start("write")
+    try:
+        send_vectored(conn, [response], deadline.touch)
+    except OSError as e:
+        print("[Proxy] {} write failed: {}".format(addr, e))
+    finally:
+        deadline.stop()
+        conn.close()
+
+def serve_client(ip, port, conn, addr, routes, drainer):
+    """
+    Runs :func:`handle_client` for a connection tracked by the drainer.
 
-def run_proxy(ip, port, routes):
+    :params drainer (ConnectionDrainer): tracks the connection for shutdown.
+    """
+    try:
+        handle_client(ip, port, conn, addr, routes)
+    finally:
+        drainer.unregister(conn)
+
+def run_proxy(ip, port, routes, drain_timeout=10):
     """
     Starts the proxy server and listens for incoming connections. 
 
     The process dinds the proxy server to the specified IP and port.
     In each incomping connection, it accepts the connections and
     spawns a new thread for each client using `handle_client`.
- 
+
+    On SIGTERM/SIGINT the proxy stops accepting and waits up to
+    ``drain_timeout`` seconds for the connections in progress.
 
     :params ip (str): IP address to bind the proxy server.
     :params port (int): port number to listen on.
     :params routes (dict): dictionary mapping hostnames and location.
+    :params drain_timeout (float): seconds granted to open connections on shutdown.
 
     """
 
     proxy = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    proxy.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    drainer = ConnectionDrainer("Proxy")
 
     try:
         proxy.bind((ip, port))
         proxy.listen(50)
         print("[Proxy] Listening on IP {} port {}".format(ip,port))
-        while True:
-            conn, addr = proxy.accept()
+        drainer.install_signal_handlers()
+        # Wake up regularly so a stop signal is noticed
+        proxy.settimeout(ACCEPT_POLL_INTERVAL)
+        while not drainer.stopping.is_set():
+            try:
+                conn, addr = proxy.accept()
+            except socket.timeout:
+                continue
+            conn.settimeout(None)
+            drainer.register(conn)
             #
             #  TODO: implement the step of the client incomping connection
             #        using multi-thread programming with the
             #        provided handle_client routine
             #
             client_thread = threading.Thread(
-                target=handle_client,
-                args=(ip, port, conn, addr, routes)
+                target=serve_client,
+                args=(ip, port, conn, addr, routes, drainer)
             )
             client_thread.daemon = True
             client_thread.start()
     except socket.error as e:
       print("Socket error: {}".format(e))
+    finally:
+        proxy.close()
+    drainer.drain(drain_timeout)
 
-def create_proxy(ip, port, routes):
+def create_proxy(ip, port, routes, drain_timeout=10):
     """
     Entry point for launching the proxy server.
 
     :params ip (str): IP address to bind the proxy server.
     :params port (int): port number to listen on.
     :params routes (dict): dictionary mapping hostnames and location.
+    :params drain_timeout (float): seconds granted to open connections on shutdown.
     """
 
-    run_proxy(ip, port, routes)
+    run_proxy(ip, port, routes, drain_timeout)
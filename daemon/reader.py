@@ -0,0 +1,314 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.reader
+~~~~~~~~~~~~~~~~~
+
+This module provides the request framing used by the backend and the proxy.
+
+Both readers feed the bytes they receive to an incremental
+:class:`HttpParser <daemon.parser.HttpParser>`, which finds the end of the
+header block, parses the request line and the fields in one pass and
+collects the body by ``Content-Length`` or from the chunked coding. Bytes
+are kept undecoded until then; a read returns the parser of the message.
+
+:class:`HttpReader <HttpReader>` reads from a blocking socket through one
+preallocated buffer filled with ``recv_into``, and receives the rest of a
+large fixed-length body straight into the body buffer of the parser, so an
+upload is copied once instead of being rebuilt by repeated concatenation;
+a body too large to keep in memory is spooled to disk as it arrives.
+Bytes read past the end of a message stay buffered for the next call.
+Given a :class:`Deadline <daemon.timers.Deadline>`, it moves the
+connection through the keepalive, header and body timeout phases as bytes
+arrive. :class:`AsyncHttpReader <AsyncHttpReader>` does the same framing
+on an asyncio stream.
+
+Usage Example:
+--------------
+>>> reader = HttpReader(conn)
+>>> message = reader.read_message()
+>>> if message is not None:
+>>>     message.method, message.path, message.headers, message.body
+"""
+
+from .parser import HttpParser, COMPLETE, MAX_HEADER_SIZE
+from .body import SPOOL_THRESHOLD
+
+#: Initial size of the connection buffer.
+BUFFER_SIZE = 8192
+#: Bytes asked from an asyncio stream at once.
+STREAM_READ_SIZE = 65536
+
+
+class HttpReader:
+    """
+    A buffered :class:`HttpReader <HttpReader>` reading HTTP messages
+    from a blocking socket.
+
+    :attrs conn (socket.socket): connection to read from.
+    :attrs max_header_size (int): largest accepted header block.
+    :attrs deadline (Deadline): read timeouts of the connection, or None.
+    :attrs spool_threshold (int): larger bodies are spooled to disk.
+    :attrs max_body_size (int): largest accepted body, 0 for no limit.
+    """
+
+    __attrs__ = [
+        "conn",
+        "max_header_size",
+        "deadline",
+        "spool_threshold",
+        "max_body_size",
+    ]
+
+    def __init__(self, conn, buffer_size=BUFFER_SIZE, max_header_size=MAX_HEADER_SIZE,
+                 deadline=None, spool_threshold=SPOOL_THRESHOLD, max_body_size=0):
+        """
+        Initialize a new HttpReader instance.
+
+        :param conn (socket.socket): connection to read from.
+        :param buffer_size (int): initial size of the preallocated buffer.
+        :param max_header_size (int): largest accepted header block.
+        :param deadline (Deadline): read timeouts of the connection, or None.
+        :param spool_threshold (int): larger bodies are spooled to disk.
+        :param max_body_size (int): largest accepted body, 0 for no limit.
+        """
+        #: Connection
+        self.conn = conn
+        #: Header limit
+        self.max_header_size = max_header_size
+        #: Read timeouts
+        self.deadline = deadline
+        #: Body size kept in memory
+        self.spool_threshold = spool_threshold
+        self.max_body_size = max_body_size
+
+        self._buf = bytearray(buffer_size)
+        self._start = 0
+        self._end = 0
+        #: Parser of the message being read, possibly started by has_message
+        self._parser = None
+
+    def buffered(self):
+        """
+        Number of bytes received but not consumed by a complete message yet.
+
+        :rtype int: pending byte count, including a message partly parsed.
+        """
+        pending = self._end - self._start
+        if self._parser is not None:
+            pending += self._parser.received
+        return pending
+
+    def has_message(self):
+        """
+        Check, without reading the socket, whether a whole message is buffered.
+
+        A pipelining client sends its next requests before reading the
+        responses, so their bytes are often already here. They are parsed
+        now, and :meth:`read_message` resumes from where this left off.
+
+        :rtype bool: True if a complete message can be read without blocking.
+        """
+        if self._end == self._start:
+            return self._parser is not None and self._parser.complete
+        try:
+            return self._feed(self._next_parser()) == COMPLETE
+        except ValueError:
+            # Reported by the next read
+            return True
+
+    def _next_parser(self):
+        """Return the parser of the message being read, creating it first."""
+        if self._parser is None:
+            self._parser = HttpParser(self.max_header_size, self.spool_threshold,
+                                      self.max_body_size)
+        return self._parser
+
+    def _feed(self, parser):
+        """
+        Parse the buffered bytes.
+
+        :rtype str: :data:`NEED_MORE <daemon.parser.NEED_MORE>` or
+                    :data:`COMPLETE <daemon.parser.COMPLETE>`.
+        """
+        status, used = parser.feed(self._buf, self._start, self._end)
+        self._start += used
+        if self._start == self._end:
+            self._start = self._end = 0
+        return status
+
+    def _fill(self):
+        """
+        Receive more bytes at the end of the buffer, compacting or growing
+        it first when there is no free space left.
+
+        :rtype int: number of bytes received, 0 at end of stream.
+        """
+        if self._end == len(self._buf):
+            pending = self._end - self._start
+            if self._start:
+                self._buf[:pending] = self._buf[self._start:self._end]
+            else:
+                self._buf.extend(bytes(len(self._buf)))
+            self._start = 0
+            self._end = pending
+        with memoryview(self._buf) as view:
+            n = self.conn.recv_into(view[self._end:])
+        self._end += n
+        return n
+
+    def read_message(self, idle=False):
+        """
+        Read one complete message.
+
+        :param idle (bool): the connection waits between two requests, so
+                            the keep-alive timeout applies until bytes arrive.
+
+        :rtype HttpParser: the parsed message, or None if the peer closed
+                           the connection between messages.
+
+        :raises ValueError: If the message is malformed or truncated.
+        """
+        deadline = self.deadline
+        parser = self._next_parser()
+        if deadline is not None:
+            deadline.start("keepalive" if idle and not self.buffered() else "header")
+        while True:
+            if self._end > self._start and self._feed(parser) == COMPLETE:
+                break
+            if parser.complete:
+                break
+            if deadline is not None and parser.state != "head" and deadline.phase != "body":
+                deadline.start("body")
+            window = parser.body_window()
+            if window is not None:
+                # The rest of a fixed-length body goes straight into it
+                with window:
+                    n = self.conn.recv_into(window)
+                if not n:
+                    raise ValueError("Connection closed inside request body")
+                if deadline is not None:
+                    deadline.touch()
+                if parser.advance(n) == COMPLETE:
+                    break
+                continue
+            if not self._fill():
+                if not parser.received:
+                    self._parser = None
+                    return None
+                if parser.state == "head":
+                    raise ValueError("Connection closed inside request headers")
+                raise ValueError("Connection closed inside request body")
+            if deadline is not None:
+                # The first bytes of the next request end the keep-alive wait
+                if deadline.phase == "keepalive":
+                    deadline.start("header")
+                else:
+                    deadline.touch()
+        self._parser = None
+        if deadline is not None:
+            deadline.stop()
+        return parser
+
+
+class AsyncHttpReader:
+    """
+    The asyncio counterpart of :class:`HttpReader <HttpReader>`, reading
+    HTTP messages from an ``asyncio.StreamReader``.
+
+    :attrs stream (asyncio.StreamReader): stream to read from.
+    :attrs max_header_size (int): largest accepted header block.
+    :attrs deadline (Deadline): read timeouts of the connection, or None.
+    :attrs spool_threshold (int): larger bodies are spooled to disk.
+    :attrs max_body_size (int): largest accepted body, 0 for no limit.
+    """
+
+    __attrs__ = [
+        "stream",
+        "max_header_size",
+        "deadline",
+        "spool_threshold",
+        "max_body_size",
+    ]
+
+    def __init__(self, stream, max_header_size=MAX_HEADER_SIZE, deadline=None,
+                 spool_threshold=SPOOL_THRESHOLD, max_body_size=0):
+        """
+        Initialize a new AsyncHttpReader instance.
+
+        :param stream (asyncio.StreamReader): stream to read from.
+        :param max_header_size (int): largest accepted header block.
+        :param deadline (Deadline): read timeouts of the connection, or None.
+        :param spool_threshold (int): larger bodies are spooled to disk.
+        :param max_body_size (int): largest accepted body, 0 for no limit.
+        """
+        self.stream = stream
+        self.max_header_size = max_header_size
+        self.deadline = deadline
+        self.spool_threshold = spool_threshold
+        self.max_body_size = max_body_size
+
+        #: Bytes received past the end of the previous message
+        self._pending = b""
+
+    def buffered(self):
+        """
+        Number of bytes read past the end of the previous message.
+
+        Bytes still waiting in the buffer of the stream are not seen: a
+        message sent there is read at once by :meth:`read_message`, only
+        under the keep-alive timeout instead of the header one.
+
+        :rtype int: pending byte count.
+        """
+        return len(self._pending)
+
+    async def read_message(self, idle=False):
+        """
+        Read one complete message.
+
+        :param idle (bool): the connection waits between two requests.
+
+        :rtype HttpParser: the parsed message, or None if the peer closed
+                           the connection between messages.
+
+        :raises ValueError: If the message is malformed or truncated.
+        """
+        deadline = self.deadline
+        parser = HttpParser(self.max_header_size, self.spool_threshold, self.max_body_size)
+        if deadline is not None:
+            deadline.start("keepalive" if idle and not self.buffered() else "header")
+        data, self._pending = self._pending, b""
+        while True:
+            if data:
+                status, used = parser.feed(data)
+                if status == COMPLETE:
+                    self._pending = data[used:]
+                    break
+                if deadline is not None and parser.state != "head" and deadline.phase != "body":
+                    deadline.start("body")
+            data = await self.stream.read(STREAM_READ_SIZE)
+            if not data:
+                if not parser.received:
+                    return None
+                if parser.state == "head":
+                    raise ValueError("Connection closed inside request headers")
+                raise ValueError("Connection closed inside request body")
+            if deadline is not None:
+                if deadline.phase == "keepalive":
+                    deadline.start("header")
+                else:
+                    deadline.touch()
+        if deadline is not None:
+            deadline.stop()
+        return parser
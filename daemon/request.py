@@ -17,7 +17,27 @@ daemon.request
 This module provides a Request object to manage and persist 
 request settings (cookies, auth, proxies).
 """
-from .dictionary import CaseInsensitiveDict
+import urllib.parse
+
+from .parser import HttpParser
+from .body import RequestBody
+from .router import compile_routes
+
+def parse_cookies(value):
+    """
+    Parses the value of a ``Cookie`` header.
+
+    :param value (str): e.g. ``"auth=true; theme=dark"``.
+
+    :rtype dict: cookie name -> value.
+    """
+    cookies = {}
+    for pair in value.split(';'):
+        if '=' in pair:
+            key, val = pair.strip().split('=', 1)
+            cookies[key] = val
+    return cookies
+
 
 class Request():
     """The fully mutable "class" `Request <Request>` object,
@@ -27,6 +47,11 @@ class Request():
     should not be instantiated manually; doing so may produce undesirable
     effects.
 
+    Only the request line is decoded by :meth:`prepare`. The headers,
+    cookies, query parameters, body text and authentication state are
+    computed from the parsed message on first access and then kept, so a
+    static GET or a simple hook pays only for the fields it reads.
+
     Usage::
 
       >>> import deamon.request
@@ -43,63 +68,180 @@ class Request():
         "body",
         "reason",
         "cookies",
+        "query",
+        "stream",
         # "body",
         "routes",
         "hook",
+        "params",
     ]
 
+    __slots__ = (
+        "method",
+        "url",
+        "path",
+        "version",
+        "raw_body",
+        "routes",
+        "hook",
+        "params",
+        "route",
+        "allowed",
+        "_message",
+        "_query_string",
+        "_headers",
+        "_cookies",
+        "_query",
+        "_body",
+        "_stream",
+        "_auth",
+        "_skip_cookie_check",
+    )
+
     def __init__(self):
+        #: Routes
+        self.routes = {}
+        self.reset()
+
+    def reset(self):
+        """
+        Clear the request for the next message of the connection. The
+        routes are kept, they belong to the app rather than to a request.
+        The temporary file of a spooled body is released.
+        """
+        for body in (getattr(self, "raw_body", None), getattr(self, "_stream", None)):
+            if isinstance(body, RequestBody):
+                body.close()
         #: HTTP verb to send to the server.
         self.method = None
         #: HTTP URL to send the request to.
         self.url = None
-        #: dictionary of HTTP headers.
-        self.headers = None
-        #: HTTP path
-        self.path = None        
-        # The cookies set used to create Cookie header
-        self.cookies = None
-        #: request body to send to the server.
-        self.body = None
-        #: Routes
-        self.routes = {}
+        #: HTTP path, without the query string
+        self.path = None
+        #: HTTP version
+        self.version = None
+        #: undecoded request body bytes, or a spooled RequestBody.
+        self.raw_body = b""
         #: Hook point for routed mapped-path
         self.hook = None
+        #: Path parameters of the route, passed to the hook
+        self.params = {}
+        #: Route path matched, e.g. ``/channel/<name>/members``
+        self.route = None
+        #: Methods of the routes matching the path when none has this method
+        self.allowed = ()
+
+        #: Parsed message the lazy fields are computed from
+        self._message = None
+        self._query_string = ""
+        self._headers = None
+        self._cookies = None
+        self._query = None
+        self._body = None
+        self._stream = None
+        self._auth = None
+        #: Login answered with the index page, no cookie to check
+        self._skip_cookie_check = False
+
+    @property
+    def headers(self):
+        """dictionary of HTTP headers, by lowercased name."""
+        if self._headers is None:
+            self._headers = self._message.headers if self._message is not None else {}
+        return self._headers
+
+    @headers.setter
+    def headers(self, value):
+        self._headers = value
 
+    @property
+    def cookies(self):
+        """The cookies sent in the Cookie header, by name."""
+        if self._cookies is None:
+            self._cookies = parse_cookies(self.headers.get('cookie', ''))
+        return self._cookies
 
-        #: Authentication 
-        self.auth = None
-
-
-    def extract_request_line(self, request):
-        try:
-            lines = request.splitlines()
-            first_line = lines[0]
-            method, path, version = first_line.split()
-
-            if path == '/':
-                path = '/index.html'
-        except Exception:
-            return None, None
-        return method, path, version
-             
-    def prepare_headers(self, request):
-        """Prepares the given HTTP headers."""
-        lines = request.split('\r\n')
-        headers = {}
-        for line in lines[1:]:
-            if ': ' in line:
-                key, val = line.split(': ', 1)
-                headers[key.lower()] = val
-        return headers
-
-    def prepare(self, request, routes=None):
-        """Prepares the entire request with the given parameters."""
-
-        # Prepare the request line from the request header     
-        # print(request)
-        self.method, self.path, self.version = self.extract_request_line(request)
-        print("[Request] {} path {} version {}".format(self.method, self.path, self.version))
+    @cookies.setter
+    def cookies(self, value):
+        self._cookies = value
+
+    @property
+    def query(self):
+        """Query string parameters, the last value of a repeated name wins."""
+        if self._query is None:
+            self._query = dict(urllib.parse.parse_qsl(self._query_string, keep_blank_values=True))
+        return self._query
+
+    @property
+    def body(self):
+        """request body decoded as text, or None when empty."""
+        if self._body is None and self.raw_body:
+            raw = self.raw_body
+            if isinstance(raw, RequestBody):
+                raw = raw.getvalue()
+            self._body = bytes(raw).decode('utf-8', errors='replace')
+        return self._body
+
+    @body.setter
+    def body(self, value):
+        self._body = value
+
+    @property
+    def stream(self):
+        """
+        The body as a readable :class:`RequestBody <daemon.body.RequestBody>`,
+        spooled to disk when large, positioned at its start.
+        """
+        if self._stream is None:
+            raw = self.raw_body
+            if not isinstance(raw, RequestBody):
+                raw = RequestBody(raw)
+            raw.content_type = self.headers.get('content-type')
+            self._stream = raw
+        self._stream.seek(0)
+        return self._stream
+
+    @property
+    def auth(self):
+        """Authentication: the login credentials of a POST /login, otherwise the auth cookie."""
+        if self._auth is None:
+            # Handle login POST request first
+            if self.method == "POST" and self.path == "/login":
+                self.prepare_auth(self.body, url=self.path)
+            else:
+                # For non-login requests, check cookie
+                self._auth = 'auth=true' in self.headers.get('cookie', '')
+        return self._auth
+
+    @auth.setter
+    def auth(self, value):
+        self._auth = value
+
+    def prepare(self, request, routes=None, body=None):
+        """Prepares the entire request with the given parameters.
+
+        :param request (HttpParser): message parsed by :class:`HttpReader
+                                     <HttpReader>`; a str holding the whole
+                                     message is parsed first.
+        :param routes (Router): routes of the WeApRous app; a plain
+                                ``{(METHOD, path): handler}`` dict is
+                                compiled first.
+        :param body (bytes): body of the message, defaults to the parsed one.
+        """
+
+        if isinstance(request, str):
+            message = HttpParser()
+            message.feed(request.encode('utf-8'))
+        else:
+            message = request
+
+        # Only the request line is decoded here, the other fields on first use
+        self._message = message
+        self._headers = self._cookies = self._query = self._body = self._stream = self._auth = None
+        self.method, self.url, self.version = message.method, message.path, message.version
+        self.path, _, self._query_string = (self.url or '').partition('?')
+        if self.path == '/':
+            self.path = '/index.html'
 
         #
         # @bksysnet Preapring the webapp hook with WeApRous instance
@@ -108,36 +250,19 @@ class Request():
         # TODO manage the webapp hook in this mounting point
         #
         
-        if not routes == {}:
+        if routes:
+            if isinstance(routes, dict):
+                routes = compile_routes(routes)
             self.routes = routes
-            self.hook = routes.get((self.method, self.path))
+            self.hook, self.params, self.route, self.allowed = routes.match(self.method, self.path)
 
             #
             # self.hook manipulation goes here
             # ...
             #
 
-
-        self.headers = self.prepare_headers(request)
-        cookies = self.headers.get('cookie', '')
-            #
-            #  TODO: implement the cookie function here
-            #        by parsing the header            #
-        self.prepare_cookies(cookies)
-
         # Prepare Body
-        if request.find('\r\n\r\n') != -1:
-            self.prepare_body(request.split("\r\n\r\n",1)[1], files=None, json=None)
-
-        # Handle login POST request first
-        if self.method == "POST" and self.path == "/login":
-            self.prepare_auth(self.body, url=self.path)
-        else:
-            # For non-login requests, check cookie
-            self.auth = False
-            if cookies and 'auth=true' in cookies:
-                self.auth = True
-        
+        self.raw_body = message.body if body is None else body
         return
 
     def prepare_body(self, data, files, json=None):
@@ -179,7 +304,7 @@ class Request():
         #
 	# self.auth = ...
         params = {}
-        for pair in auth.split('&'):
+        for pair in (auth or '').split('&'):
             if '=' in pair:
                 key, value = pair.split('=', 1)
                 params[key] = value
@@ -198,16 +323,9 @@ class Request():
     
     def prepare_cookies(self, cookies):
             # self.headers["Cookie"] = cookies
-        if not self.cookies:
-            self.cookies = {}
-            
         if cookies:
             # Parse cookie string
-            cookie_pairs = cookies.split(';')
-            for pair in cookie_pairs:
-                if '=' in pair:
-                    key, val = pair.strip().split('=', 1)
-                    self.cookies[key] = val
+            self.cookies.update(parse_cookies(cookies))
             # print("[Request] Parsed cookies:", self.cookies)
             
             # Also set in headers for compatibility
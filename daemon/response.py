@@ -20,13 +20,409 @@ based on incoming requests.
 
 The current version supports MIME type detection, content loading and header formatting
 """
+import asyncio
 import datetime
+import email.utils
 import os
-import mimetypes
+import time
+import uuid
 from .dictionary import CaseInsensitiveDict
+from .cache import STATIC_CACHE, file_validators
+from .compression import DEFAULT_COMPRESSOR, is_compressible, variant_etag
+from .assets import AssetIndex, guess_mime_type
+from .filemap import FILE_MAP
+from .cachepolicy import DEFAULT_CACHE_POLICY
 
 BASE_DIR = ""
 
+#: Index of the static assets below ``BASE_DIR``, built at startup.
+ASSET_INDEX = AssetIndex(BASE_DIR)
+
+#: Files of at least this many bytes are sent with ``sendfile`` instead of
+#: being read into memory.
+SENDFILE_THRESHOLD = 16 * 1024
+
+#: Largest number of ranges honored in one ``Range`` header.
+MAX_RANGES = 16
+
+#: Segments handed to one ``sendmsg`` call, well below the IOV_MAX of the
+#: usual platforms.
+MAX_SEGMENTS = 64
+
+#: Largest number of bytes handed to the socket at once. The progress
+#: callback of the writers runs after each write, so the write timeout of a
+#: connection is the time allowed to send one such chunk.
+WRITE_CHUNK = 256 * 1024
+
+
+#: Header fields sent unchanged with every static object. The request header
+#: lookups of the previous builder used capitalized names against the
+#: lowercased keys of :attr:`Request.headers`, so they always fell back to
+#: these values.
+STATIC_HEADER_FIELDS = (
+    ("Accept", "application/json"),
+    ("Accept-Language", "en-US,en;q=0.9"),
+    ("Authorization", "Basic <credentials>"),
+    ("Accept-Ranges", "bytes"),
+    ("Max-Forward", "10"),
+    ("Proxy-Authorization", "Basic dXNlcjpwYXNz"),  # example base64
+    ("Warning", "199 Miscellaneous warning"),
+    ("User-Agent", "Chrome/123.0.0.0"),
+)
+
+_header_blocks = {}
+_status_lines = {}
+_date = (0, "")
+
+
+def header_block(content_type, cache_control="no-cache"):
+    """
+    Returns the prebuilt header lines of a static object of one content
+    type and cache policy.
+
+    :params content_type (str): value of the Content-Type header.
+    :params cache_control (str): value of the Cache-Control header.
+
+    :rtype str: the Content-Type line followed by ``STATIC_HEADER_FIELDS``
+                and the cache headers.
+    """
+    key = (content_type, cache_control)
+    block = _header_blocks.get(key)
+    if block is None:
+        block = "Content-Type: {}\r\n".format(content_type) + "".join(
+            "{}: {}\r\n".format(name, val) for name, val in STATIC_HEADER_FIELDS)
+        block += "Cache-Control: {}\r\n".format(cache_control)
+        # HTTP/1.0 caches only understand Pragma
+        if "no-cache" in cache_control:
+            block += "Pragma: no-cache\r\n"
+        _header_blocks[key] = block
+    return block
+
+
+def status_line(status_code, reason):
+    """
+    Returns the status line of a response, formatted once per status.
+
+    :params status_code (int): HTTP status code.
+    :params reason (str): reason phrase.
+
+    :rtype str: e.g. ``"HTTP/1.1 200 OK\\r\\n"``.
+    """
+    key = (status_code, reason)
+    line = _status_lines.get(key)
+    if line is None:
+        line = "HTTP/1.1 {} {}\r\n".format(status_code, reason)
+        _status_lines[key] = line
+    return line
+
+
+def http_date():
+    """
+    Returns the current time formatted for the Date header, refreshed once
+    per second.
+
+    :rtype str: e.g. ``"Sun, 06 Nov 1994 08:49:37 GMT"``.
+    """
+    global _date
+    now = int(time.time())
+    cached = _date
+    if cached[0] != now:
+        cached = (now, time.strftime("%a, %d %b %Y %H:%M:%S GMT", time.gmtime(now)))
+        # One tuple assignment, so readers never see a half updated pair
+        _date = cached
+    return cached[1]
+
+
+class FileBody:
+    """
+    A byte range of a static object left on disk, to be sent with ``sendfile``.
+
+    :attrs path (str): path of the file.
+    :attrs size (int): number of bytes to send, as found by ``stat`` for a whole file.
+    :attrs offset (int): position of the first byte to send.
+    """
+
+    __attrs__ = [
+        "path",
+        "size",
+        "offset",
+    ]
+
+    def __init__(self, path, size, offset=0):
+        self.path = path
+        self.size = size
+        self.offset = offset
+
+    def __len__(self):
+        return self.size
+
+    def slice(self, start, end):
+        """
+        Returns the sub-range ``start..end`` (inclusive) of this body.
+
+        :rtype FileBody: the slice, still on disk.
+        """
+        return FileBody(self.path, end - start + 1, self.offset + start)
+
+
+def next_chunk(buffers, start):
+    """
+    Takes the segments of the next write: at most ``MAX_SEGMENTS`` of them
+    and ``WRITE_CHUNK`` bytes, the last one sliced if needed.
+
+    :params buffers (list): bytes or memoryview segments.
+    :params start (int): index of the first segment not written yet.
+
+    :rtype list: segments of the write.
+    """
+    chunk = []
+    room = WRITE_CHUNK
+    for buf in buffers[start:start + MAX_SEGMENTS]:
+        if len(buf) >= room:
+            chunk.append(memoryview(buf)[:room])
+            break
+        chunk.append(buf)
+        room -= len(buf)
+    return chunk
+
+
+def send_vectored(conn, buffers, progress=None):
+    """
+    Send in-memory segments with vectored ``sendmsg`` calls, so they reach
+    the socket without being joined into one buffer first.
+
+    :params conn (socket.socket): client connection socket.
+    :params buffers (list): bytes or memoryview segments, in order.
+    :params progress (callable): called without arguments after each write
+                                 of at most ``WRITE_CHUNK`` bytes, or None.
+    """
+    buffers = [buf for buf in buffers if len(buf)]
+    if not hasattr(conn, 'sendmsg'):
+        # No scatter/gather write on this platform
+        data = memoryview(b"".join(buffers))
+        for pos in range(0, len(data), WRITE_CHUNK):
+            conn.sendall(data[pos:pos + WRITE_CHUNK])
+            if progress is not None:
+                progress()
+        return
+    start = 0
+    while start < len(buffers):
+        sent = conn.sendmsg(next_chunk(buffers, start))
+        if progress is not None:
+            progress()
+        # Skip what went out, keeping the unsent tail of a partial segment
+        while sent:
+            size = len(buffers[start])
+            if sent >= size:
+                sent -= size
+                start += 1
+            else:
+                buffers[start] = memoryview(buffers[start])[sent:]
+                sent = 0
+
+
+def write_segments(conn, segments, progress=None):
+    """
+    Write response segments to a socket: runs of in-memory segments with
+    :func:`send_vectored`, file segments with ``socket.sendfile``.
+
+    :params conn (socket.socket): client connection socket.
+    :params segments (list): bytes, memoryview or :class:`FileBody <FileBody>`.
+    :params progress (callable): called after each write, see
+                                 :func:`send_vectored`, or None.
+
+    :raises ConnectionAbortedError: If a file shrank after its size was
+                                    announced, so the connection must close.
+    """
+    batch = []
+    for segment in segments:
+        if not isinstance(segment, FileBody):
+            batch.append(segment)
+            continue
+        if batch:
+            send_vectored(conn, batch, progress)
+            batch = []
+        with open(segment.path, 'rb') as f:
+            sent = 0
+            while sent < segment.size:
+                count = min(WRITE_CHUNK, segment.size - sent)
+                n = conn.sendfile(f, segment.offset + sent, count)
+                if progress is not None:
+                    progress()
+                sent += n
+                if n < count:
+                    break
+        if sent < segment.size:
+            raise ConnectionAbortedError("{} shrank while being sent".format(segment.path))
+    if batch:
+        send_vectored(conn, batch, progress)
+
+
+async def write_async(writer, buffers, progress=None):
+    """
+    Asyncio counterpart of :func:`send_vectored`, writing the segments with
+    ``writelines`` and draining after each ``WRITE_CHUNK`` bytes.
+
+    :params writer (asyncio.StreamWriter): stream writing to the client.
+    :params buffers (list): bytes or memoryview segments, in order.
+    :params progress (callable): called without arguments after each drain,
+                                 or None.
+    """
+    buffers = [buf for buf in buffers if len(buf)]
+    start = 0
+    while start < len(buffers):
+        chunk = next_chunk(buffers, start)
+        writer.writelines(chunk)
+        # Skip what was written, keeping the tail of a sliced segment
+        start += len(chunk) - 1
+        written = len(chunk[-1])
+        if written < len(buffers[start]):
+            buffers[start] = memoryview(buffers[start])[written:]
+        else:
+            start += 1
+        await writer.drain()
+        if progress is not None:
+            progress()
+
+
+class SegmentedResponse:
+    """
+    A complete response kept as a list of segments, the encoded header
+    followed by the body parts, so the header is never concatenated with
+    the body. In-memory segments go out with one vectored write, file
+    parts are copied to the socket by the kernel.
+
+    :attrs header (bytes): encoded response header.
+    :attrs parts (list): body parts in order, bytes, memoryview slices of a
+                         mapped file or :class:`FileBody <FileBody>`.
+    """
+
+    __attrs__ = [
+        "header",
+        "parts",
+    ]
+
+    def __init__(self, header, parts):
+        self.header = header
+        self.parts = parts
+
+    def segments(self):
+        """
+        Returns the header and body parts in order.
+
+        :rtype list: segments to hand to :func:`write_segments`.
+        """
+        return [self.header] + self.parts
+
+    def in_memory(self):
+        """
+        Check whether every part is in memory.
+
+        :rtype bool: False if a part is sent with ``sendfile``.
+        """
+        return not any(isinstance(part, FileBody) for part in self.parts)
+
+    def send(self, conn, progress=None):
+        """
+        Send the response with :func:`write_segments`.
+
+        :params conn (socket.socket): client connection socket.
+        :params progress (callable): called after each write, or None.
+
+        :raises ConnectionAbortedError: If a file shrank while being sent.
+        """
+        write_segments(conn, self.segments(), progress)
+
+    async def send_async(self, writer, progress=None):
+        """
+        Asyncio counterpart of :meth:`send`, using :func:`write_async` for
+        the in-memory segments and ``loop.sendfile`` for the file parts.
+
+        :params writer (asyncio.StreamWriter): stream writing to the client.
+        :params progress (callable): called after each write, or None.
+        """
+        loop = asyncio.get_running_loop()
+        batch = []
+        for part in self.segments():
+            if not isinstance(part, FileBody):
+                batch.append(part)
+                continue
+            await write_async(writer, batch, progress)
+            batch = []
+            with open(part.path, 'rb') as f:
+                sent = 0
+                while sent < part.size:
+                    count = min(WRITE_CHUNK, part.size - sent)
+                    n = await loop.sendfile(writer.transport, f, part.offset + sent, count)
+                    if progress is not None:
+                        progress()
+                    sent += n
+                    if n < count:
+                        break
+            if sent < part.size:
+                raise ConnectionAbortedError("{} shrank while being sent".format(part.path))
+        await write_async(writer, batch, progress)
+
+
+def body_length(content):
+    """
+    Returns the length of a response body.
+
+    :params content: bytes, a :class:`FileBody <FileBody>` or a list of them.
+
+    :rtype int: number of body bytes.
+    """
+    if isinstance(content, list):
+        return sum(len(part) for part in content)
+    return len(content)
+
+
+def parse_range(value, size):
+    """
+    Parses a ``Range`` header against an object of ``size`` bytes.
+
+    :params value (str): header value, e.g. ``bytes=0-499,-100``.
+    :params size (int): length of the object.
+
+    :rtype list: (start, end) inclusive byte positions of the satisfiable
+                 ranges, an empty list if none is satisfiable, or None if
+                 the header is malformed or abusive and must be ignored.
+    """
+    unit, sep, spec = value.partition('=')
+    if not sep or unit.strip().lower() != 'bytes':
+        return None
+    ranges = []
+    for item in spec.split(','):
+        first, sep, last = item.strip().partition('-')
+        if not sep:
+            return None
+        try:
+            if first:
+                start = int(first)
+                end = int(last) if last else start
+                if end < start:
+                    return None
+                if not last:
+                    end = size - 1
+            else:
+                # Suffix range: the last N bytes
+                length = int(last)
+                start, end = max(0, size - length), size - 1
+                if length == 0:
+                    continue
+        except ValueError:
+            return None
+        if start < 0:
+            return None
+        if start >= size:
+            continue
+        ranges.append((start, min(end, size - 1)))
+    # Many or overlapping ranges would let a client multiply the response
+    if len(ranges) > MAX_RANGES or sum(end - start + 1 for start, end in ranges) > size:
+        return None
+    return ranges
+
+
 class Response():   
     """The :class:`Response <Response>` object, which contains a
     server's response to an HTTP request.
@@ -61,6 +457,7 @@ class Response():
     __attrs__ = [
         "_content",
         "_header",
+        "_entry",
         "status_code",
         "method",
         "headers",
@@ -75,6 +472,30 @@ class Response():
         "reason",
     ]
 
+    __slots__ = (
+        "_content",
+        "_header",
+        "_entry",
+        "_content_consumed",
+        "_next",
+        "_cookies",
+        "status_code",
+        "headers",
+        "url",
+        "history",
+        "encoding",
+        "reason",
+        "elapsed",
+        "request",
+        "raw",
+        "connection",
+        "compressor",
+        "file_mode",
+        "cache_policy",
+    )
+
+    #: Elapsed time of a response not timed yet
+    NOT_TIMED = datetime.timedelta(0)
 
     def __init__(self, request=None):
         """
@@ -83,17 +504,48 @@ class Response():
         : params request : The originating request object.
         """
 
+        #: Case-insensitive Dictionary of Response Headers.
+        #: For example, ``headers['content-type']`` will return the
+        #: value of a ``'Content-Type'`` response header.
+        self.headers = {}
+
+        #: A list of :class:`Response <Response>` objects from
+        #: the history of the Request.
+        self.history = []
+
+        #: :class:`Compressor <Compressor>` negotiating the content coding.
+        self.compressor = DEFAULT_COMPRESSOR
+
+        #: How files of ``SENDFILE_THRESHOLD`` bytes or more are served:
+        #: "sendfile" from disk, or "mmap" from a shared memory mapping.
+        self.file_mode = "sendfile"
+
+        #: :class:`CachePolicy <CachePolicy>` choosing the Cache-Control directives.
+        self.cache_policy = DEFAULT_CACHE_POLICY
+
+        self.reset()
+
+    def reset(self):
+        """
+        Clear the response for the next request of the connection.
+
+        The header dict and history list are emptied rather than replaced,
+        and the serving settings (``compressor``, ``file_mode`` and
+        ``cache_policy``) are kept.
+        """
         self._content = False
+        self._header = None
+        #: Cache entry of the static object being served, if cached
+        self._entry = None
         self._content_consumed = False
         self._next = None
+        self._cookies = None
 
         #: Integer Code of responded HTTP Status, e.g. 404 or 200.
         self.status_code = None
 
-        #: Case-insensitive Dictionary of Response Headers.
-        #: For example, ``headers['content-type']`` will return the
-        #: value of a ``'Content-Type'`` response header.
-        self.headers = {}
+        self.headers.clear()
+        self.history.clear()
 
         #: URL location of Response.
         self.url = None
@@ -101,24 +553,28 @@ class Response():
         #: Encoding to decode with when accessing response text.
         self.encoding = None
 
-        #: A list of :class:`Response <Response>` objects from
-        #: the history of the Request.
-        self.history = []
-
         #: Textual reason of responded HTTP Status, e.g. "Not Found" or "OK".
         self.reason = None
 
-        #: A of Cookies the response headers.
-        self.cookies = CaseInsensitiveDict()
-
         #: The amount of time elapsed between sending the request
-        self.elapsed = datetime.timedelta(0)
+        self.elapsed = self.NOT_TIMED
 
         #: The :class:`PreparedRequest <PreparedRequest>` object to which this
         #: is a response.
         self.request = None
+        self.raw = None
+        self.connection = None
 
+    @property
+    def cookies(self):
+        """A of Cookies the response headers, created on first access."""
+        if self._cookies is None:
+            self._cookies = CaseInsensitiveDict()
+        return self._cookies
 
+    @cookies.setter
+    def cookies(self, value):
+        self._cookies = value
 
 
     def get_mime_type(self, path):
@@ -129,12 +585,7 @@ class Response():
 
         :rtype str: MIME type string (e.g., 'text/html', 'image/png').
         """
-
-        try:
-            mime_type, _ = mimetypes.guess_type(path)
-        except Exception:
-            return 'application/octet-stream'
-        return mime_type or 'application/octet-stream'
+        return guess_mime_type(path)
 
 
     def prepare_content_type(self, mime_type='text/html'):
@@ -195,17 +646,27 @@ class Response():
         return base_dir
 
 
-    def build_content(self, path, base_dir):
+    def build_content(self, path, base_dir, asset=None):
         """
-        Loads the objects file from storage space.
+        Loads the objects file from storage space, through the shared
+        :data:`STATIC_CACHE <daemon.cache.STATIC_CACHE>` so hot files are
+        served from memory.
 
         :params path (str): relative path to the file.
         :params base_dir (str): base directory where the file is located.
+        :params asset (Asset): index entry of the file, giving its path.
+
+        Files of ``SENDFILE_THRESHOLD`` bytes or more are not read: a
+        :class:`FileBody <FileBody>` naming the file is returned instead.
+        The ``ETag`` and ``Last-Modified`` headers of the file are set.
 
         :rtype tuple: (int, bytes) representing content length and content data.
         """
 
-        filepath = os.path.join(base_dir, path.lstrip('/'))
+        if asset is not None:
+            filepath = asset.path
+        else:
+            filepath = os.path.join(base_dir, path.lstrip('/'))
         print("[Response] serving the object at location {}".format(filepath))
             #
             #  TODO: implement the step of fetch the object file
@@ -213,9 +674,26 @@ class Response():
 
             #
         try:
-            with open(filepath, 'rb') as f:
-                content = f.read()
-            return len(content), content
+            # A hot file is answered from memory without any system call
+            entry = STATIC_CACHE.peek(filepath)
+            if entry is None:
+                # The index may predate an edit: size and validators are
+                # taken from the file as it is now
+                st = os.stat(filepath)
+                size = st.st_size
+                if size >= SENDFILE_THRESHOLD and self.file_mode == "mmap":
+                    mapped = FILE_MAP.get(filepath)
+                    self.headers['ETag'] = mapped.etag
+                    self.headers['Last-Modified'] = mapped.last_modified
+                    return mapped.size, mapped.view
+                if size >= SENDFILE_THRESHOLD:
+                    self.headers['ETag'], self.headers['Last-Modified'] = file_validators(st)
+                    return size, FileBody(filepath, size)
+                entry = STATIC_CACHE.get(filepath)
+            self._entry = entry
+            self.headers['ETag'] = entry.etag
+            self.headers['Last-Modified'] = entry.last_modified
+            return len(entry.content), entry.content
         except FileNotFoundError:
             print("[Response] ERROR: File not found: {}".format(filepath))
             return 0, None
@@ -230,56 +708,216 @@ class Response():
         Constructs the HTTP response headers based on the class:`Request <Request>
         and internal attributes.
 
+        The constant part of the header is prebuilt once per content type
+        (see :func:`header_block`) and the Date value is formatted once per
+        second, so a response costs a few string parts and one join.
+
         :params request (class:`Request <Request>`): incoming request object.
 
         :rtypes bytes: encoded HTTP response header.
         """
-        reqhdr = request.headers
         rsphdr = self.headers
 
-        #Build dynamic headers
-        headers = {
-                "Accept": "{}".format(reqhdr.get("Accept", "application/json")),
-                "Accept-Language": "{}".format(reqhdr.get("Accept-Language", "en-US,en;q=0.9")),
-                "Authorization": "{}".format(reqhdr.get("Authorization", "Basic <credentials>")),
-                "Cache-Control": "no-cache",
-                "Content-Type": "{}".format(self.headers['Content-Type']),
-                "Content-Length": "{}".format(len(self._content)),
-                "Date": "{}".format(datetime.datetime.utcnow().strftime("%a, %d %b %Y %H:%M:%S GMT")),
-                "Max-Forward": "10",
-                "Pragma": "no-cache",
-                "Proxy-Authorization": "Basic dXNlcjpwYXNz",  # example base64
-                "Warning": "199 Miscellaneous warning",
-                "User-Agent": "{}".format(reqhdr.get("User-Agent", "Chrome/123.0.0.0")),
-            }
-        
+        parts = [
+            status_line(self.status_code or 200, self.reason or "OK"),
+            header_block(rsphdr['Content-Type'], rsphdr.get('Cache-Control', 'no-cache')),
+            "Content-Length: ", str(body_length(self._content)), "\r\n",
+            "Date: ", http_date(), "\r\n",
+        ]
+
         # Task 1A: Set cookie when login successful
         if request.auth == True:
-            headers["Set-Cookie"] = "auth=true"
+            parts.append("Set-Cookie: auth=true\r\n")
 
-        # Header text alignment
-            #
-            #  TODO: implement the header building to create formated
-            #        header from the provied headers
-            #
-        #
-        # TODO prepare the request authentication
-        #
-	# self.auth = ...
-    
-        # Format header
-        fmt_header = "HTTP/1.1 {} {}\r\n".format(
-            self.status_code if self.status_code else 200,
-            self.reason if self.reason else "OK"
-        )
-        
-        for key, val in headers.items():
-            fmt_header += "{}: {}\r\n".format(key, val)
-        
-        fmt_header += "\r\n"
+        # Range and validators of the file, then connection management chosen by the adapter
+        for key in ("Content-Encoding", "Vary", "Content-Range", "ETag", "Last-Modified",
+                    "Connection", "Keep-Alive"):
+            if key in rsphdr:
+                parts += (key, ": ", rsphdr[key], "\r\n")
+
+        parts.append("\r\n")
+        return "".join(parts).encode('utf-8')
+
+    def is_not_modified(self, request):
+        """
+        Evaluates the conditional headers of a GET request against the
+        validators of the object. ``If-None-Match`` takes precedence over
+        ``If-Modified-Since``, as in RFC 7232.
+
+        :params request (class:`Request <Request>`): incoming request object.
+
+        :rtype bool: True if the client copy is current and a 304 is enough.
+        """
+        if request.method not in ("GET", "HEAD") or 'ETag' not in self.headers:
+            return False
+        reqhdr = request.headers
+
+        if_none_match = reqhdr.get('if-none-match')
+        if if_none_match is not None:
+            if if_none_match.strip() == '*':
+                return True
+            # Weak comparison: W/"x" matches "x"
+            etag = self.headers['ETag']
+            for tag in if_none_match.split(','):
+                tag = tag.strip()
+                if tag.startswith('W/'):
+                    tag = tag[2:]
+                if tag == etag:
+                    return True
+            return False
+
+        if_modified_since = reqhdr.get('if-modified-since')
+        if if_modified_since is None:
+            return False
+        try:
+            since = email.utils.parsedate_to_datetime(if_modified_since)
+            modified = email.utils.parsedate_to_datetime(self.headers['Last-Modified'])
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=datetime.timezone.utc)
+        return modified <= since
+
+    def negotiate_encoding(self, request, size):
+        """
+        Chooses the content coding of a static object and sets the matching
+        ``Vary``, ``Content-Encoding`` and variant ``ETag`` headers.
+
+        Only cached objects are compressed, once per coding, and never for
+        a range request: files sent with ``sendfile`` stay zero-copy.
+
+        :params request (class:`Request <Request>`): incoming request object.
+        :params size (int): length of the raw object.
+
+        :rtype str: ``gzip`` or ``deflate``, or None for the raw bytes.
+        """
+        compressor = self.compressor
+        if not compressor.level or not is_compressible(self.headers['Content-Type']):
+            return None
+        # The representation depends on Accept-Encoding, even when raw
+        self.headers['Vary'] = 'Accept-Encoding'
+        if (self._entry is None or size < compressor.min_size
+                or 'range' in request.headers):
+            return None
+        encoding = compressor.negotiate(request.headers.get('accept-encoding'))
+        if encoding:
+            self.headers['Content-Encoding'] = encoding
+            self.headers['ETag'] = variant_etag(self.headers['ETag'], encoding)
+        return encoding
+
+    def requested_ranges(self, request, size):
+        """
+        Finds the byte ranges asked by a GET request, honoring ``If-Range``:
+        when the validator it names is not current the whole object is sent.
+
+        :params request (class:`Request <Request>`): incoming request object.
+        :params size (int): length of the object.
 
+        :rtype list: ranges as returned by :func:`parse_range`, or None to
+                     send the whole object.
+        """
+        value = request.headers.get('range')
+        if value is None or request.method != "GET":
+            return None
+        if_range = request.headers.get('if-range')
+        if if_range is not None:
+            if_range = if_range.strip()
+            # Strong comparison only: a weak tag never matches
+            if if_range != self.headers.get('ETag') and if_range != self.headers.get('Last-Modified'):
+                return None
+        return parse_range(value, size)
+
+    def build_partial(self, request, ranges, size):
+        """
+        Constructs a 206 Partial Content response for the requested ranges,
+        a ``multipart/byteranges`` body when there are several, or a 416
+        when none of them is satisfiable.
 
-        return str(fmt_header).encode('utf-8')
+        Cached and mapped content is sliced through a memoryview, never
+        copied; a file left on disk is sliced into :class:`FileBody
+        <FileBody>` ranges still sent with ``sendfile``.
+
+        :params request (class:`Request <Request>`): incoming request object.
+        :params ranges (list): satisfiable (start, end) byte ranges.
+        :params size (int): length of the object.
+
+        :rtype SegmentedResponse: the 206 response, or the encoded 416.
+        """
+        if not ranges:
+            return self.build_range_not_satisfiable(size)
+
+        content = self._content
+        if not isinstance(content, FileBody):
+            content = memoryview(content)
+
+        def piece(start, end):
+            if isinstance(content, FileBody):
+                return content.slice(start, end)
+            return content[start:end + 1]
+
+        self.status_code = 206
+        self.reason = "Partial Content"
+        if len(ranges) == 1:
+            start, end = ranges[0]
+            self.headers['Content-Range'] = "bytes {}-{}/{}".format(start, end, size)
+            parts = [piece(start, end)]
+        else:
+            boundary = uuid.uuid4().hex
+            part_type = self.headers['Content-Type']
+            self.headers['Content-Type'] = "multipart/byteranges; boundary={}".format(boundary)
+            parts = []
+            for start, end in ranges:
+                parts.append("--{}\r\nContent-Type: {}\r\nContent-Range: bytes {}-{}/{}\r\n\r\n".format(
+                    boundary, part_type, start, end, size).encode('utf-8'))
+                parts.append(piece(start, end))
+                parts.append(b"\r\n")
+            parts.append("--{}--\r\n".format(boundary).encode('utf-8'))
+        print("[Response] {} ranges {}".format(request.path, ranges))
+
+        self._content = parts
+        self._header = self.build_response_header(request)
+        return SegmentedResponse(self._header, parts)
+
+    def build_range_not_satisfiable(self, size):
+        """
+        Constructs a 416 Range Not Satisfiable response.
+
+        :params size (int): length of the object.
+
+        :rtype bytes: Encoded 416 response.
+        """
+        rsphdr = self.headers
+        parts = [
+            status_line(416, "Range Not Satisfiable"),
+            "Content-Range: bytes */", str(size), "\r\n",
+            "Content-Length: 0\r\n",
+            "Cache-Control: no-store\r\n",
+            "Date: ", http_date(), "\r\n",
+        ]
+        for key in ("Connection", "Keep-Alive"):
+            if key in rsphdr:
+                parts += (key, ": ", rsphdr[key], "\r\n")
+        parts.append("\r\n")
+        return "".join(parts).encode('utf-8')
+
+    def build_not_modified(self):
+        """
+        Constructs a bodyless 304 Not Modified response repeating the
+        validators of the object.
+
+        :rtype bytes: Encoded 304 response.
+        """
+        rsphdr = self.headers
+        parts = [
+            status_line(304, "Not Modified"),
+            "Cache-Control: ", rsphdr.get('Cache-Control', 'no-cache'), "\r\n",
+            "Date: ", http_date(), "\r\n",
+        ]
+        for key in ("Vary", "ETag", "Last-Modified", "Connection", "Keep-Alive"):
+            if key in rsphdr:
+                parts += (key, ": ", rsphdr[key], "\r\n")
+        parts.append("\r\n")
+        return "".join(parts).encode('utf-8')
 
 
     def build_notfound(self):
@@ -294,11 +932,11 @@ class Response():
                 "Accept-Ranges: bytes\r\n"
                 "Content-Type: text/html\r\n"
                 "Content-Length: 13\r\n"
-                "Cache-Control: max-age=86000\r\n"
-                "Connection: close\r\n"
+                "Cache-Control: no-store\r\n"
+                "Connection: {}\r\n"
                 "\r\n"
                 "404 Not Found"
-            ).encode('utf-8')
+            ).format(self.headers.get('Connection', 'close')).encode('utf-8')
 
 
     def build_response(self, request):
@@ -307,31 +945,40 @@ class Response():
 
         :params request (class:`Request <Request>`): incoming request object.
 
-        :rtype bytes: complete HTTP response using prepared headers and content.
+        :rtype SegmentedResponse: prepared header followed by the content, or
+                                  the encoded bytes of a 304 or 404.
         """
 
-        
         path = request.path
 
-        mime_type = self.get_mime_type(path)
-        print("[Response] {} path {} mime_type {}".format(request.method, request.path, mime_type))
-
-        base_dir = ""
-
-        #If HTML, parse and serve embedded objects
-        if path.endswith('.html') or mime_type == 'text/html':
-            base_dir = self.prepare_content_type(mime_type = 'text/html')
-        elif mime_type == 'text/css':
-            base_dir = self.prepare_content_type(mime_type = 'text/css')
-        #
-        # TODO: add support objects
-        #
-        elif mime_type and mime_type.startswith('image/'):
-            base_dir = self.prepare_content_type(mime_type= mime_type)
-        else:
+        # One lookup replaces the MIME guess and the folder rules
+        asset = ASSET_INDEX.lookup(path)
+        if asset is None:
+            print("[Response] {} path {} not found".format(request.method, path))
             return self.build_notfound()
+        print("[Response] {} path {} mime_type {}".format(request.method, path, asset.content_type))
+        self.headers['Content-Type'] = asset.content_type
+        if 'Cache-Control' not in self.headers:
+            self.headers['Cache-Control'] = self.cache_policy.lookup(path)
 
-        c_len, self._content = self.build_content(path, base_dir)
+        c_len, self._content = self.build_content(path, "", asset)
+        if self._content is None:
+            return self.build_notfound()
+        encoding = self.negotiate_encoding(request, c_len)
+        # Conditional GET: the client copy is current
+        if self.status_code in (None, 200) and self.is_not_modified(request):
+            print("[Response] {} not modified".format(path))
+            return self.build_not_modified()
+        # Range request: only part of the object
+        if self.status_code in (None, 200):
+            ranges = self.requested_ranges(request, c_len)
+            if ranges is not None:
+                return self.build_partial(request, ranges, c_len)
+        if encoding:
+            compressor = self.compressor
+            self._content = STATIC_CACHE.variant(
+                self._entry, compressor.variant_name(encoding),
+                lambda data: compressor.compress_file(self._entry.path, data, encoding))
         self._header = self.build_response_header(request)
         # print(self._header + self._content)
-        return self._header + self._content
\ No newline at end of file
+        return SegmentedResponse(self._header, [self._content])
\ No newline at end of file
@@ -0,0 +1,330 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.router
+~~~~~~~~~~~~~~~~~
+
+This module provides the router dispatching requests to the route handlers
+of a :class:`WeApRous <daemon.weaprous.WeApRous>` app.
+
+A route path may hold parameters, written ``<name>`` or ``<converter:name>``
+in place of a path segment, e.g. ``/channel/<name>/members`` or
+``/message/<int:id>``. The converters are ``str`` (one segment, the
+default), ``int``, ``float`` and ``path`` (the rest of the path, slashes
+included, last segment only). Matched values are converted, and passed to
+the handler as keyword arguments.
+
+The routes are compiled into a trie of path segments, so a lookup walks the
+segments of the request path once, whatever the number of routes; routes
+without parameters are found with a single dict lookup. A literal segment
+wins over a parameter, typed parameters over ``str`` ones and those over
+``path``. A GET route answers HEAD too, unless a HEAD route is declared. A
+path matching routes of other methods only is reported with the methods
+allowed, for a 405 answer.
+
+Usage Example:
+--------------
+>>> router = Router({("GET", "/channel/<name>/members"): members})
+>>> router.match("GET", "/channel/general/members")
+(members, {'name': 'general'}, '/channel/<name>/members', ())
+>>> router.match("DELETE", "/channel/general/members")
+(None, {}, None, ('GET', 'HEAD'))
+"""
+
+import re
+import urllib.parse
+
+#: Decimal number accepted by the ``float`` converter.
+_DECIMAL = re.compile(r'^\d+(\.\d+)?$')
+
+
+def to_int(value):
+    """Convert an ``int`` parameter, digits only."""
+    if not value.isdigit():
+        raise ValueError(value)
+    return int(value)
+
+
+def to_float(value):
+    """Convert a ``float`` parameter, decimal notation only."""
+    if not _DECIMAL.match(value):
+        raise ValueError(value)
+    return float(value)
+
+
+#: Converters of the path parameters: name -> (priority, conversion).
+#: Candidates of a segment are tried by increasing priority.
+CONVERTERS = {
+    "int": (0, to_int),
+    "float": (1, to_float),
+    "str": (2, str),
+}
+
+#: ``<name>`` or ``<converter:name>`` parameter segment.
+_PARAM = re.compile(r'^<(?:(\w+):)?([A-Za-z_]\w*)>$')
+
+
+def parse_pattern(pattern):
+    """
+    Splits a route path into its segments.
+
+    :param pattern (str): route path, e.g. ``/channel/<name>/members``.
+
+    :rtype list: one tuple per segment, (None, literal) or (converter, name).
+
+    :raises ValueError: If the path does not start with ``/``, uses an
+                        unknown converter, repeats a parameter name or has
+                        a ``path`` parameter before its last segment.
+    """
+    if not pattern.startswith('/'):
+        raise ValueError("Route path must start with '/': {}".format(pattern))
+    segments = []
+    names = set()
+    parts = pattern[1:].split('/')
+    for i, part in enumerate(parts):
+        param = _PARAM.match(part)
+        if param is None:
+            if '<' in part or '>' in part:
+                raise ValueError("Malformed route parameter {} in {}".format(part, pattern))
+            segments.append((None, part))
+            continue
+        converter, name = param.group(1) or "str", param.group(2)
+        if converter != "path" and converter not in CONVERTERS:
+            raise ValueError("Unknown route converter {} in {}".format(converter, pattern))
+        if converter == "path" and i != len(parts) - 1:
+            raise ValueError("A path parameter must end the route {}".format(pattern))
+        if name in names:
+            raise ValueError("Repeated route parameter {} in {}".format(name, pattern))
+        names.add(name)
+        segments.append((converter, name))
+    return segments
+
+
+class RouteNode:
+    """
+    One segment of the route trie.
+
+    :attrs static (dict): literal segment -> child node.
+    :attrs params (list): (priority, name, conversion, child node) of the
+                          parameter segments, by priority.
+    :attrs rest (RouteNode): node of a ``path`` parameter, or None.
+    :attrs rest_name (str): name of that parameter.
+    :attrs handlers (dict): method -> handler of the routes ending here.
+    :attrs pattern (str): route path of those routes.
+    """
+
+    __slots__ = ("static", "params", "rest", "rest_name", "handlers", "pattern")
+
+    def __init__(self):
+        self.static = {}
+        self.params = []
+        self.rest = None
+        self.rest_name = None
+        self.handlers = {}
+        self.pattern = None
+
+    def handler(self, method):
+        """
+        Handler of a method, the GET one answering HEAD when no route
+        declares HEAD.
+
+        :param method (str): request method.
+
+        :rtype callable: the handler, or None.
+        """
+        handler = self.handlers.get(method)
+        if handler is None and method == "HEAD":
+            handler = self.handlers.get("GET")
+        return handler
+
+    def child(self, converter, name):
+        """
+        Return the child node of a segment, adding it first.
+
+        :param converter (str): converter of a parameter, None for a literal.
+        :param name (str): the literal, or the parameter name.
+
+        :rtype RouteNode: the child.
+        """
+        if converter is None:
+            node = self.static.get(name)
+            if node is None:
+                node = self.static[name] = RouteNode()
+            return node
+        if converter == "path":
+            if self.rest is None:
+                self.rest, self.rest_name = RouteNode(), name
+            elif self.rest_name != name:
+                raise ValueError("Conflicting path parameter names {} and {}".format(
+                    self.rest_name, name))
+            return self.rest
+        priority, convert = CONVERTERS[converter]
+        for entry in self.params:
+            if entry[1] == name and entry[2] is convert:
+                return entry[3]
+        node = RouteNode()
+        self.params.append((priority, name, convert, node))
+        self.params.sort(key=lambda entry: entry[0])
+        return node
+
+
+class Router:
+    """
+    The :class:`Router <Router>` matching request paths and methods to the
+    route handlers. It is built from, and can be used like, the
+    ``{(METHOD, path): handler}`` route mapping of the backend.
+    """
+
+    __attrs__ = [
+        "routes",
+    ]
+
+    def __init__(self, routes=None):
+        """
+        Initialize a new Router instance.
+
+        :param routes (dict): (METHOD, path) -> handler.
+
+        :raises ValueError: If a route path is invalid, see :func:`parse_pattern`.
+        """
+        #: The registered routes, by (METHOD, path)
+        self.routes = {}
+
+        self._root = RouteNode()
+        #: Nodes of the routes without parameters, by path
+        self._exact = {}
+        for (method, pattern), handler in (routes or {}).items():
+            self.add(method, pattern, handler)
+
+    def add(self, method, pattern, handler):
+        """
+        Register a route.
+
+        :param method (str): HTTP method, e.g. ``GET``.
+        :param pattern (str): route path, possibly with parameters.
+        :param handler (callable): the route handler.
+
+        :raises ValueError: If the route path is invalid.
+        """
+        segments = parse_pattern(pattern)
+        node = self._root
+        for converter, name in segments:
+            node = node.child(converter, name)
+        node.handlers[method.upper()] = handler
+        node.pattern = pattern
+        if all(converter is None for converter, _ in segments):
+            self._exact[pattern] = node
+        self.routes[(method.upper(), pattern)] = handler
+
+    def __setitem__(self, key, handler):
+        self.add(key[0], key[1], handler)
+
+    def __getitem__(self, key):
+        return self.routes[key]
+
+    def __contains__(self, key):
+        return key in self.routes
+
+    def __iter__(self):
+        return iter(self.routes)
+
+    def __len__(self):
+        return len(self.routes)
+
+    def __repr__(self):
+        return repr(self.routes)
+
+    def keys(self):
+        return self.routes.keys()
+
+    def items(self):
+        return self.routes.items()
+
+    def get(self, key, default=None):
+        """
+        Exact lookup of a registered route.
+
+        :param key (tuple): (METHOD, route path).
+
+        :rtype callable: the handler, or ``default``.
+        """
+        return self.routes.get(key, default)
+
+    def match(self, method, path):
+        """
+        Find the handler of a request.
+
+        :param method (str): request method.
+        :param path (str): request path, without the query string.
+
+        :rtype tuple: (handler, parameters (dict), route path, allowed
+                      methods). The handler is None when no route answers;
+                      the allowed methods are then those of the routes
+                      matching the path with another method, empty if none.
+                      A GET route also answers HEAD.
+        """
+        node = self._exact.get(path)
+        if node is not None:
+            handler = node.handler(method)
+            if handler is not None:
+                return handler, {}, node.pattern, ()
+
+        allowed = set()
+        segments = path[1:].split('/') if path.startswith('/') else None
+        if segments is not None:
+            for node, params in self._walk(self._root, segments, 0, {}):
+                handler = node.handler(method)
+                if handler is not None:
+                    return handler, params, node.pattern, ()
+                allowed.update(node.handlers)
+        if "GET" in allowed:
+            allowed.add("HEAD")
+        return None, {}, None, tuple(sorted(allowed))
+
+    def _walk(self, node, segments, i, params):
+        """Yield the (node, parameters) of the routes matching the segments from ``i``, by preference."""
+        if i == len(segments):
+            if node.handlers:
+                yield node, params
+            return
+        segment = segments[i]
+        child = node.static.get(segment)
+        if child is not None:
+            yield from self._walk(child, segments, i + 1, params)
+        if segment:
+            value = None
+            for _, name, convert, child in node.params:
+                if value is None:
+                    value = urllib.parse.unquote(segment)
+                try:
+                    converted = convert(value)
+                except ValueError:
+                    continue
+                yield from self._walk(child, segments, i + 1, dict(params, **{name: converted}))
+        if node.rest is not None and node.rest.handlers:
+            rest = urllib.parse.unquote('/'.join(segments[i:]))
+            if rest:
+                yield node.rest, dict(params, **{node.rest_name: rest})
+
+
+def compile_routes(routes):
+    """
+    Compile a route mapping into a :class:`Router <Router>`.
+
+    :param routes (dict or Router): (METHOD, path) -> handler.
+
+    :rtype Router: the router, ``routes`` itself if already compiled.
+    """
+    if isinstance(routes, Router):
+        return routes
+    return Router(routes)
@@ -0,0 +1,285 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.shutdown
+~~~~~~~~~~~~~~~~~
+
+This module provides signal-driven graceful shutdown for the backend and
+proxy daemons.
+
+On SIGTERM or SIGINT the accept loop stops taking new connections and the
+:class:`ConnectionDrainer <ConnectionDrainer>` drains the open ones:
+persistent connections idle between requests are closed at once, requests
+in progress finish and are answered with ``Connection: close``, and whatever
+is still open at the deadline is closed by force. A second signal ends the
+drain immediately.
+
+Usage Example:
+--------------
+>>> drainer = ConnectionDrainer()
+>>> drainer.install_signal_handlers()
+>>> while not drainer.stopping.is_set():
+>>>     ...accept, drainer.register(conn), serve, drainer.unregister(conn)...
+>>> drainer.drain(timeout=10)
+"""
+
+import signal
+import socket
+import threading
+import time
+
+
+def shutdown_socket(conn):
+    """
+    Shut a socket down so a thread blocked in ``recv`` on it wakes up.
+
+    :param conn (socket.socket): connection to shut down.
+    """
+    try:
+        conn.shutdown(socket.SHUT_RDWR)
+    except OSError:
+        pass
+
+
+#: Seconds a closing connection is still read, see :func:`linger_close`.
+LINGER_TIMEOUT = 0.5
+#: Bytes read at most from a closing connection.
+LINGER_LIMIT = 65536
+
+
+def discard_input(conn, limit=LINGER_LIMIT):
+    """
+    Read and drop what a connection received so far, without waiting.
+
+    :param conn (socket.socket): connection whose input is dropped.
+    :param limit (int): bytes read at most.
+
+    :rtype bool: True once the peer closed its side.
+    """
+    conn.setblocking(False)
+    try:
+        while limit > 0:
+            data = conn.recv(min(limit, 16384))
+            if not data:
+                return True
+            limit -= len(data)
+    except (BlockingIOError, InterruptedError):
+        pass
+    return False
+
+
+def linger_close(conn, timeout=LINGER_TIMEOUT, limit=LINGER_LIMIT):
+    """
+    Close a connection after a final response without resetting it.
+
+    Closing a socket with unread bytes makes the kernel send a RST, which
+    can destroy the response before the client reads it. The write side is
+    shut down first, then what the client still sends is read and dropped
+    until it closes too, for at most ``timeout`` seconds and ``limit`` bytes.
+
+    :param conn (socket.socket): connection to close.
+    :param timeout (float): seconds spent reading at most.
+    :param limit (int): bytes read at most.
+    """
+    try:
+        conn.shutdown(socket.SHUT_WR)
+        end = time.monotonic() + timeout
+        while limit > 0:
+            left = end - time.monotonic()
+            if left <= 0:
+                break
+            conn.settimeout(left)
+            data = conn.recv(min(limit, 16384))
+            if not data:
+                break
+            limit -= len(data)
+    except OSError:
+        pass
+    finally:
+        conn.close()
+
+
+class ConnectionDrainer:
+    """
+    The :class:`ConnectionDrainer <ConnectionDrainer>` tracking open
+    connections so they can be drained on shutdown.
+
+    Connections are registered with the callables closing them, which lets
+    the same drainer serve blocking sockets and asyncio streams.
+
+    :attrs name (str): daemon name used in log lines.
+    :attrs stopping (threading.Event): set once shutdown has been requested.
+    :attrs drained (int): connections that finished during the drain.
+    :attrs forced (int): connections closed by force at the deadline.
+    """
+
+    __attrs__ = [
+        "name",
+        "stopping",
+        "drained",
+        "forced",
+    ]
+
+    def __init__(self, name="Backend"):
+        """
+        Initialize a new ConnectionDrainer instance.
+
+        :param name (str): daemon name used in log lines.
+        """
+        self.name = name
+        self.stopping = threading.Event()
+        self.drained = 0
+        self.forced = 0
+
+        self._force = False
+        self._conns = {}
+        self._lock = threading.Lock()
+
+    def install_signal_handlers(self, on_stop=None):
+        """
+        Request a graceful stop on SIGTERM and SIGINT. Handlers can only be
+        installed from the main thread; elsewhere this does nothing.
+
+        :param on_stop (callable): optional extra action run on the first signal.
+
+        :rtype bool: True if the handlers were installed.
+        """
+        if threading.current_thread() is not threading.main_thread():
+            return False
+
+        def handler(signum, frame):
+            self.request_stop(signum)
+            if on_stop is not None:
+                on_stop()
+
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            # A signal ignored on purpose (e.g. SIGINT in a pre-fork worker) stays ignored
+            if signal.getsignal(signum) != signal.SIG_IGN:
+                signal.signal(signum, handler)
+        return True
+
+    def request_stop(self, signum=None):
+        """
+        Begin the shutdown; a second request ends the drain immediately.
+
+        :param signum (int): signal number, for the log line.
+        """
+        if self.stopping.is_set():
+            print("[{}] Second stop request, closing connections now".format(self.name))
+            self._force = True
+            return
+        print("[{}] Received signal {}, stopping".format(self.name, signum))
+        self.stopping.set()
+
+    def register(self, conn, close=None, abort=None):
+        """
+        Track a newly accepted connection.
+
+        :param conn: the connection, used as key.
+        :param close (callable): closes the connection when it is idle,
+                                 defaults to shutting the socket down.
+        :param abort (callable): closes the connection at the deadline,
+                                 defaults to ``close``.
+        """
+        close = close or (lambda: shutdown_socket(conn))
+        with self._lock:
+            self._conns[conn] = [False, close, abort or close]
+
+    def unregister(self, conn):
+        """
+        Forget a connection that has been closed.
+
+        :param conn: the connection given to :meth:`register`.
+        """
+        with self._lock:
+            if self._conns.pop(conn, None) is not None and self.stopping.is_set():
+                self.drained += 1
+
+    def set_idle(self, conn, idle):
+        """
+        Mark a connection as waiting between requests, or busy again.
+
+        Once stopping, an idle connection is closed right away, since no
+        request on it is in progress.
+
+        :param conn: the connection given to :meth:`register`.
+        :param idle (bool): True when waiting for the next request.
+        """
+        with self._lock:
+            entry = self._conns.get(conn)
+            if entry is None:
+                return
+            entry[0] = idle
+            close_now = idle and self.stopping.is_set()
+        if close_now:
+            entry[1]()
+
+    def pending(self):
+        """
+        Number of connections still open.
+
+        :rtype int: tracked connection count.
+        """
+        return len(self._conns)
+
+    def close_idle(self):
+        """Close every connection waiting between requests."""
+        with self._lock:
+            idle = [entry[1] for entry in self._conns.values() if entry[0]]
+        for close in idle:
+            close()
+
+    def abort_all(self):
+        """
+        Close every remaining connection by force.
+
+        :rtype int: number of connections aborted.
+        """
+        with self._lock:
+            remaining = [entry[2] for entry in self._conns.values()]
+            self.forced += len(remaining)
+            self._conns.clear()
+        for abort in remaining:
+            abort()
+        return len(remaining)
+
+    def deadline_passed(self, deadline):
+        """
+        Check whether the drain must end now.
+
+        :param deadline (float): ``time.monotonic()`` value ending the drain.
+
+        :rtype bool: True once the deadline passed or a second signal arrived.
+        """
+        return self._force or time.monotonic() >= deadline
+
+    def drain(self, timeout):
+        """
+        Wait for the open connections to finish, up to ``timeout`` seconds.
+
+        :param timeout (float): drain deadline in seconds.
+
+        :rtype tuple: (drained, forced) connection counts.
+        """
+        self.close_idle()
+        deadline = time.monotonic() + timeout
+        while self.pending() and not self.deadline_passed(deadline):
+            time.sleep(0.05)
+        self.abort_all()
+        self.report()
+        return self.drained, self.forced
+
+    def report(self):
+        """Print the outcome of the drain."""
+        print("[{}] Shutdown complete: {} connections drained, {} closed by force".format(
+            self.name, self.drained, self.forced))
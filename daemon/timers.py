@@ -0,0 +1,327 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.timers
+~~~~~~~~~~~~~~~~~
+
+This module provides the connection timeouts of the daemons.
+
+Instead of one ``settimeout`` per socket, every connection arms a timer on
+one shared :class:`TimerWheel <TimerWheel>` for the phase it is in: waiting
+for the request headers, reading the body, writing the response or idling
+between requests of a persistent connection. Arming and cancelling a timer
+is a set insertion/removal, so the bookkeeping stays cheap with thousands
+of connections, and a single thread expires them all. An expired
+connection is shut down, which wakes the thread blocked on it; a client
+that connects and never sends anything no longer holds a thread and a
+file descriptor forever.
+
+Usage Example:
+--------------
+>>> wheel = TimerWheel()
+>>> wheel.start()
+>>> deadline = Deadline(wheel.schedule, lambda: shutdown_socket(conn), DEFAULT_TIMEOUTS)
+>>> deadline.start("header")
+>>> ...read the request...
+>>> deadline.stop()
+"""
+
+import threading
+import time
+
+from .shutdown import shutdown_socket
+
+#: Phases whose timeout counts inactivity: each :meth:`Deadline.touch`
+#: restarts it, so a slow but steady transfer is never cut. The other
+#: phases bound their total duration.
+IDLE_PHASES = ("body", "write")
+
+#: Seconds allowed per connection phase, 0 disables a phase.
+DEFAULT_TIMEOUTS = {
+    #: Receiving the complete header block of a request
+    "header": 10,
+    #: Receiving the request body without any byte arriving
+    "body": 30,
+    #: Sending the response without any byte leaving
+    "write": 30,
+    #: Waiting for the next request on a persistent connection
+    "keepalive": 5,
+}
+
+
+def phase_timeouts(settings):
+    """
+    Collects the per-phase connection timeouts of the daemon options.
+
+    :param settings (dict): options with ``header_timeout``, ``body_timeout``,
+                            ``write_timeout`` and ``keepalive_timeout``.
+
+    :rtype dict: seconds per phase, as used by :class:`Deadline <Deadline>`.
+    """
+    return {
+        "header": settings["header_timeout"],
+        "body": settings["body_timeout"],
+        "write": settings["write_timeout"],
+        "keepalive": settings["keepalive_timeout"],
+    }
+
+
+class Timer:
+    """
+    A :class:`Timer <Timer>` scheduled on a :class:`TimerWheel <TimerWheel>`.
+
+    :attrs callback (callable): called without argument when the timer expires.
+    :attrs rounds (int): full wheel turns left before the timer is due.
+    """
+
+    __attrs__ = [
+        "callback",
+        "rounds",
+    ]
+
+    def __init__(self, wheel, slot, rounds, callback):
+        self.callback = callback
+        self.rounds = rounds
+        self._wheel = wheel
+        self._slot = slot
+
+    def cancel(self):
+        """Cancel the timer; does nothing once it expired."""
+        self._wheel._cancel(self)
+
+
+class TimerWheel:
+    """
+    A hashed :class:`TimerWheel <TimerWheel>` expiring timers from one thread.
+
+    Time is cut in ``tick`` second steps and timers are hashed into
+    ``slots`` buckets by their expiry tick, so a timer fires up to one
+    tick late, which is fine for timeouts counted in seconds.
+
+    :attrs tick (float): wheel resolution in seconds.
+    :attrs slots (int): number of buckets of the wheel.
+    :attrs expired (int): number of timers that fired.
+    """
+
+    __attrs__ = [
+        "tick",
+        "slots",
+        "expired",
+    ]
+
+    def __init__(self, tick=0.25, slots=512, name="timer-wheel"):
+        """
+        Initialize a new TimerWheel instance.
+
+        :param tick (float): wheel resolution in seconds.
+        :param slots (int): number of buckets, one wheel turn lasts ``tick * slots``.
+        :param name (str): name of the expiry thread.
+        """
+        self.tick = tick
+        self.slots = slots
+        self.expired = 0
+
+        self._buckets = [set() for _ in range(slots)]
+        self._cursor = 0
+        self._name = name
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Start the expiry thread, once."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name=self._name)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def schedule(self, delay, callback):
+        """
+        Arm a timer.
+
+        :param delay (float): seconds before the callback runs.
+        :param callback (callable): called from the wheel thread on expiry.
+
+        :rtype Timer: handle to :meth:`Timer.cancel` the timer.
+        """
+        # One extra tick, as the cursor may move right after scheduling
+        ticks = int(-(-delay // self.tick)) + 1
+        with self._lock:
+            slot = (self._cursor + ticks) % self.slots
+            timer = Timer(self, slot, (ticks - 1) // self.slots, callback)
+            self._buckets[slot].add(timer)
+        return timer
+
+    def pending(self):
+        """
+        Number of armed timers.
+
+        :rtype int: timer count.
+        """
+        with self._lock:
+            return sum(len(bucket) for bucket in self._buckets)
+
+    def _cancel(self, timer):
+        with self._lock:
+            self._buckets[timer._slot].discard(timer)
+
+    def _advance(self):
+        """
+        Move the wheel one tick forward.
+
+        :rtype list: callbacks of the timers that are due.
+        """
+        with self._lock:
+            self._cursor = (self._cursor + 1) % self.slots
+            bucket = self._buckets[self._cursor]
+            due = []
+            for timer in list(bucket):
+                if timer.rounds:
+                    timer.rounds -= 1
+                else:
+                    bucket.discard(timer)
+                    due.append(timer.callback)
+            self.expired += len(due)
+        return due
+
+    def _run(self):
+        """Expiry loop, catching up on ticks missed while callbacks ran."""
+        next_tick = time.monotonic() + self.tick
+        while True:
+            delay = next_tick - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            next_tick += self.tick
+            for callback in self._advance():
+                try:
+                    callback()
+                except Exception as e:
+                    print("[TimerWheel] Timer callback failed: {}".format(e))
+
+
+class Deadline:
+    """
+    The :class:`Deadline <Deadline>` of the current phase of one connection.
+
+    :attrs timeouts (dict): seconds allowed per phase, see ``DEFAULT_TIMEOUTS``.
+    :attrs phase (str): phase of the armed timer, or None.
+    :attrs expired (str): phase that timed out, or None.
+    """
+
+    __attrs__ = [
+        "timeouts",
+        "phase",
+        "expired",
+    ]
+
+    def __init__(self, schedule, abort, timeouts=DEFAULT_TIMEOUTS):
+        """
+        Initialize a new Deadline instance.
+
+        :param schedule (callable): ``schedule(delay, callback)`` returning a
+                                    handle with ``cancel()``, such as
+                                    :meth:`TimerWheel.schedule` or
+                                    ``loop.call_later`` of an event loop.
+        :param abort (callable): closes the connection when the phase expires.
+        :param timeouts (dict): seconds allowed per phase.
+        """
+        self.timeouts = timeouts
+        self.phase = None
+        self.expired = None
+
+        self._schedule = schedule
+        self._abort = abort
+        self._timer = None
+        #: Bumped on every change, so a timer of an old phase never aborts
+        self._generation = 0
+        #: ``time.monotonic()`` of the last progress of the phase
+        self._activity = 0.0
+
+    def start(self, phase):
+        """
+        Enter a phase, replacing the timer of the previous one.
+
+        :param phase (str): one of ``header``, ``body``, ``write``, ``keepalive``.
+        """
+        self.stop()
+        self.phase = phase
+        self._activity = time.monotonic()
+        timeout = self.timeouts.get(phase)
+        if timeout:
+            self._arm(phase, timeout, self._generation)
+
+    def touch(self):
+        """
+        Record progress, some bytes read or written, which restarts the
+        timeout of a phase of ``IDLE_PHASES``.
+
+        Only a timestamp is taken here; the timer is moved when it fires.
+        """
+        self._activity = time.monotonic()
+
+    def _arm(self, phase, delay, generation):
+        self._timer = self._schedule(delay, lambda: self._expire(phase, generation))
+
+    def stop(self):
+        """Leave the current phase without a timeout."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self.phase = None
+        self._generation += 1
+
+    def _expire(self, phase, generation):
+        if generation != self._generation:
+            return
+        if phase in IDLE_PHASES:
+            idle = time.monotonic() - self._activity
+            timeout = self.timeouts.get(phase)
+            if idle < timeout:
+                # Progress was made meanwhile: wait for the rest of the timeout
+                self._arm(phase, timeout - idle, generation)
+                return
+        self.expired = phase
+        self._abort()
+
+
+_default_wheel = None
+_default_lock = threading.Lock()
+
+
+def default_wheel():
+    """
+    Returns the process wide wheel, started on first use. It is created
+    lazily so a pre-fork worker gets its own expiry thread.
+
+    :rtype TimerWheel: the shared wheel.
+    """
+    global _default_wheel
+    with _default_lock:
+        if _default_wheel is None:
+            _default_wheel = TimerWheel()
+            _default_wheel.start()
+        return _default_wheel
+
+
+def socket_deadline(wheel, conn, timeouts=DEFAULT_TIMEOUTS):
+    """
+    Creates the :class:`Deadline <Deadline>` of a blocking socket, which is
+    shut down when a phase expires.
+
+    :param wheel (TimerWheel): the wheel of the daemon.
+    :param conn (socket.socket): the connection.
+    :param timeouts (dict): seconds allowed per phase.
+
+    :rtype Deadline: the deadline, no phase armed yet.
+    """
+    return Deadline(wheel.schedule, lambda: shutdown_socket(conn), timeouts)
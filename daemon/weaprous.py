@@ -18,6 +18,8 @@ This module provides a WeApRous object to deploy RESTful url web app with routin
 """
 
 from .backend import create_backend
+from .cachepolicy import CachePolicy
+from .router import parse_pattern
 
 class WeApRous:
     """The fully mutable :class:`WeApRous <WeApRous>` object, which is a lightweight,
@@ -52,6 +54,8 @@ class WeApRous:
         self.routes = {}
         self.ip = None
         self.port = None
+        #: Cache-Control directives per path prefix and route
+        self.cache_policy = CachePolicy()
         return
 
     def prepare_address(self, ip, port):
@@ -64,38 +68,71 @@ class WeApRous:
         self.ip = ip
         self.port = port
 
-    def route(self, path, methods=['GET']):
+    def cache_control(self, path, directives=None, **options):
+        """
+        Set the Cache-Control directives of a path prefix or route.
+
+        :param path (str): exact path, or prefix when it ends with ``/``,
+                           e.g. ``/static/images/``.
+        :param directives (str): header value, e.g. ``"no-store"``; otherwise
+                                 built from ``options`` such as ``max_age=3600,
+                                 immutable=True``, ``private=True`` or ``no_store=True``.
+        """
+        self.cache_policy.add(path, directives, **options)
+
+    def route(self, path, methods=['GET'], cache_control=None, stream=False):
         """
         Decorator to register a route handler for a specific path and HTTP methods.
 
-        :param path (str): The URL path to route.
+        :param path (str): The URL path to route, may hold parameters passed
+                           to the handler as keyword arguments, e.g.
+                           ``/channel/<name>/members`` or ``/message/<int:id>``,
+                           see :mod:`daemon.router`.
         :param methods (list): A list of HTTP methods (e.g., ['GET', 'POST']) to bind.
+        :param cache_control (str): Cache-Control directives of the responses,
+                                    ``no-cache`` by default.
+        :param stream (bool): pass the body to the handler as a readable
+                              :class:`RequestBody <daemon.body.RequestBody>`
+                              instead of text, e.g. for file uploads with
+                              ``body.form()``.
 
         :rtype: function - A decorator that registers the handler function.
+
+        :raises ValueError: If the path has a malformed parameter.
         """
+        # Rejected now rather than when the server starts
+        parse_pattern(path)
+
         def decorator(func):
             for method in methods:
                 self.routes[(method.upper(), path)] = func
+            if cache_control is not None:
+                self.cache_policy.add(path, cache_control)
 
             # Optional attach route metadata to the function
             func._route_path = path
             func._route_methods = methods
+            func._route_stream = stream
 
             return func
         return decorator
 
-    def run(self):
+    def run(self, **options):
         """
         Start the backend server and begin handling requests.
 
         This method launches the TCP server using the configured IP and port,
         and dispatches incoming requests to the registered route handlers.
 
+        :param options: serving options forwarded to :func:`create_backend`,
+                        e.g. ``engine="pool", pool_size=8, queue_size=32``.
+
         :raise: Error if IP or port has not been configured.
         """
         if not self.ip or not self.port:
             print("Rous app need to preapre address"
                   "by calling app.prepare_address(ip,port)")
 
-        create_backend(self.ip, self.port, self.routes)
+        options.setdefault("cache_policy", self.cache_policy)
+        create_backend(self.ip, self.port, self.routes, **options)
         
@@ -0,0 +1,167 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.workerpool
+~~~~~~~~~~~~~~~~~
+
+This module provides a bounded pool of worker threads used by the backend
+daemon instead of spawning one thread per accepted connection.
+
+The pool owns a fixed number of threads which consume accepted connections
+from a bounded queue. When the queue is full the connection is not queued
+and the caller is expected to answer it with a quick error response, so the
+server degrades predictably under a traffic burst.
+
+Usage Example:
+--------------
+>>> pool = WorkerPool(handler, size=16, queue_size=64)
+>>> pool.start()
+>>> if not pool.submit(conn, addr):
+>>>     conn.sendall(SERVICE_UNAVAILABLE)
+"""
+
+import queue
+import threading
+import time
+
+
+class WorkerPool:
+    """
+    A fixed-size :class:`WorkerPool <WorkerPool>` with a bounded accept queue.
+
+    :attrs handler (callable): function called as ``handler(conn, addr)`` by a worker.
+    :attrs size (int): number of worker threads.
+    :attrs queue_size (int): maximum number of connections waiting for a worker.
+    :attrs accepted (int): number of connections handed to the pool.
+    :attrs rejected (int): number of connections refused because the queue was full.
+    :attrs max_wait (float): seconds a connection may wait in the queue, 0 for no limit.
+    :attrs expired (int): number of connections dropped after waiting too long.
+    """
+
+    __attrs__ = [
+        "handler",
+        "size",
+        "queue_size",
+        "accepted",
+        "rejected",
+        "max_wait",
+        "expired",
+    ]
+
+    def __init__(self, handler, size=16, queue_size=64, max_wait=0, on_expired=None):
+        """
+        Initialize a new WorkerPool instance.
+
+        :param handler (callable): connection handler ``handler(conn, addr)``.
+        :param size (int): number of worker threads to start.
+        :param queue_size (int): capacity of the pending connection queue.
+        :param max_wait (float): seconds a connection may wait for a worker, 0 for no limit.
+        :param on_expired (callable): ``on_expired(conn, addr)`` called instead of the
+                                      handler for a connection that waited too long.
+        """
+        #: Connection handler
+        self.handler = handler
+        #: Worker thread count
+        self.size = size
+        #: Pending queue capacity
+        self.queue_size = queue_size
+        #: Counters
+        self.accepted = 0
+        self.rejected = 0
+        #: Queue-time limit
+        self.max_wait = max_wait
+        self.on_expired = on_expired
+        self.expired = 0
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._threads = []
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Start the worker threads."""
+        for i in range(self.size):
+            worker = threading.Thread(
+                target=self._work,
+                name="backend-worker-{}".format(i)
+            )
+            worker.daemon = True
+            worker.start()
+            self._threads.append(worker)
+        print("[WorkerPool] Started {} workers (queue size {})".format(
+            self.size, self.queue_size))
+
+    def submit(self, conn, addr):
+        """
+        Queue an accepted connection for the next idle worker.
+
+        :param conn (socket.socket): client connection socket.
+        :param addr (tuple): client address (IP, port).
+
+        :rtype bool: True if queued, False if the queue is full.
+        """
+        try:
+            self._queue.put_nowait((conn, addr, time.monotonic()))
+        except queue.Full:
+            with self._lock:
+                self.rejected += 1
+            return False
+        with self._lock:
+            self.accepted += 1
+        return True
+
+    def queue_depth(self):
+        """
+        Number of connections currently waiting for a worker.
+
+        :rtype int: approximate pending queue length.
+        """
+        return self._queue.qsize()
+
+    def stats(self):
+        """
+        Snapshot of the pool counters.
+
+        :rtype dict: workers, queue size, queue depth, accepted and rejected counts.
+        """
+        with self._lock:
+            return {
+                "workers": self.size,
+                "queue_size": self.queue_size,
+                "queue_depth": self._queue.qsize(),
+                "accepted": self.accepted,
+                "rejected": self.rejected,
+                "expired": self.expired,
+            }
+
+    def _work(self):
+        """Worker loop: take a connection from the queue and handle it."""
+        while True:
+            conn, addr, enqueued_at = self._queue.get()
+            try:
+                if self.max_wait and time.monotonic() - enqueued_at > self.max_wait:
+                    with self._lock:
+                        self.expired += 1
+                    if self.on_expired is not None:
+                        self.on_expired(conn, addr)
+                    else:
+                        conn.close()
+                    continue
+                self.handler(conn, addr)
+            except Exception as e:
+                print("[WorkerPool] Handler error for {}: {}".format(addr, e))
+                try:
+                    conn.close()
+                except OSError:
+                    pass
+            finally:
+                self._queue.task_done()
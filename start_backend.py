@@ -58,6 +58,79 @@ if __name__ == "__main__":
         default=PORT,
         help='Port number to bind the server. Default is {}.'.format(PORT)
     )
+    parser.add_argument(
+        '--engine',
+        choices=['thread', 'pool', 'asyncio'],
+        default='thread',
+        help='Connection handling engine. Default is thread.'
+    )
+    parser.add_argument(
+        '--pool-size',
+        type=int,
+        default=16,
+        help='Worker threads in pool engine. Default is 16.'
+    )
+    parser.add_argument(
+        '--queue-size',
+        type=int,
+        default=64,
+        help='Pending connections allowed in pool engine. Default is 64.'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Worker processes sharing the port. Default is 1.'
+    )
+    parser.add_argument(
+        '--max-inflight',
+        type=int,
+        default=0,
+        help='Connections open at once, idle keep-alive ones included, before '
+             'shedding with 503. Default is 0 (no limit).'
+    )
+    parser.add_argument(
+        '--max-queue-time',
+        type=float,
+        default=0,
+        help='Seconds a connection may wait for a pool worker. Default is 0 (no limit).'
+    )
+    parser.add_argument(
+        '--drain-timeout',
+        type=float,
+        default=10,
+        help='Seconds granted to open connections on SIGTERM/SIGINT. Default is 10.'
+    )
+    parser.add_argument(
+        '--file-mode',
+        choices=['sendfile', 'mmap'],
+        default='sendfile',
+        help='How large static files are served. Default is sendfile.'
+    )
+    parser.add_argument(
+        '--cache-config',
+        type=str,
+        default=None,
+        help='File of Cache-Control rules per path, e.g. config/cache.conf.'
+    )
+    parser.add_argument(
+        '--spool-threshold',
+        type=int,
+        default=1024 * 1024,
+        help='Request bodies larger than this many bytes are spooled to disk. Default is 1 MiB.'
+    )
+    parser.add_argument(
+        '--max-body-size',
+        type=int,
+        default=64 * 1024 * 1024,
+        help='Request bodies larger than this many bytes are refused with 413. '
+             'Default is 64 MiB, 0 for no limit.'
+    )
+    parser.add_argument(
+        '--reuse-port',
+        action='store_true',
+        help='Give each worker process its own SO_REUSEPORT socket.'
+    )
  
     args = parser.parse_args()
     ip = args.server_ip
@@ -67,4 +140,16 @@ if __name__ == "__main__":
     print("Link: http://{}:{}".format(ip, port))
 
     
-    create_backend(ip, port)
+    create_backend(ip, port,
+                   engine=args.engine,
+                   pool_size=args.pool_size,
+                   queue_size=args.queue_size,
+                   max_inflight=args.max_inflight,
+                   max_queue_time=args.max_queue_time,
+                   drain_timeout=args.drain_timeout,
+                   workers=args.workers,
+                   file_mode=args.file_mode,
+                   cache_config=args.cache_config,
+                   spool_threshold=args.spool_threshold,
+                   max_body_size=args.max_body_size,
+                   reuse_port=args.reuse_port)
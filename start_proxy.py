@@ -117,6 +117,8 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(prog='Proxy', description='', epilog='Proxy daemon')
     parser.add_argument('--server-ip', default='0.0.0.0')
     parser.add_argument('--server-port', type=int, default=PROXY_PORT)
+    parser.add_argument('--drain-timeout', type=float, default=10,
+                        help='seconds granted to open connections on shutdown')
  
     args = parser.parse_args()
     ip = args.server_ip
@@ -127,4 +129,4 @@ if __name__ == "__main__":
     print("Link: http://{}:{}".format(ip, port))
 
 
-    create_proxy(ip, port, routes)
+    create_proxy(ip, port, routes, drain_timeout=args.drain_timeout)
@@ -0,0 +1,147 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+tests.app
+~~~~~~~~~~~~~~~~~
+
+The WeApRous app served by the tests, started as its own process by
+:func:`tests.support.start_server`, because the backend installs signal
+handlers and must own the main thread.
+
+Usage::
+  python tests/app.py <port> [option=value ...]
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+# The static files are served relative to the repository root
+os.chdir(ROOT)
+
+from daemon.weaprous import WeApRous
+
+#: Size of the body answered by ``/blob``, in bytes.
+BLOB_SIZE = 8 * 1024 * 1024
+
+app = WeApRous()
+
+
+@app.route('/echo', methods=['POST'])
+def echo(headers, body):
+    return {'size': len(body)}
+
+
+@app.route('/upload', methods=['POST'], stream=True)
+def upload(headers, body):
+    return {part.name: {'filename': part.filename, 'size': len(part.body),
+                        'spooled': not part.body.in_memory}
+            for part in body.parts()}
+
+
+@app.route('/hello', methods=['GET'])
+def hello(headers, body):
+    return {'message': 'Hello, world!'}
+
+
+@app.route('/pid', methods=['GET'])
+def pid(headers, body):
+    return {'pid': os.getpid()}
+
+
+@app.route('/hello-async', methods=['GET'])
+async def hello_async(headers, body):
+    await asyncio.sleep(0)
+    return {'message': 'Hello, async world!'}
+
+
+@app.route('/sleep/<float:seconds>', methods=['GET'])
+def sleep(headers, body, seconds):
+    time.sleep(seconds)
+    return {'slept': seconds}
+
+
+@app.route('/numbers/<int:n>', methods=['GET'], cache_control='public, max-age=60')
+def numbers(headers, body, n):
+    return list(range(n))
+
+
+@app.route('/count/<int:n>', methods=['GET'])
+def count(headers, body, n):
+    def chunks():
+        for i in range(n):
+            yield "{}\n".format(i)
+    return chunks()
+
+
+@app.route('/count-async/<int:n>', methods=['GET'])
+async def count_async(headers, body, n):
+    for i in range(n):
+        await asyncio.sleep(0)
+        yield "{}\n".format(i).encode()
+
+
+@app.route('/fail-early', methods=['GET'])
+def fail_early(headers, body):
+    def chunks():
+        raise RuntimeError("no data")
+        yield "never"
+    return chunks()
+
+
+@app.route('/fail-early-async', methods=['GET'])
+async def fail_early_async(headers, body):
+    raise RuntimeError("no data")
+    yield "never"
+
+
+@app.route('/fail-late', methods=['GET'])
+def fail_late(headers, body):
+    def chunks():
+        yield "first\n"
+        raise RuntimeError("no more data")
+    return chunks()
+
+
+@app.route('/blob', methods=['GET'])
+def blob(headers, body):
+    return b"x" * BLOB_SIZE
+
+
+def parse_options(args):
+    """
+    Parse ``option=value`` arguments, numbers converted.
+
+    :param args (list): command line arguments.
+
+    :rtype dict: serving options.
+    """
+    options = {}
+    for arg in args:
+        name, _, value = arg.partition('=')
+        for convert in (int, float):
+            try:
+                value = convert(value)
+                break
+            except ValueError:
+                pass
+        options[name] = value
+    return options
+
+
+if __name__ == '__main__':
+    app.prepare_address('127.0.0.1', int(sys.argv[1]))
+    app.run(**parse_options(sys.argv[2:]))
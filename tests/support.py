@@ -0,0 +1,150 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+tests.support
+~~~~~~~~~~~~~~~~~
+
+Helpers of the tests: a :class:`ServerTestCase <ServerTestCase>` serving
+``tests/app.py`` in a subprocess, and raw socket exchanges with it.
+"""
+
+import os
+import socket
+import subprocess
+import sys
+import time
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, "tests", "app.py")
+# The tests also use the daemon package directly
+sys.path.insert(0, ROOT)
+
+#: Seconds a test server may take to start listening.
+START_TIMEOUT = 10
+
+
+def free_port():
+    """
+    :rtype int: a TCP port of the loopback interface free right now.
+    """
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(**options):
+    """
+    Serve the test app on a free port.
+
+    :param options: serving options of the backend, e.g. ``engine="asyncio"``.
+
+    :rtype tuple: (process, port).
+
+    :raises RuntimeError: If the server does not listen in time.
+    """
+    port = free_port()
+    args = ["{}={}".format(name, value) for name, value in options.items()]
+    process = subprocess.Popen([sys.executable, APP, str(port)] + args,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    limit = time.monotonic() + START_TIMEOUT
+    while time.monotonic() < limit:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return process, port
+        except OSError:
+            if process.poll() is not None:
+                break
+            time.sleep(0.05)
+    stop_server(process)
+    raise RuntimeError("Test server did not start on port {}".format(port))
+
+
+def stop_server(process):
+    """Terminate a server started by :func:`start_server`."""
+    if process.poll() is None:
+        process.kill()
+    process.wait()
+
+
+def read_response(sock, head=False):
+    """
+    Read one response delimited by Content-Length, or by the end of stream.
+
+    :param sock (socket.socket): connection to the server.
+    :param head (bool): the response answers a HEAD request, so it has no
+                        body whatever its Content-Length.
+
+    :rtype tuple: (status code (int), header fields (dict) by lowercased
+                  name, body (bytes)).
+    """
+    data = b""
+    while b"\r\n\r\n" not in data:
+        # One byte at a time, so the bytes of a next response stay unread
+        chunk = sock.recv(1)
+        if not chunk:
+            raise ConnectionError("Connection closed before the response header")
+        data += chunk
+    lines = data[:-4].decode('latin-1').split("\r\n")
+    headers = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+    status = int(lines[0].split()[1])
+    if head:
+        return status, headers, b""
+    body = b""
+    length = headers.get('content-length')
+    while length is None or len(body) < int(length):
+        chunk = sock.recv(65536 if length is None else int(length) - len(body))
+        if not chunk:
+            break
+        body += chunk
+    return status, headers, body
+
+
+class ServerTestCase(unittest.TestCase):
+    """
+    Runs the test app for the tests of the class, with the serving
+    ``options`` of the class.
+    """
+
+    options = {}
+
+    @classmethod
+    def setUpClass(cls):
+        cls.process, cls.port = start_server(**cls.options)
+
+    @classmethod
+    def tearDownClass(cls):
+        stop_server(cls.process)
+
+    def connect(self, timeout=10):
+        """
+        :rtype socket.socket: a new connection to the test server.
+        """
+        sock = socket.create_connection(('127.0.0.1', self.port), timeout=timeout)
+        self.addCleanup(sock.close)
+        return sock
+
+    def exchange(self, raw):
+        """
+        Send raw request bytes on a new connection and read the response.
+
+        :param raw (bytes): the request.
+
+        :rtype tuple: see :func:`read_response`.
+        """
+        sock = self.connect()
+        sock.sendall(raw)
+        return read_response(sock)
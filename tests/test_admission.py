@@ -0,0 +1,145 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+Admission control: connections beyond ``max_inflight``, or waiting too
+long for a pool worker, get the prebuilt 503 with ``Retry-After``, without
+being reset even when their request was never read, and are counted.
+"""
+
+import json
+import socket
+import time
+import unittest
+
+from support import ServerTestCase, read_response
+
+from daemon.admission import AdmissionController, build_shed_response
+
+#: Body of the request sent by the shed client, left unread by the server.
+BODY_SIZE = 50000
+
+
+def status_line_and_fields(reply):
+    head = reply.split(b"\r\n\r\n")[0].decode().split("\r\n")
+    return head[0], dict(line.split(": ", 1) for line in head[1:])
+
+
+class AdmissionControllerTest(unittest.TestCase):
+
+    def test_shed_response(self):
+        line, fields = status_line_and_fields(build_shed_response(7))
+        self.assertEqual(line, "HTTP/1.1 503 Service Unavailable")
+        self.assertEqual(fields['Retry-After'], '7')
+        self.assertEqual(fields['Connection'], 'close')
+
+    def test_inflight_limit(self):
+        admission = AdmissionController(max_inflight=2)
+        self.assertTrue(admission.try_admit())
+        self.assertTrue(admission.try_admit())
+        self.assertFalse(admission.try_admit())
+        admission.release()
+        self.assertTrue(admission.try_admit())
+        stats = admission.stats()
+        self.assertEqual((stats["inflight"], stats["admitted"]), (2, 3))
+
+    def test_no_limit(self):
+        admission = AdmissionController()
+        self.assertTrue(all(admission.try_admit() for _ in range(1000)))
+
+    def test_shed_counts(self):
+        admission = AdmissionController()
+        admission.record_shed("inflight")
+        self.assertEqual(admission.record_shed("queue_time"), 2)
+        self.assertEqual(admission.stats()["shed"],
+                         {"inflight": 1, "queue_full": 0, "queue_time": 1})
+
+    def test_scheduled_close(self):
+        scheduled = []
+        admission = AdmissionController(retry_after=2,
+                                        schedule=lambda delay, cb: scheduled.append(cb))
+        client, conn = socket.socketpair()
+        self.addCleanup(client.close)
+        admission.shed(conn, "queue_full")
+        self.assertEqual(client.recv(4096), admission.response)
+        # Half closed at once, the socket itself only when the timer fires
+        self.assertEqual(client.recv(4096), b"")
+        self.assertEqual(len(scheduled), 1)
+        client.sendall(b"GET / HTTP/1.1\r\n\r\n")
+        scheduled[0]()
+        self.assertEqual(conn.fileno(), -1)
+        self.assertEqual(admission.shed_counts["queue_full"], 1)
+
+
+class ShedTest(ServerTestCase):
+
+    options = {"engine": "thread", "max_inflight": 1, "retry_after": 3}
+
+    def test_shed_reply_is_delivered(self):
+        # An idle keep-alive connection holds the only slot, once the
+        # startup probe of the server released it
+        for _ in range(50):
+            idle = self.connect()
+            idle.sendall(b"GET /hello HTTP/1.1\r\nHost: test\r\n\r\n")
+            if read_response(idle)[0] == 200:
+                break
+            time.sleep(0.05)
+        else:
+            self.fail("No connection admitted")
+        sock = self.connect()
+        sock.sendall("POST /echo HTTP/1.1\r\nHost: test\r\n"
+                     "Content-Length: {}\r\n\r\n".format(BODY_SIZE).encode()
+                     + b"a" * BODY_SIZE)
+        status, headers, body = read_response(sock)
+        self.assertEqual(status, 503)
+        self.assertEqual(headers['retry-after'], '3')
+        self.assertEqual(body, b"503 Service Unavailable")
+        # Closed in order, not reset
+        self.assertEqual(sock.recv(1024), b"")
+
+
+class AsyncShedTest(ShedTest):
+
+    options = {"engine": "asyncio", "max_inflight": 1, "retry_after": 3}
+
+
+class QueueTimeTest(ServerTestCase):
+
+    options = {"engine": "pool", "pool_size": 1, "queue_size": 4,
+               "max_queue_time": 0.2, "status_path": "/status"}
+
+    def test_waiting_too_long_is_shed_and_counted(self):
+        for _ in range(50):
+            busy = self.connect()
+            busy.sendall(b"GET /hello HTTP/1.1\r\nHost: test\r\n\r\n")
+            if read_response(busy)[0] == 200:
+                break
+            time.sleep(0.05)
+        else:
+            self.fail("No connection served")
+        waiting = self.connect()
+        waiting.sendall(b"GET /hello HTTP/1.1\r\nHost: test\r\n\r\n")
+        time.sleep(0.4)
+        busy.close()
+        status, headers, _ = read_response(waiting)
+        self.assertEqual(status, 503)
+        self.assertEqual(headers['retry-after'], '1')
+        status, _, body = self.exchange(
+            b"GET /status HTTP/1.1\r\nHost: test\r\nConnection: close\r\n\r\n")
+        self.assertEqual(status, 200)
+        stats = json.loads(body)
+        self.assertEqual(stats["admission"]["shed"]["queue_time"], 1)
+        self.assertEqual(stats["pool"]["expired"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
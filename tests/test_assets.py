@@ -0,0 +1,137 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+The asset index maps URL paths to files with the folder rules of the
+server, is refreshed off the request path, skips precompressed files, and
+never hands out a stale size or validator.
+"""
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from support import ServerTestCase
+
+from daemon.assets import AssetIndex, content_location
+from daemon.cache import file_validators
+from daemon.response import SENDFILE_THRESHOLD, FileBody, Response
+
+
+class AssetIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.base = tempfile.mkdtemp(prefix="weaprous-assets-")
+        self.addCleanup(shutil.rmtree, self.base)
+        os.makedirs(os.path.join(self.base, "www"))
+        os.makedirs(os.path.join(self.base, "static"))
+
+    def write(self, rel, data):
+        path = os.path.join(self.base, rel)
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    def test_folder_rules(self):
+        self.assertEqual(content_location("a.html", "text/html"), ("www/", "text/html"))
+        self.assertEqual(content_location("a.css", "text/css"), ("static/", "text/css"))
+        self.assertEqual(content_location("a.ico", "image/x-icon"),
+                         ("static/images/", "image/x-icon"))
+        self.assertEqual(content_location("a.png", "image/png"), ("", "image/png"))
+        self.assertEqual(content_location("a.js", "application/javascript"),
+                         ("apps/", "application/javascript"))
+        self.assertIsNone(content_location("a.bin", "application/octet-stream"))
+
+    def test_lookup(self):
+        os.makedirs(os.path.join(self.base, "static", "images"))
+        os.makedirs(os.path.join(self.base, "static", "__pycache__"))
+        page = self.write("www/index.html", b"<p>index</p>")
+        self.write("static/images/logo.png", b"png")
+        self.write("static/__pycache__/x.css", b"")
+        self.write("static/page.html", b"")
+        self.write("www/data.bin", b"")
+        index = AssetIndex(self.base, refresh_interval=0)
+        asset = index.lookup("/index.html")
+        self.assertEqual((asset.url, asset.path, asset.content_type, asset.size),
+                         ("/index.html", os.path.abspath(page), "text/html", 12))
+        self.assertEqual((asset.etag, asset.last_modified), file_validators(os.stat(page)))
+        # Images are served from anywhere below the base directory
+        self.assertEqual(index.lookup("/static/images/logo.png").content_type, "image/png")
+        for url in ("/www/index.html", "/__pycache__/x.css", "/page.html", "/data.bin",
+                    "/missing.html"):
+            self.assertIsNone(index.lookup(url), url)
+        self.assertEqual(index.stats(), {"assets": 2, "scans": 1})
+
+    def test_scanned_once_without_refresh_interval(self):
+        self.write("www/a.html", b"a")
+        index = AssetIndex(self.base, refresh_interval=0)
+        for _ in range(3):
+            index.lookup("/a.html")
+            index.lookup("/b.html")
+        self.assertEqual(index.scans, 1)
+        os.unlink(os.path.join(self.base, "www", "a.html"))
+        self.assertEqual(index.refresh(), 0)
+        self.assertIsNone(index.lookup("/a.html"))
+
+    def test_precompressed_files_are_not_indexed(self):
+        self.write("static/chat.css", b"body {}")
+        self.write("static/chat.css.gz", b"\x1f\x8b")
+        index = AssetIndex(self.base, refresh_interval=0)
+        self.assertEqual(index.lookup("/chat.css").content_type, "text/css")
+        self.assertIsNone(index.lookup("/chat.css.gz"))
+
+    def test_stale_index_is_refreshed_in_background(self):
+        index = AssetIndex(self.base, refresh_interval=0.05)
+        self.assertIsNone(index.lookup("/new.html"))
+        self.write("www/new.html", b"<p>new</p>")
+        time.sleep(0.1)
+        limit = time.monotonic() + 5
+        while index.lookup("/new.html") is None and time.monotonic() < limit:
+            time.sleep(0.02)
+        self.assertIsNotNone(index.lookup("/new.html"))
+        self.assertGreaterEqual(index.scans, 2)
+
+    def test_sendfile_uses_current_size(self):
+        path = self.write("www/big.html", b"a" * SENDFILE_THRESHOLD)
+        asset = AssetIndex(self.base, refresh_interval=0).lookup("/big.html")
+        self.write("www/big.html", b"b" * (SENDFILE_THRESHOLD * 2 + 1))
+        resp = Response()
+        size, content = resp.build_content("/big.html", "", asset)
+        self.assertIsInstance(content, FileBody)
+        self.assertEqual(size, SENDFILE_THRESHOLD * 2 + 1)
+        self.assertEqual(content.size, size)
+        self.assertEqual(resp.headers['ETag'], file_validators(os.stat(path))[0])
+
+
+class AssetServingTest(ServerTestCase):
+
+    options = {"engine": "thread"}
+
+    def test_unknown_path(self):
+        status, headers, _ = self.exchange(
+            b"GET /no/such/page.html HTTP/1.1\r\nHost: test\r\nConnection: close\r\n\r\n")
+        self.assertEqual(status, 404)
+        self.assertEqual(headers['cache-control'], 'no-store')
+
+    def test_folder_is_not_part_of_the_url(self):
+        status = self.exchange(
+            b"GET /www/index.html HTTP/1.1\r\nHost: test\r\nConnection: close\r\n\r\n")[0]
+        self.assertEqual(status, 404)
+        status, headers, _ = self.exchange(
+            b"GET /css/chat.css HTTP/1.1\r\nHost: test\r\nConnection: close\r\n\r\n")
+        self.assertEqual((status, headers['content-type']), (200, 'text/css'))
+
+
+if __name__ == '__main__':
+    unittest.main()
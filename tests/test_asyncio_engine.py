@@ -0,0 +1,84 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+The asyncio engine holds idle connections without a thread each, and
+keeps serving while a blocking hook runs in its executor.
+"""
+
+import os
+import time
+import unittest
+
+from support import ServerTestCase, read_response
+
+#: Idle connections opened at once.
+IDLE_CONNECTIONS = 200
+
+
+def thread_count(pid):
+    """
+    :rtype int: number of threads of a process, from /proc.
+    """
+    with open("/proc/{}/status".format(pid)) as f:
+        for line in f:
+            if line.startswith("Threads:"):
+                return int(line.split()[1])
+
+
+class AsyncioEngineTest(ServerTestCase):
+
+    options = {"engine": "asyncio", "keepalive_timeout": 30}
+
+    def get(self, sock, path):
+        sock.sendall("GET {} HTTP/1.1\r\nHost: test\r\n\r\n".format(path).encode())
+        return read_response(sock)
+
+    @unittest.skipUnless(os.path.exists("/proc/self/status"), "needs /proc")
+    def test_idle_connections_hold_no_thread(self):
+        # Warm the executor first, it starts its threads on demand
+        sock = self.connect()
+        self.assertEqual(self.get(sock, "/hello")[0], 200)
+        before = thread_count(self.process.pid)
+        idle = [self.connect() for _ in range(IDLE_CONNECTIONS)]
+        for sock in idle:
+            self.assertEqual(self.get(sock, "/hello")[0], 200)
+        self.assertLess(thread_count(self.process.pid) - before, 10)
+
+    def test_blocking_hook_does_not_stall_the_loop(self):
+        slow = self.connect()
+        slow.sendall(b"GET /sleep/1.0 HTTP/1.1\r\nHost: test\r\n\r\n")
+        time.sleep(0.1)
+        started = time.monotonic()
+        self.assertEqual(self.get(self.connect(), "/hello")[0], 200)
+        self.assertLess(time.monotonic() - started, 0.5)
+        status, _, body = read_response(slow)
+        self.assertEqual(status, 200)
+        self.assertEqual(body, b'{"slept": 1.0}')
+
+    def test_coroutine_hook(self):
+        status, headers, body = self.get(self.connect(), "/hello-async")
+        self.assertEqual(status, 200)
+        self.assertEqual(headers['content-type'], 'application/json')
+        self.assertEqual(body, b'{"message": "Hello, async world!"}')
+
+    def test_static_and_hook_on_one_connection(self):
+        sock = self.connect()
+        status, headers, body = self.get(sock, "/index.html")
+        self.assertEqual(status, 200)
+        self.assertEqual(headers['content-type'], 'text/html')
+        self.assertEqual(headers['content-length'], str(len(body)))
+        self.assertEqual(self.get(sock, "/hello")[0], 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+A request whose framing cannot be parsed is answered with 400 Bad Request
+and the connection is closed.
+"""
+
+import unittest
+
+from support import ServerTestCase, read_response
+
+
+class BadRequestTest(ServerTestCase):
+
+    options = {"engine": "thread"}
+
+    def assert_bad_request(self, raw):
+        sock = self.connect()
+        sock.sendall(raw)
+        status, headers, body = read_response(sock)
+        self.assertEqual(status, 400)
+        self.assertEqual(headers['connection'], 'close')
+        self.assertEqual(body, b"400 Bad Request")
+        self.assertEqual(sock.recv(1024), b"")
+
+    def test_garbage_request_line(self):
+        self.assert_bad_request(b"GARBAGE\r\n\r\n")
+
+    def test_non_numeric_content_length(self):
+        self.assert_bad_request(b"POST /echo HTTP/1.1\r\nHost: test\r\n"
+                                b"Content-Length: abc\r\n\r\n")
+
+    def test_conflicting_content_length(self):
+        self.assert_bad_request(b"POST /echo HTTP/1.1\r\nHost: test\r\n"
+                                b"Content-Length: 3\r\nContent-Length: 4\r\n\r\nabcd")
+
+    def test_bad_chunk_size(self):
+        self.assert_bad_request(b"POST /echo HTTP/1.1\r\nHost: test\r\n"
+                                b"Transfer-Encoding: chunked\r\n\r\nzz\r\nabc\r\n0\r\n\r\n")
+
+    def test_after_pipelined_request(self):
+        # The response to the valid request comes first
+        sock = self.connect()
+        sock.sendall(b"GET /hello HTTP/1.1\r\nHost: test\r\n\r\nGARBAGE\r\n\r\n")
+        status, _, body = read_response(sock)
+        self.assertEqual(status, 200)
+        self.assertIn(b"Hello", body)
+        status, headers, _ = read_response(sock)
+        self.assertEqual(status, 400)
+        self.assertEqual(headers['connection'], 'close')
+
+
+class AsyncBadRequestTest(BadRequestTest):
+
+    options = {"engine": "asyncio"}
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,168 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+Request bodies are readable like files and spooled to disk when large;
+form bodies are split into their fields, uploads included, whatever
+pieces they arrive in.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from support import ServerTestCase
+
+from daemon.body import CHUNK_SIZE, MultipartParser, RequestBody, header_params
+
+BOUNDARY = "----weaprous42"
+
+
+def multipart(*fields):
+    """Encode ``(name, filename, data)`` fields as a form body."""
+    body = b""
+    for name, filename, data in fields:
+        disposition = 'form-data; name="{}"'.format(name)
+        if filename is not None:
+            disposition += '; filename="{}"\r\nContent-Type: application/octet-stream'.format(filename)
+        body += "--{}\r\nContent-Disposition: {}\r\n\r\n".format(BOUNDARY, disposition).encode()
+        body += data + b"\r\n"
+    return body + "--{}--\r\n".format(BOUNDARY).encode()
+
+
+class HeaderParamsTest(unittest.TestCase):
+
+    def test_params(self):
+        self.assertEqual(header_params('Form-Data; name="a \\"b\\""; filename=c.txt'),
+                         ("form-data", {"name": 'a "b"', "filename": "c.txt"}))
+        self.assertEqual(header_params("text/plain"), ("text/plain", {}))
+
+
+class RequestBodyTest(unittest.TestCase):
+
+    def test_read_in_memory(self):
+        body = RequestBody(b"0123456789")
+        self.assertTrue(body.in_memory)
+        self.assertEqual(body.read(4), b"0123")
+        self.assertEqual(body.tell(), 4)
+        self.assertEqual(body.read(), b"456789")
+        self.assertEqual(body.read(1), b"")
+        body.seek(8)
+        self.assertEqual(body.read(100), b"89")
+
+    def test_spooled_once_over_the_threshold(self):
+        body = RequestBody(spool_threshold=10)
+        body.write(b"a" * 10)
+        self.assertTrue(body.in_memory)
+        body.write(b"b")
+        self.assertFalse(body.in_memory)
+        body.write(b"c" * 5)
+        self.assertEqual(len(body), 16)
+        self.assertEqual(body.getvalue(), b"a" * 10 + b"b" + b"c" * 5)
+        self.assertEqual(body.read(12), b"a" * 10 + b"bc")
+        body.close()
+
+    def test_iteration_and_save(self):
+        data = bytes(i % 256 for i in range(CHUNK_SIZE * 2 + 7))
+        base = tempfile.mkdtemp(prefix="weaprous-body-")
+        self.addCleanup(shutil.rmtree, base)
+        for threshold in (len(data), 0):
+            body = RequestBody(data, spool_threshold=threshold)
+            chunks = list(body)
+            self.assertEqual([len(chunk) for chunk in chunks], [CHUNK_SIZE, CHUNK_SIZE, 7])
+            self.assertEqual(b"".join(chunks), data)
+            path = os.path.join(base, "saved")
+            body.save(path)
+            with open(path, "rb") as f:
+                self.assertEqual(f.read(), data)
+
+    def test_urlencoded_form(self):
+        body = RequestBody(b"a=1&b=x+y&a=2&empty=",
+                           content_type="application/x-www-form-urlencoded")
+        form = body.form()
+        self.assertEqual({name: part.value for name, part in form.items()},
+                         {"a": "2", "b": "x y", "empty": ""})
+        self.assertEqual([part.value for part in body.parts()], ["1", "x y", "2", ""])
+
+    def test_not_a_form(self):
+        with self.assertRaises(ValueError):
+            RequestBody(b"{}", content_type="application/json").parts()
+        with self.assertRaises(ValueError):
+            RequestBody(b"", content_type="multipart/form-data").parts()
+
+
+class MultipartParserTest(unittest.TestCase):
+
+    FILE = bytes(i % 256 for i in range(3000)) + b"\r\n--" + BOUNDARY[:-1].encode()
+
+    def parse(self, body, piece, spool_threshold=1024):
+        parser = MultipartParser(BOUNDARY, spool_threshold)
+        for pos in range(0, len(body), piece):
+            parser.feed(body[pos:pos + piece])
+        return parser.close()
+
+    def test_fields_and_upload(self):
+        body = multipart(("title", None, b"holiday"), ("photo", "a.png", self.FILE),
+                         ("empty", None, b""))
+        for piece in (1, 7, 100, len(body)):
+            parts = self.parse(body, piece)
+            self.assertEqual([part.name for part in parts], ["title", "photo", "empty"])
+            self.assertEqual(parts[0].value, "holiday")
+            self.assertIsNone(parts[0].filename)
+            photo = parts[1]
+            self.assertEqual((photo.filename, photo.content_type),
+                             ("a.png", "application/octet-stream"))
+            self.assertEqual(photo.body.getvalue(), self.FILE)
+            self.assertFalse(photo.body.in_memory)
+            self.assertEqual(parts[2].value, "")
+
+    def test_preamble_and_epilogue_are_ignored(self):
+        body = b"preamble\r\n" + multipart(("a", None, b"1")) + b"epilogue"
+        self.assertEqual(self.parse(body, 5)[0].value, "1")
+
+    def test_malformed(self):
+        body = multipart(("a", None, b"1"))
+        with self.assertRaises(ValueError):
+            self.parse(body[:-10], 10)
+        with self.assertRaises(ValueError):
+            self.parse(body.replace(b'form-data; name="a"', b'attachment'), 10)
+        with self.assertRaises(ValueError):
+            self.parse(body.replace(BOUNDARY.encode() + b"\r\n", BOUNDARY.encode() + b"x\r\n", 1), 10)
+
+
+class UploadTest(ServerTestCase):
+
+    options = {"engine": "thread", "spool_threshold": 1024}
+
+    def test_upload(self):
+        data = bytes(i % 256 for i in range(50000))
+        body = multipart(("title", None, b"holiday"), ("photo", "a.png", data))
+        status, _, answer = self.exchange(
+            "POST /upload HTTP/1.1\r\nHost: test\r\nConnection: close\r\n"
+            "Content-Type: multipart/form-data; boundary={}\r\n"
+            "Content-Length: {}\r\n\r\n".format(BOUNDARY, len(body)).encode() + body)
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(answer), {
+            "title": {"filename": None, "size": 7, "spooled": False},
+            "photo": {"filename": "a.png", "size": len(data), "spooled": True},
+        })
+
+
+class AsyncUploadTest(UploadTest):
+
+    options = {"engine": "asyncio", "spool_threshold": 1024}
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+Request bodies over ``max_body_size`` are refused with 413, and spooled
+bodies are released with their request.
+"""
+
+import json
+import unittest
+
+from support import ServerTestCase
+
+from daemon.body import RequestBody
+from daemon.request import Request
+
+#: ``max_body_size`` of the test server.
+LIMIT = 1000
+
+
+class BodyLimitTest(ServerTestCase):
+
+    options = {"engine": "thread", "max_body_size": LIMIT}
+
+    def post(self, headers, body):
+        return self.exchange("POST /echo HTTP/1.1\r\nHost: test\r\n{}\r\n".format(
+            headers).encode() + body)
+
+    def test_body_within_limit(self):
+        status, _, body = self.post("Content-Length: {}\r\n".format(LIMIT), b"a" * LIMIT)
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(body), {"size": LIMIT})
+
+    def test_content_length_over_limit(self):
+        # Refused from the header alone, nothing of the body is sent
+        status, headers, body = self.post("Content-Length: {}\r\n".format(LIMIT + 1), b"")
+        self.assertEqual(status, 413)
+        self.assertEqual(headers['connection'], 'close')
+        self.assertEqual(body, b"413 Payload Too Large")
+
+    def test_chunked_body_over_limit(self):
+        chunk = b"a" * 600
+        status, headers, _ = self.post(
+            "Transfer-Encoding: chunked\r\n",
+            b"258\r\n" + chunk + b"\r\n258\r\n" + chunk + b"\r\n0\r\n\r\n")
+        self.assertEqual(status, 413)
+        self.assertEqual(headers['connection'], 'close')
+
+
+class AsyncBodyLimitTest(BodyLimitTest):
+
+    options = {"engine": "asyncio", "max_body_size": LIMIT}
+
+
+class RequestResetTest(unittest.TestCase):
+
+    def test_reset_releases_spooled_body(self):
+        req = Request()
+        body = RequestBody(b"a" * 10, spool_threshold=0)
+        self.assertFalse(body.in_memory)
+        req.raw_body = body
+        req.stream
+        req.reset()
+        self.assertTrue(body.in_memory)
+        self.assertEqual(req.raw_body, b"")
+
+
+if __name__ == '__main__':
+    unittest.main()
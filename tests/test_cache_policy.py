@@ -0,0 +1,187 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+The rules of the cache policy apply to the requested path, before the
+login flow rewrites it to the page served, and only to the objects
+actually served: error pages are never stored, and pages behind the auth
+cookie are kept out of shared caches.
+"""
+
+import os
+import tempfile
+import unittest
+
+from support import ROOT, ServerTestCase
+
+from daemon.cachepolicy import CachePolicy, cache_directives, private_directives
+from daemon.httpadapter import HttpAdapter
+from daemon.request import Request
+from daemon.weaprous import WeApRous
+
+
+class CachePolicyTest(unittest.TestCase):
+
+    def test_directives(self):
+        self.assertEqual(cache_directives(max_age=60, public=True), "public, max-age=60")
+        self.assertEqual(cache_directives(no_store=True), "no-store")
+        with self.assertRaises(ValueError):
+            cache_directives()
+
+    def test_exact_rule_wins_over_longest_prefix(self):
+        policy = CachePolicy()
+        policy.add("/static/", "max-age=60")
+        policy.add("/static/images/", max_age=3600, immutable=True)
+        policy.add("/static/images/live.png", no_store=True)
+        self.assertEqual(policy.lookup("/static/chat.js"), "max-age=60")
+        self.assertEqual(policy.lookup("/static/images/a.png"), "max-age=3600, immutable")
+        self.assertEqual(policy.lookup("/static/images/live.png"), "no-store")
+        self.assertEqual(policy.lookup("/index.html"), "no-cache")
+
+    def test_rule_added_after_lookup(self):
+        policy = CachePolicy(default="no-store")
+        self.assertEqual(policy.lookup("/css/chat.css"), "no-store")
+        policy.add("/css/", "max-age=10")
+        self.assertEqual(policy.lookup("/css/chat.css"), "max-age=10")
+
+    def test_load(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".conf", delete=False) as f:
+            f.write('# comment\npath "/api/" {\n    cache_control private,\n  max-age=5;\n}\n')
+        self.addCleanup(os.unlink, f.name)
+        policy = CachePolicy()
+        self.assertEqual(policy.load(f.name), 1)
+        self.assertEqual(policy.rules(), {"/api/": "private, max-age=5"})
+
+    def test_load_without_directive(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".conf", delete=False) as f:
+            f.write('path "/api/" { }\n')
+        self.addCleanup(os.unlink, f.name)
+        with self.assertRaises(ValueError):
+            CachePolicy().load(f.name)
+
+    def test_private_directives(self):
+        self.assertEqual(private_directives("public, max-age=3600"), "private, max-age=3600")
+        self.assertEqual(private_directives("no-cache"), "no-cache")
+        self.assertEqual(private_directives("public, private"), "private")
+
+
+class CookieGateTest(unittest.TestCase):
+    """The backend on port 9000 serves its pages to logged in clients only."""
+
+    def setUp(self):
+        policy = CachePolicy()
+        policy.load(os.path.join(ROOT, "config", "cache.conf"))
+        self.adapter = HttpAdapter("127.0.0.1", 9000, None, None, {}, cache_policy=policy)
+
+    def serve(self, path, cookie=None):
+        raw = "GET {} HTTP/1.1\r\nHost: test\r\n".format(path)
+        if cookie:
+            raw += "Cookie: {}\r\n".format(cookie)
+        req = Request()
+        req.prepare(raw + "\r\n")
+        self.adapter.response.reset()
+        resp = self.adapter.build_static_response(req, self.adapter.response)
+        header = resp if isinstance(resp, bytes) else resp.header
+        lines = header.split(b"\r\n\r\n")[0].decode('latin-1').split("\r\n")
+        headers = dict(line.split(": ", 1) for line in lines[1:])
+        return int(lines[0].split()[1]), headers
+
+    def test_unauthorized_is_not_stored(self):
+        for path in ("/static/images/welcome.png", "/css/chat.css", "/index.html"):
+            status, headers = self.serve(path)
+            self.assertEqual(status, 401)
+            self.assertEqual(headers['Cache-Control'], 'no-store')
+
+    def test_gated_object_is_private(self):
+        status, headers = self.serve("/static/images/welcome.png", cookie="auth=true")
+        self.assertEqual(status, 200)
+        self.assertEqual(headers['Cache-Control'], 'private, max-age=31536000, immutable')
+        status, headers = self.serve("/css/chat.css", cookie="auth=true")
+        self.assertEqual(status, 200)
+        self.assertEqual(headers['Cache-Control'], 'private, max-age=3600')
+
+    def test_public_page_keeps_its_rule(self):
+        status, headers = self.serve("/login.html")
+        self.assertEqual(status, 200)
+        self.assertEqual(headers['Cache-Control'], 'no-cache')
+
+    def test_not_found_is_not_stored(self):
+        status, headers = self.serve("/missing.html", cookie="auth=true")
+        self.assertEqual(status, 404)
+        self.assertEqual(headers['Cache-Control'], 'no-store')
+
+
+class RouteCacheControlTest(unittest.TestCase):
+
+    def test_route_and_prefix_rules(self):
+        app = WeApRous()
+        app.cache_control("/static/", max_age=600)
+
+        @app.route('/feed/<int:page>', cache_control='private, max-age=5')
+        def feed(headers, body, page):
+            return []
+        self.assertEqual(app.cache_policy.lookup("/feed/<int:page>"), "private, max-age=5")
+        self.assertEqual(app.cache_policy.lookup("/static/a.css"), "max-age=600")
+        self.assertEqual(app.cache_policy.lookup("/hello"), "no-cache")
+
+
+class HookCacheControlTest(ServerTestCase):
+
+    def get(self, path):
+        return self.exchange("GET {} HTTP/1.1\r\nHost: test\r\nConnection: close\r\n\r\n"
+                             .format(path).encode())
+
+    def test_route_rule_applies_to_every_match(self):
+        for path in ("/numbers/1", "/numbers/20"):
+            status, headers, _ = self.get(path)
+            self.assertEqual(status, 200)
+            self.assertEqual(headers['cache-control'], 'public, max-age=60')
+
+    def test_default_rule(self):
+        self.assertEqual(self.get("/hello")[1]['cache-control'], 'no-cache')
+
+
+class ShippedCacheConfigTest(ServerTestCase):
+
+    options = {"cache_config": "config/cache.conf"}
+
+    def login(self, body):
+        return self.exchange(
+            "POST /login HTTP/1.1\r\nHost: test\r\nConnection: close\r\n"
+            "Content-Type: application/x-www-form-urlencoded\r\n"
+            "Content-Length: {}\r\n\r\n{}".format(len(body), body).encode())
+
+    def test_failed_login_is_not_stored(self):
+        status, headers, _ = self.login("username=nobody&password=wrong")
+        self.assertEqual(status, 401)
+        self.assertEqual(headers['cache-control'], 'no-store')
+
+    def test_successful_login_is_not_stored(self):
+        status, headers, _ = self.login("username=admin&password=password")
+        self.assertEqual(status, 200)
+        self.assertEqual(headers['cache-control'], 'no-store')
+
+    def test_rewritten_page_keeps_its_own_rule(self):
+        status, headers, _ = self.exchange(
+            b"GET /index.html HTTP/1.1\r\nHost: test\r\nConnection: close\r\n\r\n")
+        self.assertEqual(status, 200)
+        self.assertEqual(headers['cache-control'], 'no-cache')
+
+    def test_prefix_rule(self):
+        status, headers, _ = self.exchange(
+            b"GET /static/images/welcome.png HTTP/1.1\r\nHost: test\r\nConnection: close\r\n\r\n")
+        self.assertEqual(status, 200)
+        self.assertEqual(headers['cache-control'], 'public, max-age=31536000, immutable')
+
+
+if __name__ == '__main__':
+    unittest.main()
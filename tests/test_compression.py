@@ -0,0 +1,177 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+Accept-Encoding negotiation: text bodies are sent gzip or deflate coded
+to clients accepting it, with ``Vary`` and a variant ``ETag``; images,
+small bodies and range requests are sent as is.
+"""
+
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+import zlib
+
+from support import ROOT, ServerTestCase, read_response
+
+from daemon.compression import (Compressor, is_compressible, parse_accept_encoding,
+                                variant_etag)
+
+DECODERS = {"gzip": gzip.decompress, "deflate": zlib.decompress}
+
+
+class CompressorTest(unittest.TestCase):
+
+    def test_parse_accept_encoding(self):
+        self.assertEqual(parse_accept_encoding("gzip, deflate;q=0.5, BR;q=x"),
+                         {"gzip": 1.0, "deflate": 0.5, "br": 0.0})
+
+    def test_negotiate(self):
+        compressor = Compressor()
+        self.assertEqual(compressor.negotiate("gzip, deflate"), "gzip")
+        self.assertEqual(compressor.negotiate("gzip;q=0.2, deflate"), "deflate")
+        self.assertEqual(compressor.negotiate("*"), "gzip")
+        self.assertEqual(compressor.negotiate("*, gzip;q=0"), "deflate")
+        self.assertIsNone(compressor.negotiate("br"))
+        self.assertIsNone(compressor.negotiate("identity, gzip;q=0"))
+        self.assertIsNone(compressor.negotiate(None))
+        self.assertIsNone(Compressor(level=0).negotiate("gzip"))
+
+    def test_wants(self):
+        compressor = Compressor(min_size=100)
+        self.assertTrue(compressor.wants("application/json", 100))
+        self.assertFalse(compressor.wants("application/json", 99))
+        self.assertFalse(compressor.wants("image/png", 1000))
+        self.assertFalse(Compressor(level=0).wants("text/html", 1000))
+        self.assertTrue(is_compressible("text/css"))
+
+    def test_compress(self):
+        data = b"hello " * 1000
+        compressor = Compressor(level=9)
+        for encoding, decode in DECODERS.items():
+            encoded = compressor.compress(data, encoding)
+            self.assertLess(len(encoded), len(data) // 10)
+            self.assertEqual(decode(encoded), data)
+        # No timestamp in the gzip header: the variant ETag stays valid
+        first = compressor.compress(data, "gzip")
+        time.sleep(1.1)
+        self.assertEqual(compressor.compress(data, "gzip"), first)
+        self.assertEqual(compressor.variant_name("gzip"), "gzip:9")
+
+    def test_precompressed_file(self):
+        base = tempfile.mkdtemp(prefix="weaprous-gzip-")
+        self.addCleanup(shutil.rmtree, base)
+        path = os.path.join(base, "app.js")
+        with open(path, "wb") as f:
+            f.write(b"var a;")
+        with open(path + ".gz", "wb") as f:
+            f.write(b"precompressed")
+        compressor = Compressor()
+        self.assertEqual(compressor.compress_file(path, b"var a;", "gzip"), b"precompressed")
+        self.assertEqual(zlib.decompress(compressor.compress_file(path, b"var a;", "deflate")),
+                         b"var a;")
+        # A .gz older than the file is stale
+        stat = os.stat(path)
+        os.utime(path + ".gz", ns=(stat.st_atime_ns, stat.st_mtime_ns - 10 ** 9))
+        self.assertEqual(gzip.decompress(compressor.compress_file(path, b"var a;", "gzip")),
+                         b"var a;")
+
+    def test_variant_etag(self):
+        self.assertEqual(variant_etag('"a-b"', "gzip"), '"a-b-gzip"')
+
+
+class CompressionTest(ServerTestCase):
+
+    options = {"engine": "thread"}
+
+    def get(self, path, **fields):
+        raw = "GET {} HTTP/1.1\r\nHost: test\r\n".format(path)
+        for name, value in fields.items():
+            raw += "{}: {}\r\n".format(name.replace("_", "-"), value)
+        sock = self.connect()
+        sock.sendall((raw + "\r\n").encode())
+        return read_response(sock)
+
+    def test_static_text(self):
+        with open(os.path.join(ROOT, "static", "css", "chat.css"), "rb") as f:
+            raw = f.read()
+        _, plain, body = self.get("/css/chat.css")
+        self.assertEqual(body, raw)
+        self.assertEqual(plain['vary'], 'Accept-Encoding')
+        self.assertNotIn('content-encoding', plain)
+        for encoding, decode in DECODERS.items():
+            status, headers, body = self.get("/css/chat.css", Accept_Encoding=encoding)
+            self.assertEqual(status, 200)
+            self.assertEqual(headers['content-encoding'], encoding)
+            self.assertEqual(headers['vary'], 'Accept-Encoding')
+            self.assertEqual(headers['etag'], variant_etag(plain['etag'], encoding))
+            self.assertEqual(headers['content-length'], str(len(body)))
+            self.assertEqual(decode(body), raw)
+
+    def test_variant_revalidation(self):
+        etag = self.get("/css/chat.css", Accept_Encoding="gzip")[1]['etag']
+        sock = self.connect()
+        sock.sendall("GET /css/chat.css HTTP/1.1\r\nHost: test\r\nAccept-Encoding: gzip\r\n"
+                     "If-None-Match: {}\r\n\r\n".format(etag).encode())
+        self.assertEqual(read_response(sock, head=True)[0], 304)
+        # The raw tag does not match the gzip variant
+        raw_etag = self.get("/css/chat.css")[1]['etag']
+        status = self.get("/css/chat.css", Accept_Encoding="gzip", If_None_Match=raw_etag)[0]
+        self.assertEqual(status, 200)
+
+    def test_image_is_not_compressed(self):
+        _, headers, _ = self.get("/static/images/welcome.png", Accept_Encoding="gzip")
+        self.assertNotIn('content-encoding', headers)
+
+    def test_range_is_not_compressed(self):
+        status, headers, body = self.get("/css/chat.css", Accept_Encoding="gzip", Range="bytes=0-9")
+        self.assertEqual(status, 206)
+        self.assertNotIn('content-encoding', headers)
+        self.assertEqual(len(body), 10)
+
+    def test_hook_json(self):
+        status, headers, body = self.get("/numbers/1000", Accept_Encoding="gzip")
+        self.assertEqual(status, 200)
+        self.assertEqual(headers['content-encoding'], 'gzip')
+        self.assertEqual(headers['vary'], 'Accept-Encoding')
+        self.assertEqual(json.loads(gzip.decompress(body)), list(range(1000)))
+
+    def test_small_hook_body(self):
+        _, headers, body = self.get("/hello", Accept_Encoding="gzip")
+        self.assertNotIn('content-encoding', headers)
+        self.assertIn(b"Hello", body)
+
+
+class AsyncCompressionTest(CompressionTest):
+
+    options = {"engine": "asyncio"}
+
+
+class DisabledCompressionTest(ServerTestCase):
+
+    options = {"compression_level": 0}
+
+    def test_identity(self):
+        for path in ("/css/chat.css", "/numbers/1000"):
+            status, headers, _ = self.exchange(
+                "GET {} HTTP/1.1\r\nHost: test\r\nAccept-Encoding: gzip\r\n"
+                "Connection: close\r\n\r\n".format(path).encode())
+            self.assertEqual(status, 200)
+            self.assertNotIn('content-encoding', headers)
+
+
+if __name__ == '__main__':
+    unittest.main()
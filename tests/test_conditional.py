@@ -0,0 +1,110 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+Static objects carry ETag and Last-Modified validators, and a conditional
+GET of a current copy is answered with a bodyless 304.
+"""
+
+import email.utils
+import unittest
+
+from support import ServerTestCase, read_response
+
+from daemon.request import Request
+from daemon.response import Response
+
+ETAG = '"1f-5f5e100"'
+LAST_MODIFIED = "Sun, 06 Nov 1994 08:49:37 GMT"
+
+
+class IsNotModifiedTest(unittest.TestCase):
+
+    def check(self, method="GET", **conditions):
+        raw = "{} /index.html HTTP/1.1\r\nHost: test\r\n".format(method)
+        for name, value in conditions.items():
+            raw += "{}: {}\r\n".format(name.replace("_", "-"), value)
+        req = Request()
+        req.prepare(raw + "\r\n")
+        resp = Response()
+        resp.headers['ETag'] = ETAG
+        resp.headers['Last-Modified'] = LAST_MODIFIED
+        return resp.is_not_modified(req)
+
+    def test_if_none_match(self):
+        self.assertTrue(self.check(If_None_Match=ETAG))
+        self.assertTrue(self.check(If_None_Match='"other", ' + ETAG))
+        self.assertTrue(self.check(If_None_Match="W/" + ETAG))
+        self.assertTrue(self.check(If_None_Match="*"))
+        self.assertFalse(self.check(If_None_Match='"other"'))
+
+    def test_if_modified_since(self):
+        self.assertTrue(self.check(If_Modified_Since=LAST_MODIFIED))
+        self.assertTrue(self.check(If_Modified_Since="Mon, 07 Nov 1994 08:49:37 GMT"))
+        self.assertFalse(self.check(If_Modified_Since="Sat, 05 Nov 1994 08:49:37 GMT"))
+        self.assertFalse(self.check(If_Modified_Since="yesterday"))
+
+    def test_if_none_match_takes_precedence(self):
+        self.assertFalse(self.check(If_None_Match='"other"', If_Modified_Since=LAST_MODIFIED))
+
+    def test_unconditional_or_not_get(self):
+        self.assertFalse(self.check())
+        self.assertFalse(self.check("POST", If_None_Match=ETAG))
+        self.assertTrue(self.check("HEAD", If_None_Match=ETAG))
+
+
+class ConditionalGetTest(ServerTestCase):
+
+    options = {"engine": "thread"}
+
+    def get(self, path, **conditions):
+        raw = "GET {} HTTP/1.1\r\nHost: test\r\n".format(path)
+        for name, value in conditions.items():
+            raw += "{}: {}\r\n".format(name.replace("_", "-"), value)
+        sock = self.connect()
+        sock.sendall((raw + "\r\n").encode())
+        status, headers, _ = read_response(sock, head=True)
+        if status == 304:
+            # The next response on the connection must parse: no body followed
+            sock.sendall(b"GET /hello HTTP/1.1\r\nHost: test\r\n\r\n")
+            self.assertIn(b"Hello", read_response(sock)[2])
+        return status, headers
+
+    def assert_validated(self, path):
+        status, headers = self.get(path)
+        self.assertEqual(status, 200)
+        etag, last_modified = headers['etag'], headers['last-modified']
+        email.utils.parsedate_to_datetime(last_modified)
+
+        status, headers = self.get(path, If_None_Match=etag)
+        self.assertEqual(status, 304)
+        self.assertEqual(headers['etag'], etag)
+        self.assertIn('cache-control', headers)
+        self.assertNotIn('content-length', headers)
+
+        self.assertEqual(self.get(path, If_Modified_Since=last_modified)[0], 304)
+        self.assertEqual(self.get(path, If_None_Match='"stale"')[0], 200)
+
+    def test_cached_page(self):
+        self.assert_validated("/index.html")
+
+    def test_sendfile_image(self):
+        self.assert_validated("/static/images/welcome.png")
+
+
+class AsyncConditionalGetTest(ConditionalGetTest):
+
+    options = {"engine": "asyncio"}
+
+
+if __name__ == '__main__':
+    unittest.main()
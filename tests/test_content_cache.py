@@ -0,0 +1,143 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+The static content cache serves files from memory within its byte budget,
+evicts the least recently used ones and reloads files that changed.
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+import support  # noqa: F401, puts the daemon package on the path
+
+from daemon.cache import ContentCache
+
+
+class ContentCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.base = tempfile.mkdtemp(prefix="weaprous-cache-")
+        self.addCleanup(shutil.rmtree, self.base)
+
+    def write(self, name, data):
+        path = os.path.join(self.base, name)
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    def test_hit_after_miss(self):
+        path = self.write("a.html", b"<p>a</p>")
+        cache = ContentCache()
+        first = cache.get(path)
+        self.assertIs(cache.get(path), first)
+        self.assertEqual(first.content, b"<p>a</p>")
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["bytes"]), (1, 1, 8))
+
+    def test_keys_are_normalized(self):
+        path = self.write("a.html", b"a")
+        cache = ContentCache()
+        entry = cache.get(path)
+        self.assertIs(cache.get(os.path.join(self.base, ".", "a.html")), entry)
+
+    def test_least_recently_used_is_evicted(self):
+        paths = [self.write(name, b"x" * 100) for name in ("a", "b", "c")]
+        cache = ContentCache(max_bytes=250)
+        cache.get(paths[0])
+        cache.get(paths[1])
+        # a becomes the most recently used, b is evicted for c
+        cache.get(paths[0])
+        cache.get(paths[2])
+        self.assertIsNotNone(cache.peek(paths[0]))
+        self.assertIsNone(cache.peek(paths[1]))
+        self.assertIsNotNone(cache.peek(paths[2]))
+        stats = cache.stats()
+        self.assertEqual((stats["entries"], stats["bytes"], stats["evictions"]), (2, 200, 1))
+
+    def test_large_file_is_not_kept(self):
+        path = self.write("big", b"x" * 2000)
+        cache = ContentCache(max_entry_size=1000)
+        self.assertEqual(len(cache.get(path).content), 2000)
+        self.assertEqual(cache.stats()["entries"], 0)
+
+    def test_changed_file_is_reloaded(self):
+        path = self.write("a.html", b"old")
+        cache = ContentCache(check_interval=0)
+        old = cache.get(path)
+        self.assertIs(cache.get(path), old)
+        self.write("a.html", b"newer")
+        new = cache.get(path)
+        self.assertEqual(new.content, b"newer")
+        self.assertNotEqual(new.etag, old.etag)
+        self.assertEqual(cache.stats()["bytes"], 5)
+
+    def test_entry_is_trusted_within_the_check_interval(self):
+        path = self.write("a.html", b"old")
+        cache = ContentCache(check_interval=60)
+        cache.get(path)
+        self.write("a.html", b"newer")
+        self.assertEqual(cache.get(path).content, b"old")
+        cache.invalidate(path)
+        self.assertEqual(cache.get(path).content, b"newer")
+
+    def test_removed_file(self):
+        path = self.write("a.html", b"a")
+        cache = ContentCache(check_interval=0)
+        cache.get(path)
+        os.unlink(path)
+        with self.assertRaises(FileNotFoundError):
+            cache.get(path)
+        self.assertEqual(cache.stats()["entries"], 0)
+
+    def test_variant_is_built_once(self):
+        path = self.write("a.css", b"body {}")
+        cache = ContentCache()
+        entry = cache.get(path)
+        calls = []
+
+        def build(content):
+            calls.append(content)
+            return content.upper()
+        self.assertEqual(cache.variant(entry, "upper", build), b"BODY {}")
+        self.assertEqual(cache.variant(entry, "upper", build), b"BODY {}")
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(cache.stats()["bytes"], 14)
+
+    def test_concurrent_gets(self):
+        paths = [self.write("f{}".format(i), bytes([i]) * 50) for i in range(20)]
+        cache = ContentCache(max_bytes=500, check_interval=0)
+        errors = []
+
+        def work():
+            try:
+                for _ in range(50):
+                    for i, path in enumerate(paths):
+                        self.assertEqual(cache.get(path).content, bytes([i]) * 50)
+            except Exception as e:
+                errors.append(e)
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        stats = cache.stats()
+        self.assertLessEqual(stats["bytes"], 500)
+        self.assertEqual(stats["bytes"], stats["entries"] * 50)
+
+
+if __name__ == '__main__':
+    unittest.main()
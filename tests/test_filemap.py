@@ -0,0 +1,133 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+In ``mmap`` file mode large static files are mapped once per process and
+served as slices of the shared mapping.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from support import ROOT, ServerTestCase, read_response
+
+from daemon.assets import AssetIndex
+from daemon.cache import file_validators
+from daemon.filemap import FILE_MAP, FileMap
+from daemon.response import SENDFILE_THRESHOLD, Response
+
+
+class FileMapTest(unittest.TestCase):
+
+    def setUp(self):
+        self.base = tempfile.mkdtemp(prefix="weaprous-filemap-")
+        self.addCleanup(shutil.rmtree, self.base)
+
+    def write(self, name, data):
+        path = os.path.join(self.base, name)
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    def test_mapping_is_shared(self):
+        path = self.write("a.bin", b"0123456789")
+        files = FileMap()
+        mapped = files.get(path)
+        self.assertIs(files.get(os.path.join(self.base, ".", "a.bin")), mapped)
+        self.assertEqual(bytes(mapped.view[2:5]), b"234")
+        self.assertTrue(mapped.view.readonly)
+        self.assertEqual((mapped.etag, mapped.last_modified), file_validators(os.stat(path)))
+        stats = files.stats()
+        self.assertEqual((stats["files"], stats["bytes"], stats["hits"], stats["misses"]),
+                         (1, 10, 1, 1))
+
+    def test_replaced_file_is_mapped_again(self):
+        path = self.write("a.bin", b"old")
+        files = FileMap(check_interval=0)
+        old = files.get(path)
+        replacement = self.write("b.bin", b"newer")
+        os.replace(replacement, path)
+        new = files.get(path)
+        self.assertIsNot(new, old)
+        self.assertEqual(bytes(new.view), b"newer")
+        # A response still writing the old mapping keeps it usable
+        self.assertEqual(bytes(old.view), b"old")
+
+    def test_least_recently_used_is_dropped(self):
+        paths = [self.write(name, b"x") for name in ("a", "b", "c")]
+        files = FileMap(max_files=2)
+        first = files.get(paths[0])
+        files.get(paths[1])
+        files.get(paths[0])
+        files.get(paths[2])
+        self.assertIs(files.get(paths[0]), first)
+        self.assertEqual(files.stats()["files"], 2)
+        self.assertEqual(files.stats()["misses"], 3)
+
+    def test_removed_file(self):
+        path = self.write("a.bin", b"a")
+        files = FileMap(check_interval=0)
+        files.get(path)
+        os.unlink(path)
+        with self.assertRaises(FileNotFoundError):
+            files.get(path)
+        self.assertEqual(files.stats()["files"], 0)
+
+
+class MappedContentTest(unittest.TestCase):
+
+    def setUp(self):
+        self.base = tempfile.mkdtemp(prefix="weaprous-filemap-")
+        self.addCleanup(shutil.rmtree, self.base)
+        os.makedirs(os.path.join(self.base, "www"))
+
+    def test_large_file_is_a_view_of_the_mapping(self):
+        path = os.path.join(self.base, "www", "big.html")
+        with open(path, "wb") as f:
+            f.write(b"a" * SENDFILE_THRESHOLD)
+        self.addCleanup(FILE_MAP.invalidate, path)
+        asset = AssetIndex(self.base, refresh_interval=0).lookup("/big.html")
+        resp = Response()
+        resp.file_mode = "mmap"
+        size, content = resp.build_content("/big.html", "", asset)
+        self.assertEqual(size, SENDFILE_THRESHOLD)
+        self.assertIsInstance(content, memoryview)
+        self.assertIs(content, FILE_MAP.get(path).view)
+        self.assertEqual(resp.headers['ETag'], FILE_MAP.get(path).etag)
+
+
+class MappedServingTest(ServerTestCase):
+
+    options = {"engine": "thread", "file_mode": "mmap"}
+
+    def test_large_image(self):
+        with open(os.path.join(ROOT, "static", "images", "welcome.png"), "rb") as f:
+            expected = f.read()
+        sock = self.connect()
+        request = b"GET /static/images/welcome.png HTTP/1.1\r\nHost: test\r\n\r\n"
+        sock.sendall(request * 2)
+        for _ in range(2):
+            status, headers, body = read_response(sock)
+            self.assertEqual(status, 200)
+            self.assertEqual(headers['content-length'], str(len(expected)))
+            self.assertEqual(body, expected)
+
+
+class AsyncMappedServingTest(MappedServingTest):
+
+    options = {"engine": "asyncio", "file_mode": "mmap"}
+
+
+if __name__ == '__main__':
+    unittest.main()
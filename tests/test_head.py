@@ -0,0 +1,88 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+A HEAD request gets the header fields of the GET response, Content-Length
+included, and no body; GET routes answer HEAD.
+"""
+
+import unittest
+
+from support import ServerTestCase, read_response
+
+from daemon.router import Router
+
+
+class HeadTest(ServerTestCase):
+
+    options = {"engine": "thread"}
+
+    def assert_head_matches_get(self, path):
+        # The GET right after the HEAD must parse: no body was sent
+        sock = self.connect()
+        sock.sendall("HEAD {0} HTTP/1.1\r\nHost: test\r\n\r\n"
+                     "GET {0} HTTP/1.1\r\nHost: test\r\n\r\n".format(path).encode())
+        status, headers, _ = read_response(sock, head=True)
+        get_status, get_headers, body = read_response(sock)
+        self.assertEqual(status, get_status)
+        self.assertEqual(headers['content-length'], str(len(body)))
+        self.assertEqual(headers['content-length'], get_headers['content-length'])
+        self.assertEqual(headers['content-type'], get_headers['content-type'])
+        return status
+
+    def test_cached_static_file(self):
+        self.assertEqual(self.assert_head_matches_get("/index.html"), 200)
+
+    def test_sendfile_static_file(self):
+        self.assertEqual(self.assert_head_matches_get("/static/images/welcome.png"), 200)
+
+    def test_not_found(self):
+        self.assertEqual(self.assert_head_matches_get("/missing.html"), 404)
+
+    def test_get_hook_route(self):
+        self.assertEqual(self.assert_head_matches_get("/hello"), 200)
+
+    def test_streamed_hook_route(self):
+        sock = self.connect()
+        sock.sendall(b"HEAD /count/3 HTTP/1.1\r\nHost: test\r\n\r\n"
+                     b"GET /hello HTTP/1.1\r\nHost: test\r\n\r\n")
+        status, headers, _ = read_response(sock, head=True)
+        self.assertEqual(status, 200)
+        self.assertEqual(headers['transfer-encoding'], 'chunked')
+        status, _, body = read_response(sock)
+        self.assertEqual(status, 200)
+        self.assertIn(b"Hello", body)
+
+
+class AsyncHeadTest(HeadTest):
+
+    options = {"engine": "asyncio"}
+
+
+class RouterHeadTest(unittest.TestCase):
+
+    def test_head_falls_back_to_get(self):
+        router = Router({("GET", "/item/<int:id>"): len, ("GET", "/items"): list})
+        self.assertEqual(router.match("HEAD", "/items")[0], list)
+        self.assertEqual(router.match("HEAD", "/item/3")[:2], (len, {"id": 3}))
+
+    def test_head_route_wins(self):
+        router = Router({("GET", "/items"): list, ("HEAD", "/items"): len})
+        self.assertEqual(router.match("HEAD", "/items")[0], len)
+
+    def test_allow_lists_head(self):
+        router = Router({("GET", "/items"): list})
+        self.assertEqual(router.match("POST", "/items")[3], ("GET", "HEAD"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+Connections persist as the client asks, up to the request cap and the
+idle timeout of the server.
+"""
+
+import time
+import unittest
+
+from support import ServerTestCase, read_response
+
+
+class KeepAliveTest(ServerTestCase):
+
+    options = {"engine": "thread", "keepalive_timeout": 1, "max_keepalive_requests": 3}
+
+    def request(self, sock, path="/hello", version="HTTP/1.1", connection=None):
+        raw = "GET {} {}\r\nHost: test\r\n".format(path, version)
+        if connection:
+            raw += "Connection: {}\r\n".format(connection)
+        sock.sendall((raw + "\r\n").encode())
+        return read_response(sock)
+
+    def test_http11_persists_by_default(self):
+        sock = self.connect()
+        status, headers, _ = self.request(sock)
+        self.assertEqual(status, 200)
+        self.assertEqual(headers['connection'], 'keep-alive')
+        self.assertEqual(headers['keep-alive'], 'timeout=1, max=2')
+        status, headers, _ = self.request(sock, "/index.html")
+        self.assertEqual(status, 200)
+        self.assertEqual(headers['keep-alive'], 'timeout=1, max=1')
+
+    def test_connection_close(self):
+        sock = self.connect()
+        _, headers, _ = self.request(sock, connection="close")
+        self.assertEqual(headers['connection'], 'close')
+        self.assertEqual(sock.recv(1024), b"")
+
+    def test_http10_closes_by_default(self):
+        sock = self.connect()
+        _, headers, _ = self.request(sock, version="HTTP/1.0")
+        self.assertEqual(headers['connection'], 'close')
+        self.assertEqual(sock.recv(1024), b"")
+
+    def test_http10_keep_alive(self):
+        sock = self.connect()
+        _, headers, _ = self.request(sock, version="HTTP/1.0", connection="keep-alive")
+        self.assertEqual(headers['connection'], 'keep-alive')
+        self.assertEqual(self.request(sock, version="HTTP/1.0")[0], 200)
+
+    def test_request_cap(self):
+        sock = self.connect()
+        for _ in range(2):
+            self.assertEqual(self.request(sock)[1]['connection'], 'keep-alive')
+        _, headers, _ = self.request(sock)
+        self.assertEqual(headers['connection'], 'close')
+        self.assertNotIn('keep-alive', headers)
+        self.assertEqual(sock.recv(1024), b"")
+
+    def test_idle_timeout(self):
+        sock = self.connect()
+        self.assertEqual(self.request(sock)[0], 200)
+        started = time.monotonic()
+        self.assertEqual(sock.recv(1024), b"")
+        self.assertLess(time.monotonic() - started, 5)
+
+
+class AsyncKeepAliveTest(KeepAliveTest):
+
+    options = {"engine": "asyncio", "keepalive_timeout": 1, "max_keepalive_requests": 3}
+
+
+if __name__ == '__main__':
+    unittest.main()
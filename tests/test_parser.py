@@ -0,0 +1,150 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+The incremental parser reads a request in whatever pieces it arrives,
+frames fixed-length and chunked bodies, and stops at the end of the
+message.
+"""
+
+import unittest
+
+import support  # noqa: F401, puts the daemon package on the path
+
+from daemon.body import RequestBody
+from daemon.parser import COMPLETE, NEED_MORE, BodyTooLarge, HttpParser
+
+GET = b"GET /index.html?a=1 HTTP/1.1\r\nHost: test\r\nAccept: text/html\r\n\r\n"
+POST = b"POST /echo HTTP/1.1\r\nHost: test\r\nContent-Length: 11\r\n\r\nhello world"
+CHUNKED = (b"POST /echo HTTP/1.1\r\nHost: test\r\nTransfer-Encoding: chunked\r\n\r\n"
+           b"5;ext=1\r\nhello\r\n6\r\n world\r\n0\r\nX-Checksum: 1\r\n\r\n")
+
+
+def feed_bytewise(parser, raw):
+    """Feed one byte at a time, returning the statuses."""
+    statuses = []
+    for i in range(len(raw)):
+        status, used = parser.feed(raw[i:i + 1])
+        statuses.append(status)
+        if status == COMPLETE:
+            break
+        assert used == 1
+    return statuses
+
+
+class HttpParserTest(unittest.TestCase):
+
+    def test_get(self):
+        parser = HttpParser()
+        self.assertEqual(parser.feed(GET), (COMPLETE, len(GET)))
+        self.assertTrue(parser.complete)
+        self.assertEqual((parser.method, parser.path, parser.version),
+                         ("GET", "/index.html?a=1", "HTTP/1.1"))
+        self.assertEqual(parser.headers, {"host": "test", "accept": "text/html"})
+        self.assertEqual(bytes(parser.body), b"")
+        self.assertEqual(parser.received, len(GET))
+
+    def test_every_split(self):
+        for raw, body in ((GET, b""), (POST, b"hello world"), (CHUNKED, b"hello world")):
+            for cut in range(1, len(raw)):
+                parser = HttpParser()
+                self.assertEqual(parser.feed(raw[:cut])[0], NEED_MORE, (raw, cut))
+                self.assertEqual(parser.feed(raw[cut:]), (COMPLETE, len(raw) - cut), (raw, cut))
+                self.assertEqual(bytes(parser.body), body, (raw, cut))
+
+    def test_byte_by_byte(self):
+        parser = HttpParser()
+        statuses = feed_bytewise(parser, CHUNKED)
+        self.assertEqual(statuses[-1], COMPLETE)
+        self.assertEqual(len(statuses), len(CHUNKED))
+        self.assertEqual(bytes(parser.body), b"hello world")
+
+    def test_repeated_fields_are_joined(self):
+        parser = HttpParser()
+        parser.feed(b"GET / HTTP/1.1\r\nAccept: a\r\naccept: b\r\n"
+                    b"Cookie: x=1\r\nCookie: y=2\r\n\r\n")
+        self.assertEqual(parser.headers["accept"], "a, b")
+        self.assertEqual(parser.headers["cookie"], "x=1; y=2")
+
+    def test_pipelined_request_is_left(self):
+        parser = HttpParser()
+        status, used = parser.feed(POST + GET)
+        self.assertEqual((status, used), (COMPLETE, len(POST)))
+        following = HttpParser()
+        self.assertEqual(following.feed(POST + GET, used), (COMPLETE, len(GET)))
+        self.assertEqual(following.path, "/index.html?a=1")
+
+    def test_leading_blank_lines_are_ignored(self):
+        parser = HttpParser()
+        self.assertEqual(parser.feed(b"\r\n" + GET)[0], COMPLETE)
+        self.assertEqual(parser.method, "GET")
+
+    def test_memoryview_input(self):
+        parser = HttpParser()
+        self.assertEqual(parser.feed(memoryview(POST)), (COMPLETE, len(POST)))
+        self.assertEqual(bytes(parser.body), b"hello world")
+
+    def test_body_window(self):
+        parser = HttpParser()
+        parser.feed(POST[:-11])
+        window = parser.body_window()
+        self.assertEqual(len(window), 11)
+        window[:6] = b"hello "
+        self.assertEqual(parser.advance(6), NEED_MORE)
+        parser.body_window()[:5] = b"world"
+        self.assertEqual(parser.advance(5), COMPLETE)
+        self.assertEqual(bytes(parser.body), b"hello world")
+        self.assertIsNone(parser.body_window())
+
+    def test_large_body_is_spooled(self):
+        body = bytes(i % 256 for i in range(5000))
+        for raw in (b"POST / HTTP/1.1\r\nContent-Length: 5000\r\n\r\n" + body,
+                    b"POST / HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n"
+                    b"1388\r\n" + body + b"\r\n0\r\n\r\n"):
+            parser = HttpParser(spool_threshold=1000)
+            for pos in range(0, len(raw), 700):
+                parser.feed(raw[pos:pos + 700])
+            self.assertTrue(parser.complete)
+            self.assertIsInstance(parser.body, RequestBody)
+            self.assertEqual(parser.body.getvalue(), body)
+
+    def test_header_too_large(self):
+        raw = b"GET / HTTP/1.1\r\nCookie: " + b"c" * 200 + b"\r\n\r\n"
+        with self.assertRaises(ValueError):
+            HttpParser(max_header_size=100).feed(raw)
+        parser = HttpParser(max_header_size=100)
+        with self.assertRaises(ValueError):
+            for i in range(0, len(raw), 10):
+                parser.feed(raw[i:i + 10])
+        # The error sticks
+        with self.assertRaises(ValueError):
+            parser.feed(b"\r\n")
+
+    def test_body_too_large(self):
+        with self.assertRaises(BodyTooLarge):
+            HttpParser(max_body_size=10).feed(POST[:-11])
+        parser = HttpParser(max_body_size=10)
+        with self.assertRaises(BodyTooLarge):
+            parser.feed(CHUNKED)
+
+    def test_malformed(self):
+        for raw in (b"GET /\r\n\r\n",
+                    b"POST / HTTP/1.1\r\nContent-Length: -1\r\n\r\n",
+                    b"POST / HTTP/1.1\r\nContent-Length: 1\r\nContent-Length: 2\r\n\r\n",
+                    b"POST / HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\nzz\r\n",
+                    b"POST / HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n1\r\nab\r\n"):
+            with self.assertRaises(ValueError, msg=raw):
+                HttpParser().feed(raw)
+
+
+if __name__ == '__main__':
+    unittest.main()
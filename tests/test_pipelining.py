@@ -0,0 +1,85 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+Requests pipelined on one connection are all answered, in the order
+they were sent.
+"""
+
+import json
+import unittest
+
+from support import ServerTestCase, read_response
+from test_streams import read_chunked
+
+
+def get(path):
+    return "GET {} HTTP/1.1\r\nHost: test\r\n\r\n".format(path).encode()
+
+
+def post(path, body):
+    return "POST {} HTTP/1.1\r\nHost: test\r\nContent-Length: {}\r\n\r\n".format(
+        path, len(body)).encode() + body
+
+
+class PipeliningTest(ServerTestCase):
+
+    options = {"engine": "thread"}
+
+    def test_responses_in_order(self):
+        sock = self.connect()
+        sock.sendall(get("/hello") + post("/echo", b"a" * 3000) + get("/missing.html")
+                     + get("/index.html") + post("/echo", b"bc") + get("/count/2"))
+        status, _, body = read_response(sock)
+        self.assertEqual((status, json.loads(body)), (200, {'message': 'Hello, world!'}))
+        status, _, body = read_response(sock)
+        self.assertEqual((status, json.loads(body)), (200, {'size': 3000}))
+        self.assertEqual(read_response(sock)[0], 404)
+        status, headers, _ = read_response(sock)
+        self.assertEqual((status, headers['content-type']), (200, 'text/html'))
+        status, _, body = read_response(sock)
+        self.assertEqual((status, json.loads(body)), (200, {'size': 2}))
+        self.assertEqual(read_response(sock, head=True)[0], 200)
+        self.assertEqual(read_chunked(sock), b"0\n1\n")
+
+    def test_slow_request_keeps_its_place(self):
+        sock = self.connect()
+        sock.sendall(get("/sleep/0.3") + get("/hello") + get("/pid"))
+        self.assertEqual(json.loads(read_response(sock)[2]), {'slept': 0.3})
+        self.assertIn(b"Hello", read_response(sock)[2])
+        self.assertIn('pid', json.loads(read_response(sock)[2]))
+
+    def test_many_requests_in_one_send(self):
+        # More than the responses batched into one write
+        sock = self.connect()
+        sock.sendall(b"".join(post("/echo", b"x" * i) for i in range(1, 41)))
+        for i in range(1, 41):
+            status, _, body = read_response(sock)
+            self.assertEqual((status, json.loads(body)), (200, {'size': i}))
+
+    def test_close_ends_the_pipeline(self):
+        sock = self.connect()
+        sock.sendall(get("/hello")
+                     + b"GET /hello HTTP/1.1\r\nHost: test\r\nConnection: close\r\n\r\n"
+                     + get("/hello"))
+        self.assertEqual(read_response(sock)[1]['connection'], 'keep-alive')
+        self.assertEqual(read_response(sock)[1]['connection'], 'close')
+        self.assertEqual(sock.recv(1024), b"")
+
+
+class AsyncPipeliningTest(PipeliningTest):
+
+    options = {"engine": "asyncio"}
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+In pre-fork mode worker processes serve the port, a crashed worker is
+replaced, and SIGTERM stops the whole group.
+"""
+
+import json
+import os
+import signal
+import time
+import unittest
+
+from support import ServerTestCase, start_server
+
+from daemon.prefork import supports_prefork, supports_reuse_port
+
+#: Seconds the supervisor may take to replace a worker.
+RESTART_TIMEOUT = 10
+
+
+def parent_pid(pid):
+    """
+    :rtype int: parent process id, from /proc.
+    """
+    with open("/proc/{}/stat".format(pid)) as f:
+        return int(f.read().rsplit(")", 1)[1].split()[1])
+
+
+def children(pid):
+    """
+    :rtype set: ids of the live child processes of a process, from /proc.
+    """
+    found = set()
+    for name in os.listdir("/proc"):
+        if name.isdigit():
+            try:
+                if parent_pid(name) == pid:
+                    found.add(int(name))
+            except OSError:
+                pass
+    return found
+
+
+def alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+@unittest.skipUnless(supports_prefork() and os.path.exists("/proc/self/stat"),
+                     "needs os.fork and /proc")
+class PreforkTest(ServerTestCase):
+
+    options = {"workers": 2, "drain_timeout": 1}
+
+    @classmethod
+    def tearDownClass(cls):
+        # The supervisor stops its workers, a kill would orphan them
+        cls.process.terminate()
+        cls.process.wait(timeout=15)
+
+    def worker_pid(self):
+        _, _, body = self.exchange(
+            b"GET /pid HTTP/1.1\r\nHost: test\r\nConnection: close\r\n\r\n")
+        return json.loads(body)['pid']
+
+    def worker_pids(self, requests=40):
+        return {self.worker_pid() for _ in range(requests)}
+
+    def test_workers_serve_the_port(self):
+        pids = self.worker_pids()
+        self.assertNotIn(self.process.pid, pids)
+        for pid in pids:
+            self.assertEqual(parent_pid(pid), self.process.pid)
+
+    def wait_for_workers(self, exclude=()):
+        """
+        Wait until the supervisor has its two workers, none of ``exclude``.
+
+        :rtype set: the worker pids.
+        """
+        limit = time.monotonic() + RESTART_TIMEOUT
+        while time.monotonic() < limit:
+            workers = children(self.process.pid)
+            if len(workers) == 2 and not workers & set(exclude):
+                return workers
+            time.sleep(0.1)
+        self.fail("Workers of {} not running: {}".format(self.process.pid, workers))
+
+    def test_crashed_worker_is_restarted(self):
+        # The server answers once a worker is up, the other may still be forking
+        self.wait_for_workers()
+        victim = self.worker_pid()
+        os.kill(victim, signal.SIGKILL)
+        workers = self.wait_for_workers(exclude=[victim])
+        self.assertLessEqual(self.worker_pids(), workers)
+
+    def test_sigterm_stops_the_workers(self):
+        workers = self.wait_for_workers()
+        self.process.terminate()
+        self.assertEqual(self.process.wait(timeout=15), 0)
+        for pid in workers:
+            self.assertFalse(alive(pid))
+        # Served again for the next test
+        self.__class__.process, self.__class__.port = start_server(**self.options)
+
+
+@unittest.skipUnless(supports_reuse_port(), "needs SO_REUSEPORT")
+class ReusePortTest(PreforkTest):
+
+    options = {"workers": 2, "reuse_port": True, "drain_timeout": 1}
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+Range requests of static objects: 206 with one range or a
+``multipart/byteranges`` body, 416 when nothing is satisfiable, and the
+whole object when ``If-Range`` names an old version.
+"""
+
+import os
+import unittest
+
+from support import ROOT, ServerTestCase, read_response
+
+from daemon.response import MAX_RANGES, parse_range
+
+
+class ParseRangeTest(unittest.TestCase):
+
+    def test_ranges(self):
+        self.assertEqual(parse_range("bytes=0-99", 1000), [(0, 99)])
+        self.assertEqual(parse_range("bytes=900-", 1000), [(900, 999)])
+        self.assertEqual(parse_range("bytes=-100", 1000), [(900, 999)])
+        self.assertEqual(parse_range("bytes=0-0, 10-19", 1000), [(0, 0), (10, 19)])
+        # Clamped to the object
+        self.assertEqual(parse_range("bytes=990-2000", 1000), [(990, 999)])
+        self.assertEqual(parse_range("bytes=-5000", 1000), [(0, 999)])
+
+    def test_unsatisfiable(self):
+        self.assertEqual(parse_range("bytes=1000-", 1000), [])
+        self.assertEqual(parse_range("bytes=-0", 1000), [])
+        self.assertEqual(parse_range("bytes=5000-6000, 1000-", 1000), [])
+
+    def test_ignored(self):
+        for value in ("items=0-1", "bytes=abc", "bytes=5-1", "bytes=1", "0-1"):
+            self.assertIsNone(parse_range(value, 1000), value)
+
+    def test_abusive(self):
+        self.assertIsNone(parse_range("bytes=0-999, 0-999", 1000))
+        many = ",".join("{0}-{0}".format(i) for i in range(MAX_RANGES + 1))
+        self.assertIsNone(parse_range("bytes=" + many, 1000))
+
+
+class RangeTest(ServerTestCase):
+
+    options = {"engine": "thread"}
+
+    def get(self, path, **fields):
+        raw = "GET {} HTTP/1.1\r\nHost: test\r\n".format(path)
+        for name, value in fields.items():
+            raw += "{}: {}\r\n".format(name.replace("_", "-"), value)
+        sock = self.connect()
+        sock.sendall((raw + "\r\n").encode())
+        return read_response(sock)
+
+    def content(self, path):
+        with open(os.path.join(ROOT, path), "rb") as f:
+            return f.read()
+
+    def assert_single_range(self, path, content):
+        status, headers, body = self.get(path, Range="bytes=10-109")
+        self.assertEqual(status, 206)
+        self.assertEqual(headers['content-range'], "bytes 10-109/{}".format(len(content)))
+        self.assertEqual(body, content[10:110])
+        status, _, body = self.get(path, Range="bytes=-20")
+        self.assertEqual((status, body), (206, content[-20:]))
+
+    def test_cached_page(self):
+        self.assert_single_range("/index.html", self.content("www/index.html"))
+
+    def test_sendfile_image(self):
+        content = self.content("static/images/welcome.png")
+        self.assert_single_range("/static/images/welcome.png", content)
+
+    def test_multiple_ranges(self):
+        content = self.content("static/images/welcome.png")
+        status, headers, body = self.get("/static/images/welcome.png", Range="bytes=0-9,-10")
+        self.assertEqual(status, 206)
+        media_type, _, boundary = headers['content-type'].partition("; boundary=")
+        self.assertEqual(media_type, "multipart/byteranges")
+        parts = body.split(b"--" + boundary.encode())
+        self.assertEqual(len(parts), 4)
+        self.assertEqual(parts[0], b"")
+        self.assertEqual(parts[-1], b"--\r\n")
+        expected = [(b"bytes 0-9/%d" % len(content), content[:10]),
+                    (b"bytes %d-%d/%d" % (len(content) - 10, len(content) - 1, len(content)),
+                     content[-10:])]
+        for part, (content_range, data) in zip(parts[1:-1], expected):
+            head, _, data_crlf = part.partition(b"\r\n\r\n")
+            self.assertIn(b"Content-Type: image/png", head)
+            self.assertIn(b"Content-Range: " + content_range, head)
+            self.assertEqual(data_crlf, data + b"\r\n")
+
+    def test_not_satisfiable(self):
+        size = len(self.content("www/index.html"))
+        status, headers, body = self.get("/index.html", Range="bytes={}-".format(size))
+        self.assertEqual(status, 416)
+        self.assertEqual(headers['content-range'], "bytes */{}".format(size))
+        self.assertEqual(body, b"")
+
+    def test_malformed_range_is_ignored(self):
+        status, _, body = self.get("/index.html", Range="bytes=9-1")
+        self.assertEqual((status, body), (200, self.content("www/index.html")))
+
+    def test_if_range(self):
+        etag = self.get("/index.html")[1]['etag']
+        self.assertEqual(self.get("/index.html", Range="bytes=0-9", If_Range=etag)[0], 206)
+        status, _, body = self.get("/index.html", Range="bytes=0-9", If_Range='"old"')
+        self.assertEqual((status, body), (200, self.content("www/index.html")))
+
+
+class AsyncRangeTest(RangeTest):
+
+    options = {"engine": "asyncio"}
+
+
+class MappedRangeTest(RangeTest):
+
+    options = {"engine": "thread", "file_mode": "mmap"}
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+The readers frame whole requests, large headers and bodies included,
+whatever pieces the network delivers them in.
+"""
+
+import asyncio
+import json
+import socket
+import threading
+import unittest
+
+from support import ServerTestCase, read_response
+
+from daemon.body import RequestBody
+from daemon.reader import AsyncHttpReader, HttpReader
+
+
+def upload(size):
+    return ("POST /echo HTTP/1.1\r\nHost: test\r\nContent-Length: {}\r\n\r\n".format(size).encode()
+            + bytes(i % 251 for i in range(size)))
+
+
+class HttpReaderTest(unittest.TestCase):
+
+    def setUp(self):
+        self.client, self.server = socket.socketpair()
+        self.addCleanup(self.client.close)
+        self.addCleanup(self.server.close)
+
+    def send_later(self, *pieces):
+        def send():
+            for piece in pieces:
+                self.client.sendall(piece)
+        thread = threading.Thread(target=send)
+        thread.start()
+        self.addCleanup(thread.join)
+
+    def test_large_header(self):
+        cookie = "c" * 5000
+        self.client.sendall("GET / HTTP/1.1\r\nHost: test\r\nCookie: {}\r\n\r\n".format(cookie).encode())
+        message = HttpReader(self.server, buffer_size=1024).read_message()
+        self.assertEqual(message.headers['cookie'], cookie)
+
+    def test_body_larger_than_the_buffer(self):
+        raw = upload(300000)
+        self.send_later(raw[:100], raw[100:5000], raw[5000:])
+        message = HttpReader(self.server).read_message()
+        self.assertEqual(bytes(message.body), raw[-300000:])
+
+    def test_large_body_is_spooled(self):
+        raw = upload(5000)
+        self.client.sendall(raw)
+        message = HttpReader(self.server, spool_threshold=1000).read_message()
+        self.assertIsInstance(message.body, RequestBody)
+        self.assertEqual(message.body.getvalue(), raw[-5000:])
+        message.body.close()
+
+    def test_chunked_body(self):
+        self.send_later(b"POST /echo HTTP/1.1\r\nHost: test\r\nTransfer-Encoding: chunked\r\n\r\n",
+                        b"5\r\nhel", b"lo\r\n6\r\n world\r\n", b"0\r\n\r\n")
+        message = HttpReader(self.server).read_message()
+        self.assertEqual(bytes(message.body), b"hello world")
+
+    def test_pipelined_messages(self):
+        self.client.sendall(upload(10) + b"GET /next HTTP/1.1\r\nHost: test\r\n\r\n")
+        reader = HttpReader(self.server)
+        self.assertEqual(reader.read_message().method, "POST")
+        self.assertTrue(reader.has_message())
+        self.assertEqual(reader.read_message().path, "/next")
+        self.assertEqual(reader.buffered(), 0)
+
+    def test_close_between_messages(self):
+        self.client.close()
+        self.assertIsNone(HttpReader(self.server).read_message())
+
+    def test_close_inside_body(self):
+        self.client.sendall(upload(100)[:-10])
+        self.client.shutdown(socket.SHUT_WR)
+        with self.assertRaises(ValueError):
+            HttpReader(self.server).read_message()
+
+
+class AsyncHttpReaderTest(unittest.TestCase):
+
+    def read(self, *pieces, **options):
+        async def main():
+            stream = asyncio.StreamReader()
+            for piece in pieces:
+                stream.feed_data(piece)
+            stream.feed_eof()
+            reader = AsyncHttpReader(stream, **options)
+            messages = []
+            while True:
+                message = await reader.read_message()
+                if message is None:
+                    return messages
+                messages.append(message)
+        return asyncio.run(main())
+
+    def test_body_in_pieces(self):
+        raw = upload(100000)
+        message, = self.read(raw[:30], raw[30:70000], raw[70000:])
+        self.assertEqual(bytes(message.body), raw[-100000:])
+
+    def test_chunked_and_pipelined(self):
+        first, second = self.read(
+            b"POST /echo HTTP/1.1\r\nHost: test\r\nTransfer-Encoding: chunked\r\n\r\n"
+            b"3\r\nabc\r\n0\r\n\r\nGET /next HTTP/1.1\r\nHost: test\r\n\r\n")
+        self.assertEqual(bytes(first.body), b"abc")
+        self.assertEqual(second.path, "/next")
+
+    def test_close_inside_headers(self):
+        with self.assertRaises(ValueError):
+            self.read(b"GET / HTTP/1.1\r\nHost: te")
+
+
+class UploadTest(ServerTestCase):
+
+    options = {"engine": "thread"}
+
+    def test_echo_sees_the_whole_body(self):
+        status, _, body = self.exchange(upload(200000))
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(body), {'size': 200000})
+
+
+class AsyncUploadTest(UploadTest):
+
+    options = {"engine": "asyncio"}
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+A prepared request decodes only its request line; headers, cookies,
+query parameters and body text are computed on first access and kept.
+"""
+
+import unittest
+
+import support  # noqa: F401, puts the daemon package on the path
+
+from daemon.body import RequestBody
+from daemon.request import Request, parse_cookies
+
+RAW = ("POST /search?q=web&page=2&q=rous&empty= HTTP/1.1\r\nHost: test\r\n"
+       "Cookie: auth=true; theme=dark\r\nContent-Type: text/plain\r\n"
+       "Content-Length: 5\r\n\r\nhello")
+
+
+def prepared(raw=RAW):
+    req = Request()
+    req.prepare(raw)
+    return req
+
+
+class LazyRequestTest(unittest.TestCase):
+
+    def test_only_the_request_line_is_decoded(self):
+        req = prepared()
+        self.assertEqual((req.method, req.url, req.path, req.version),
+                         ("POST", "/search?q=web&page=2&q=rous&empty=", "/search", "HTTP/1.1"))
+        for name in ("_headers", "_cookies", "_query", "_body", "_stream", "_auth"):
+            self.assertIsNone(getattr(req, name), name)
+
+    def test_fields_are_memoized(self):
+        req = prepared()
+        for name in ("headers", "cookies", "query", "body"):
+            self.assertIs(getattr(req, name), getattr(req, name), name)
+
+    def test_fields(self):
+        req = prepared()
+        self.assertEqual(req.headers['content-type'], 'text/plain')
+        self.assertEqual(req.cookies, {'auth': 'true', 'theme': 'dark'})
+        self.assertEqual(req.query, {'q': 'rous', 'page': '2', 'empty': ''})
+        self.assertEqual(req.body, 'hello')
+        self.assertTrue(req.auth)
+        # Reading one field leaves the others alone
+        self.assertIsNone(prepared()._cookies)
+
+    def test_empty_body_and_root_path(self):
+        req = prepared("GET / HTTP/1.1\r\nHost: test\r\n\r\n")
+        self.assertEqual(req.path, "/index.html")
+        self.assertIsNone(req.body)
+        self.assertEqual(req.query, {})
+        self.assertEqual(req.cookies, {})
+        self.assertFalse(req.auth)
+
+    def test_stream(self):
+        req = prepared()
+        stream = req.stream
+        self.assertIsInstance(stream, RequestBody)
+        self.assertEqual(stream.content_type, 'text/plain')
+        self.assertEqual(stream.read(), b"hello")
+        # Rewound for the next reader
+        self.assertEqual(req.stream.read(), b"hello")
+
+    def test_spooled_body_text(self):
+        req = prepared()
+        req.raw_body = RequestBody(b"spooled", spool_threshold=1)
+        self.assertEqual(req.body, "spooled")
+
+    def test_login(self):
+        body = "username=admin&password=password"
+        req = prepared("POST /login HTTP/1.1\r\nHost: test\r\nContent-Length: {}\r\n\r\n{}"
+                       .format(len(body), body))
+        self.assertTrue(req.auth)
+        self.assertEqual(req.cookies, {'auth': 'true'})
+        body = "username=admin&password=wrong"
+        req = prepared("POST /login HTTP/1.1\r\nHost: test\r\nContent-Length: {}\r\n\r\n{}"
+                       .format(len(body), body))
+        self.assertFalse(req.auth)
+
+    def test_parse_cookies(self):
+        self.assertEqual(parse_cookies("a=1; b=x=y;  c=; broken"), {'a': '1', 'b': 'x=y', 'c': ''})
+
+
+if __name__ == '__main__':
+    unittest.main()
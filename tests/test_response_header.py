@@ -0,0 +1,99 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+Response headers are assembled from prebuilt blocks and a Date string
+formatted once per second.
+"""
+
+import email.utils
+import time
+import unittest
+
+import support  # noqa: F401, puts the daemon package on the path
+
+from daemon.request import Request
+from daemon.response import (STATIC_HEADER_FIELDS, Response, header_block, http_date,
+                             status_line)
+
+
+class HeaderBlockTest(unittest.TestCase):
+
+    def test_block_is_built_once(self):
+        block = header_block("text/css", "public, max-age=60")
+        self.assertIs(header_block("text/css", "public, max-age=60"), block)
+        self.assertTrue(block.startswith("Content-Type: text/css\r\n"))
+        for name, value in STATIC_HEADER_FIELDS:
+            self.assertIn("{}: {}\r\n".format(name, value), block)
+        self.assertTrue(block.endswith("Cache-Control: public, max-age=60\r\n"))
+
+    def test_pragma_only_with_no_cache(self):
+        self.assertIn("Pragma: no-cache\r\n", header_block("text/html", "no-cache"))
+        self.assertNotIn("Pragma", header_block("text/html", "max-age=60"))
+
+    def test_status_line(self):
+        line = status_line(206, "Partial Content")
+        self.assertEqual(line, "HTTP/1.1 206 Partial Content\r\n")
+        self.assertIs(status_line(206, "Partial Content"), line)
+
+
+class HttpDateTest(unittest.TestCase):
+
+    def test_format(self):
+        before = int(time.time())
+        value = http_date()
+        after = int(time.time())
+        parsed = email.utils.parsedate_to_datetime(value).timestamp()
+        self.assertTrue(before <= parsed <= after)
+        self.assertTrue(value.endswith(" GMT"))
+        self.assertEqual(value, email.utils.formatdate(parsed, usegmt=True))
+
+    def test_formatted_once_per_second(self):
+        # Right after a second boundary, both calls fall in the same second
+        time.sleep(1 - time.time() % 1 + 0.01)
+        self.assertIs(http_date(), http_date())
+
+
+class BuildResponseHeaderTest(unittest.TestCase):
+
+    def build(self, **headers):
+        req = Request()
+        req.prepare("GET /index.html HTTP/1.1\r\nHost: test\r\n\r\n")
+        resp = Response()
+        resp.headers['Content-Type'] = 'text/html'
+        resp.headers.update(headers)
+        resp._content = b"<p>hi</p>"
+        return resp.build_response_header(req).decode()
+
+    def test_header(self):
+        header = self.build(**{'Cache-Control': 'no-store', 'ETag': '"1-2"',
+                               'Connection': 'keep-alive', 'Keep-Alive': 'timeout=5, max=9'})
+        lines = header.split("\r\n")
+        self.assertEqual(lines[0], "HTTP/1.1 200 OK")
+        self.assertTrue(header.endswith("\r\n\r\n"))
+        self.assertIn("Content-Length: 9\r\n", header)
+        self.assertIn("Cache-Control: no-store\r\n", header)
+        self.assertIn('ETag: "1-2"\r\n', header)
+        self.assertIn("Keep-Alive: timeout=5, max=9\r\n", header)
+        self.assertRegex(header, r"\r\nDate: \w{3}, \d\d \w{3} \d{4} \d\d:\d\d:\d\d GMT\r\n")
+        # Every field once
+        names = [line.split(":")[0] for line in lines[1:] if line]
+        self.assertEqual(len(names), len(set(names)))
+
+    def test_optional_fields_absent(self):
+        header = self.build()
+        for name in ("ETag", "Content-Encoding", "Content-Range", "Set-Cookie"):
+            self.assertNotIn(name + ":", header)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+Request and Response objects have fixed slots and are reset and reused
+for each request of a connection, and by each worker thread.
+"""
+
+import threading
+import unittest
+
+import support  # noqa: F401, puts the daemon package on the path
+
+from daemon.body import RequestBody
+from daemon.cachepolicy import CachePolicy
+from daemon.compression import Compressor
+from daemon.httpadapter import HttpAdapter, worker_exchange
+from daemon.request import Request
+from daemon.response import Response
+
+
+class SlotsTest(unittest.TestCase):
+
+    def test_no_instance_dict(self):
+        for obj in (Request(), Response()):
+            self.assertFalse(hasattr(obj, "__dict__"), type(obj).__name__)
+            with self.assertRaises(AttributeError):
+                obj.misspelled = 1
+
+
+class ResetTest(unittest.TestCase):
+
+    def test_request_reset(self):
+        req = Request()
+        req.routes = routes = {}
+        req.prepare("GET /a?x=1 HTTP/1.1\r\nCookie: auth=true\r\n\r\n")
+        self.assertEqual(req.query, {'x': '1'})
+        req.reset()
+        self.assertEqual((req.method, req.path, req.raw_body, req.params), (None, None, b"", {}))
+        self.assertEqual(req.headers, {})
+        self.assertEqual(req.cookies, {})
+        self.assertIs(req.routes, routes)
+
+    def test_spooled_body_is_released(self):
+        req = Request()
+        req.prepare("POST /echo HTTP/1.1\r\nContent-Length: 3\r\n\r\nabc")
+        body = req.raw_body = RequestBody(b"abc", spool_threshold=1)
+        self.assertFalse(body.in_memory)
+        req.reset()
+        self.assertEqual(len(body), 0)
+
+    def test_response_reset_keeps_the_settings(self):
+        resp = Response()
+        headers, history = resp.headers, resp.history
+        resp.compressor = compressor = Compressor(level=1)
+        resp.file_mode = "mmap"
+        resp.cache_policy = policy = CachePolicy()
+        resp.status_code = 404
+        resp.headers['ETag'] = '"x"'
+        resp.history.append(Response())
+        resp.reset()
+        self.assertIsNone(resp.status_code)
+        self.assertIs(resp.headers, headers)
+        self.assertIs(resp.history, history)
+        self.assertEqual((resp.headers, resp.history), ({}, []))
+        self.assertEqual((resp.compressor, resp.file_mode, resp.cache_policy),
+                         (compressor, "mmap", policy))
+
+
+class WorkerExchangeTest(unittest.TestCase):
+
+    def test_one_pair_per_thread(self):
+        pair = worker_exchange()
+        self.assertIs(worker_exchange(), pair)
+        others = []
+        thread = threading.Thread(target=lambda: others.append(worker_exchange()))
+        thread.start()
+        thread.join()
+        self.assertIsNot(others[0][0], pair[0])
+        self.assertIsNot(others[0][1], pair[1])
+
+    def test_adapter_reuses_and_resets_the_pair(self):
+        req, resp = worker_exchange()
+        req.prepare("GET /old HTTP/1.1\r\n\r\n")
+        resp.status_code = 500
+        adapter = HttpAdapter("127.0.0.1", 8080, None, None, {}, exchange=(req, resp))
+        self.assertIs(adapter.request, req)
+        self.assertIs(adapter.response, resp)
+        self.assertIsNone(req.path)
+        self.assertIsNone(resp.status_code)
+        # Without an exchange, the adapter has a pair of its own
+        self.assertIsNot(HttpAdapter("127.0.0.1", 8080, None, None, {}).request, req)
+
+    def test_next_exchange(self):
+        adapter = HttpAdapter("127.0.0.1", 8080, None, None, {})
+        req, resp = adapter.next_exchange()
+        req.prepare("GET /first HTTP/1.1\r\n\r\n")
+        adapter.served = 1
+        self.assertEqual(adapter.next_exchange(), (req, resp))
+        self.assertIsNone(req.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
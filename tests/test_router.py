@@ -0,0 +1,131 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+The router matches paths with parameters and converters, prefers literal
+and typed segments, and reports the allowed methods of a known path.
+"""
+
+import json
+import unittest
+
+from support import ServerTestCase
+
+from daemon.router import Router, compile_routes, parse_pattern
+from daemon.weaprous import WeApRous
+
+
+def handler(name):
+    def handle(headers, body, **params):
+        return name
+    handle.__name__ = name
+    return handle
+
+
+MEMBERS = handler("members")
+CHANNEL = handler("channel")
+ME = handler("me")
+MESSAGE = handler("message")
+SCORE = handler("score")
+TAG = handler("tag")
+FILES = handler("files")
+POST_CHANNEL = handler("post_channel")
+
+
+class RouterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.router = Router({
+            ("GET", "/channel/<name>"): CHANNEL,
+            ("POST", "/channel/<name>"): POST_CHANNEL,
+            ("GET", "/channel/<name>/members"): MEMBERS,
+            ("GET", "/channel/me"): ME,
+            ("GET", "/message/<int:id>"): MESSAGE,
+            ("GET", "/message/<float:score>"): SCORE,
+            ("GET", "/message/<tag>"): TAG,
+            ("GET", "/files/<path:rest>"): FILES,
+        })
+
+    def match(self, path, method="GET"):
+        return self.router.match(method, path)
+
+    def test_parameters(self):
+        self.assertEqual(self.match("/channel/general/members"),
+                         (MEMBERS, {"name": "general"}, "/channel/<name>/members", ()))
+        self.assertEqual(self.match("/channel/caf%C3%A9")[1], {"name": "café"})
+
+    def test_literal_wins(self):
+        self.assertEqual(self.match("/channel/me")[:3], (ME, {}, "/channel/me"))
+
+    def test_converters_by_priority(self):
+        self.assertEqual(self.match("/message/42")[:2], (MESSAGE, {"id": 42}))
+        self.assertEqual(self.match("/message/4.5")[:2], (SCORE, {"score": 4.5}))
+        self.assertEqual(self.match("/message/-4")[:2], (TAG, {"tag": "-4"}))
+
+    def test_path_converter(self):
+        self.assertEqual(self.match("/files/a/b%20c.txt")[:2], (FILES, {"rest": "a/b c.txt"}))
+        self.assertIsNone(self.match("/files/")[0])
+
+    def test_no_match(self):
+        for path in ("/channel", "/channel/", "/channel/a/b", "/nowhere", "relative"):
+            self.assertEqual(self.match(path), (None, {}, None, ()), path)
+
+    def test_methods(self):
+        self.assertEqual(self.match("/channel/a", "POST")[0], POST_CHANNEL)
+        # GET answers HEAD
+        self.assertEqual(self.match("/channel/a/members", "HEAD")[0], MEMBERS)
+        self.assertEqual(self.match("/channel/a", "DELETE"),
+                         (None, {}, None, ("GET", "HEAD", "POST")))
+
+    def test_mapping_interface(self):
+        self.assertEqual(len(self.router), 8)
+        self.assertIn(("GET", "/channel/me"), self.router)
+        self.assertIs(self.router[("GET", "/channel/me")], ME)
+        self.router[("get", "/added")] = ME
+        self.assertEqual(self.match("/added")[0], ME)
+        self.assertIs(compile_routes(self.router), self.router)
+        self.assertIsInstance(compile_routes({}), Router)
+
+    def test_invalid_patterns(self):
+        for pattern in ("nope", "/a/<bad:x>", "/<x>/<x>", "/<path:p>/end", "/a<b>", "/<1x>"):
+            with self.assertRaises(ValueError, msg=pattern):
+                parse_pattern(pattern)
+        with self.assertRaises(ValueError):
+            Router({("GET", "/<path:a>"): FILES, ("POST", "/<path:b>"): FILES})
+        with self.assertRaises(ValueError):
+            WeApRous().route("/a/<unknown:x>")
+
+
+class RoutingTest(ServerTestCase):
+
+    options = {"engine": "thread"}
+
+    def request(self, method, path):
+        return self.exchange("{} {} HTTP/1.1\r\nHost: test\r\nConnection: close\r\n\r\n"
+                             .format(method, path).encode())
+
+    def test_parameter_is_converted(self):
+        status, _, body = self.request("GET", "/sleep/0.01?ignored=1")
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(body), {"slept": 0.01})
+
+    def test_method_not_allowed(self):
+        status, headers, _ = self.request("DELETE", "/hello")
+        self.assertEqual(status, 405)
+        self.assertEqual(headers['allow'], "GET, HEAD")
+
+    def test_converter_mismatch_is_not_routed(self):
+        self.assertEqual(self.request("GET", "/numbers/ten")[0], 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
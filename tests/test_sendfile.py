@@ -0,0 +1,136 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+Static files of ``SENDFILE_THRESHOLD`` bytes or more are never read into
+memory: the header goes out first, then the file with ``sendfile``.
+"""
+
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import unittest
+
+from support import ROOT, ServerTestCase, read_response
+
+from daemon.assets import AssetIndex
+from daemon.response import (SENDFILE_THRESHOLD, WRITE_CHUNK, FileBody, Response,
+                             write_segments)
+
+
+def receive_all(sock):
+    data = b""
+    while True:
+        chunk = sock.recv(65536)
+        if not chunk:
+            return data
+        data += chunk
+
+
+class WriteSegmentsTest(unittest.TestCase):
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(prefix="weaprous-sendfile-")
+        self.addCleanup(os.unlink, self.path)
+        self.data = bytes(i % 256 for i in range(WRITE_CHUNK * 2 + 123))
+        with os.fdopen(fd, "wb") as f:
+            f.write(self.data)
+
+    def send(self, segments, progress=None):
+        """Write segments to a socket pair, returning the bytes received."""
+        client, server = socket.socketpair()
+        self.addCleanup(client.close)
+        received = []
+        reader = threading.Thread(target=lambda: received.append(receive_all(client)))
+        reader.start()
+        try:
+            write_segments(server, segments, progress)
+        finally:
+            server.close()
+            reader.join()
+        return received[0]
+
+    def test_header_file_and_trailer(self):
+        calls = []
+        body = FileBody(self.path, len(self.data))
+        data = self.send([b"HEAD\r\n\r\n", body, b"--end"], lambda: calls.append(1))
+        self.assertEqual(data, b"HEAD\r\n\r\n" + self.data + b"--end")
+        # At least one call per WRITE_CHUNK of the file
+        self.assertGreaterEqual(len(calls), 3)
+
+    def test_slices(self):
+        body = FileBody(self.path, len(self.data))
+        data = self.send([body.slice(10, 19), b"|", body.slice(WRITE_CHUNK, WRITE_CHUNK + 4)])
+        self.assertEqual(data, self.data[10:20] + b"|" + self.data[WRITE_CHUNK:WRITE_CHUNK + 5])
+
+    def test_shrunk_file_aborts(self):
+        body = FileBody(self.path, len(self.data) + 100)
+        with self.assertRaises(ConnectionAbortedError):
+            self.send([body])
+
+
+class BuildContentTest(unittest.TestCase):
+
+    def setUp(self):
+        self.base = tempfile.mkdtemp(prefix="weaprous-sendfile-")
+        self.addCleanup(shutil.rmtree, self.base)
+        os.makedirs(os.path.join(self.base, "www"))
+
+    def content(self, size):
+        with open(os.path.join(self.base, "www", "page.html"), "wb") as f:
+            f.write(b"a" * size)
+        asset = AssetIndex(self.base, refresh_interval=0).lookup("/page.html")
+        return Response().build_content("/page.html", "", asset)
+
+    def test_large_file_stays_on_disk(self):
+        size, content = self.content(SENDFILE_THRESHOLD)
+        self.assertIsInstance(content, FileBody)
+        self.assertEqual((size, content.size, content.offset),
+                         (SENDFILE_THRESHOLD, SENDFILE_THRESHOLD, 0))
+
+    def test_small_file_is_read(self):
+        size, content = self.content(SENDFILE_THRESHOLD - 1)
+        self.assertEqual(bytes(content), b"a" * (SENDFILE_THRESHOLD - 1))
+
+
+class SendfileServingTest(ServerTestCase):
+
+    options = {"engine": "thread"}
+
+    def test_large_image(self):
+        with open(os.path.join(ROOT, "static", "images", "welcome.png"), "rb") as f:
+            expected = f.read()
+        self.assertGreaterEqual(len(expected), SENDFILE_THRESHOLD)
+        status, headers, body = self.exchange(
+            b"GET /static/images/welcome.png HTTP/1.1\r\nHost: test\r\nConnection: close\r\n\r\n")
+        self.assertEqual(status, 200)
+        self.assertEqual(headers['content-type'], 'image/png')
+        self.assertEqual(headers['content-length'], str(len(expected)))
+        self.assertEqual(body, expected)
+
+    def test_keep_alive_after_a_file(self):
+        sock = self.connect()
+        sock.sendall(b"GET /static/images/welcome.png HTTP/1.1\r\nHost: test\r\n\r\n"
+                     b"GET /hello HTTP/1.1\r\nHost: test\r\n\r\n")
+        self.assertEqual(read_response(sock)[0], 200)
+        self.assertIn(b"Hello", read_response(sock)[2])
+
+
+class AsyncSendfileServingTest(SendfileServingTest):
+
+    options = {"engine": "asyncio"}
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+On SIGTERM the backend stops accepting, closes idle connections, lets
+requests in progress finish up to the drain deadline, then exits.
+"""
+
+import socket
+import threading
+import time
+import unittest
+
+from support import read_response, start_server, stop_server
+
+from daemon.shutdown import ConnectionDrainer, linger_close
+
+
+class ConnectionDrainerTest(unittest.TestCase):
+
+    def test_drain_waits_for_busy_connections(self):
+        closed = []
+        drainer = ConnectionDrainer()
+
+        def close_idle():
+            closed.append("idle")
+            drainer.unregister("idle")
+        drainer.register("idle", close=close_idle)
+        drainer.register("busy", close=lambda: closed.append("busy"))
+        drainer.set_idle("idle", True)
+        drainer.request_stop()
+        self.assertTrue(drainer.stopping.is_set())
+        finisher = threading.Timer(0.2, drainer.unregister, ("busy",))
+        finisher.start()
+        self.assertEqual(drainer.drain(timeout=5), (2, 0))
+        # Only the idle one was closed, the busy one finished by itself
+        self.assertEqual(closed, ["idle"])
+        finisher.join()
+
+    def test_idle_after_stop_is_closed_at_once(self):
+        closed = []
+        drainer = ConnectionDrainer()
+        drainer.register("conn", close=lambda: closed.append("conn"))
+        drainer.request_stop()
+        drainer.set_idle("conn", True)
+        self.assertEqual(closed, ["conn"])
+
+    def test_deadline_aborts_the_rest(self):
+        aborted = []
+        drainer = ConnectionDrainer()
+        drainer.register("busy", close=lambda: None, abort=lambda: aborted.append("busy"))
+        drainer.request_stop()
+        started = time.monotonic()
+        self.assertEqual(drainer.drain(timeout=0.2), (0, 1))
+        self.assertLess(time.monotonic() - started, 2)
+        self.assertEqual(aborted, ["busy"])
+        self.assertEqual(drainer.pending(), 0)
+
+    def test_second_stop_ends_the_drain(self):
+        drainer = ConnectionDrainer()
+        drainer.request_stop()
+        self.assertFalse(drainer.deadline_passed(time.monotonic() + 60))
+        drainer.request_stop()
+        self.assertTrue(drainer.deadline_passed(time.monotonic() + 60))
+
+    def test_linger_close_keeps_the_response(self):
+        client, conn = socket.socketpair()
+        self.addCleanup(client.close)
+        # Unread input would make a plain close reset the connection
+        client.sendall(b"x" * 1000)
+        conn.sendall(b"HTTP/1.1 503 Service Unavailable\r\n\r\n")
+        threading.Timer(0.1, client.shutdown, (socket.SHUT_WR,)).start()
+        linger_close(conn, timeout=2)
+        self.assertEqual(client.recv(1024), b"HTTP/1.1 503 Service Unavailable\r\n\r\n")
+        self.assertEqual(client.recv(1024), b"")
+
+
+class GracefulShutdownTest(unittest.TestCase):
+
+    options = {"engine": "thread"}
+
+    def start(self, **options):
+        self.process, self.port = start_server(**dict(self.options, **options))
+        self.addCleanup(stop_server, self.process)
+
+    def connect(self):
+        sock = socket.create_connection(('127.0.0.1', self.port), timeout=10)
+        self.addCleanup(sock.close)
+        return sock
+
+    def test_in_flight_request_finishes(self):
+        self.start(drain_timeout=5)
+        idle = self.connect()
+        idle.sendall(b"GET /hello HTTP/1.1\r\nHost: test\r\n\r\n")
+        self.assertEqual(read_response(idle)[0], 200)
+        busy = self.connect()
+        busy.sendall(b"GET /sleep/1.0 HTTP/1.1\r\nHost: test\r\n\r\n")
+        time.sleep(0.3)
+        self.process.terminate()
+        # Closed at once, no request was in progress on it
+        self.assertEqual(idle.recv(1024), b"")
+        status, headers, body = read_response(busy)
+        self.assertEqual(status, 200)
+        self.assertEqual(headers['connection'], 'close')
+        self.assertEqual(body, b'{"slept": 1.0}')
+        self.assertEqual(self.process.wait(timeout=10), 0)
+        with self.assertRaises(OSError):
+            socket.create_connection(('127.0.0.1', self.port), timeout=1)
+
+    def test_drain_deadline(self):
+        self.start(drain_timeout=0.5)
+        busy = self.connect()
+        busy.sendall(b"GET /sleep/3 HTTP/1.1\r\nHost: test\r\n\r\n")
+        time.sleep(0.3)
+        started = time.monotonic()
+        self.process.terminate()
+        # Closed by force at the deadline, long before the hook returns
+        try:
+            self.assertEqual(busy.recv(1024), b"")
+        except ConnectionResetError:
+            pass
+        self.assertLess(time.monotonic() - started, 2)
+        self.assertEqual(self.process.wait(timeout=10), 0)
+
+
+class AsyncGracefulShutdownTest(GracefulShutdownTest):
+
+    options = {"engine": "asyncio"}
+
+
+if __name__ == '__main__':
+    unittest.main()
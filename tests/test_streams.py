@@ -0,0 +1,173 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+Streamed hook responses: chunked framing, close-delimited bodies for
+HTTP/1.0 clients, a 500 for a hook failing before its first chunk and an
+aborted connection for one failing later.
+"""
+
+import json
+import unittest
+
+from support import ServerTestCase, read_response
+
+from daemon.httpadapter import (HttpAdapter, frame_chunk, guess_content_type,
+                                is_stream, prefetch_stream)
+
+
+def read_chunked(sock):
+    """Read a chunked body to its last chunk."""
+    body = b""
+    data = b""
+    while True:
+        while b"\r\n" not in data:
+            data += sock.recv(65536)
+        line, _, data = data.partition(b"\r\n")
+        size = int(line, 16)
+        while len(data) < size + 2:
+            data += sock.recv(65536)
+        body += data[:size]
+        data = data[size + 2:]
+        if not size:
+            return body
+
+
+class StreamHelpersTest(unittest.TestCase):
+
+    def test_is_stream(self):
+        async def agen():
+            yield b""
+        self.assertTrue(is_stream(iter([])))
+        self.assertTrue(is_stream(x for x in "ab"))
+        self.assertTrue(is_stream(agen()))
+        for body in ("text", b"bytes", {"a": 1}, [1, 2], (1,)):
+            self.assertFalse(is_stream(body))
+
+    def test_frame_chunk(self):
+        self.assertEqual(frame_chunk(b"x" * 26, True), b"1a\r\n" + b"x" * 26 + b"\r\n")
+        self.assertEqual(frame_chunk(b"abc", False), b"abc")
+
+    def test_guess_content_type(self):
+        self.assertEqual(guess_content_type(b'  {"a": 1}'), 'application/json')
+        self.assertEqual(guess_content_type("<p>"), 'text/html; charset=utf-8')
+        self.assertEqual(guess_content_type("plain"), 'text/plain; charset=utf-8')
+
+    def test_prefetch_keeps_the_first_chunk(self):
+        pulled = []
+
+        def chunks():
+            for chunk in ("a", "b"):
+                pulled.append(chunk)
+                yield chunk
+        stream = prefetch_stream(chunks())
+        self.assertEqual(pulled, ["a"])
+        self.assertEqual(list(stream), ["a", "b"])
+
+    def test_prefetch_raises_early_failure(self):
+        def chunks():
+            raise RuntimeError("no data")
+            yield "never"
+        with self.assertRaises(RuntimeError):
+            prefetch_stream(chunks())
+
+    def test_encoded_stream(self):
+        adapter = HttpAdapter("127.0.0.1", 8000, None, None, {})
+        parts = list(adapter.build_stream_response(iter([b"ab", "", "c"])))
+        self.assertTrue(parts[0].startswith(b"HTTP/1.1 200 OK\r\n"))
+        self.assertIn(b"Transfer-Encoding: chunked\r\n", parts[0])
+        self.assertIn(b"Content-Type: text/plain", parts[0])
+        self.assertEqual(parts[1:], [b"2\r\nab\r\n", b"1\r\nc\r\n", b"0\r\n\r\n"])
+
+    def test_failure_mid_stream_aborts(self):
+        def chunks():
+            yield "first"
+            raise RuntimeError("no more data")
+        adapter = HttpAdapter("127.0.0.1", 8000, None, None, {})
+        parts = adapter.build_stream_response(chunks())
+        next(parts)
+        next(parts)
+        with self.assertRaises(ConnectionAbortedError):
+            next(parts)
+
+
+class StreamTest(ServerTestCase):
+
+    options = {"engine": "thread"}
+
+    def get(self, path):
+        sock = self.connect()
+        sock.sendall("GET {} HTTP/1.1\r\nHost: test\r\n\r\n".format(path).encode())
+        return sock
+
+    def test_stream_is_chunked(self):
+        sock = self.get("/count/3")
+        status, headers, _ = read_response(sock, head=True)
+        self.assertEqual(status, 200)
+        self.assertEqual(headers['transfer-encoding'], 'chunked')
+        self.assertEqual(read_chunked(sock), b"0\n1\n2\n")
+
+    def test_empty_stream(self):
+        sock = self.get("/count/0")
+        status, _, _ = read_response(sock, head=True)
+        self.assertEqual(status, 200)
+        self.assertEqual(read_chunked(sock), b"")
+
+    def test_async_generator_stream(self):
+        sock = self.get("/count-async/3")
+        status, headers, _ = read_response(sock, head=True)
+        self.assertEqual(status, 200)
+        self.assertEqual(headers['transfer-encoding'], 'chunked')
+        self.assertEqual(read_chunked(sock), b"0\n1\n2\n")
+
+    def test_http10_stream_is_close_delimited(self):
+        sock = self.connect()
+        sock.sendall(b"GET /count/3 HTTP/1.0\r\nConnection: keep-alive\r\n\r\n")
+        status, headers, body = read_response(sock)
+        self.assertEqual(status, 200)
+        self.assertNotIn('transfer-encoding', headers)
+        self.assertEqual(headers['connection'], 'close')
+        self.assertEqual(body, b"0\n1\n2\n")
+
+    def test_failure_mid_stream_cuts_the_connection(self):
+        sock = self.get("/fail-late")
+        status, _, _ = read_response(sock, head=True)
+        self.assertEqual(status, 200)
+        data = b""
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            data += chunk
+        # The client sees a truncated body, never a complete one
+        self.assertEqual(data, b"6\r\nfirst\n\r\n")
+
+    def assert_internal_error(self, path):
+        status, headers, body = read_response(self.get(path))
+        self.assertEqual(status, 500)
+        self.assertEqual(headers['content-type'], 'application/json')
+        self.assertIn("no data", json.loads(body)['message'])
+
+    def test_failure_before_first_chunk(self):
+        self.assert_internal_error("/fail-early")
+
+    def test_async_failure_before_first_chunk(self):
+        self.assert_internal_error("/fail-early-async")
+
+
+class AsyncStreamTest(StreamTest):
+
+    options = {"engine": "asyncio"}
+
+
+if __name__ == '__main__':
+    unittest.main()
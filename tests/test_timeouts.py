@@ -0,0 +1,203 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+Connection timeouts are armed on one timer wheel per phase. Body and write
+timeouts are inactivity timeouts: a client trickling its upload, or
+reading the response slowly, for longer than the timeout is still served,
+while a stalled one is cut. The header timeout bounds the whole header.
+"""
+
+import json
+import socket
+import threading
+import time
+import unittest
+
+from app import BLOB_SIZE
+from support import ServerTestCase, read_response
+
+from daemon.timers import Deadline, TimerWheel, phase_timeouts
+
+#: Bytes of the trickled upload, sent in ``PIECE`` byte pieces.
+UPLOAD_SIZE = 40000
+PIECE = 1000
+
+
+class TimerWheelTest(unittest.TestCase):
+
+    def advance(self, wheel, ticks):
+        fired = []
+        for _ in range(ticks):
+            fired += [callback() for callback in wheel._advance()]
+        return fired
+
+    def test_timer_fires_on_its_tick(self):
+        wheel = TimerWheel(tick=1, slots=8)
+        wheel.schedule(2, lambda: "a")
+        # Up to one tick late, never early
+        self.assertEqual(self.advance(wheel, 2), [])
+        self.assertEqual(self.advance(wheel, 1), ["a"])
+        self.assertEqual((wheel.pending(), wheel.expired), (0, 1))
+
+    def test_delay_longer_than_a_turn(self):
+        wheel = TimerWheel(tick=1, slots=4)
+        wheel.schedule(10, lambda: "late")
+        self.assertEqual(self.advance(wheel, 10), [])
+        self.assertEqual(self.advance(wheel, 1), ["late"])
+
+    def test_cancel(self):
+        wheel = TimerWheel(tick=1, slots=8)
+        timer = wheel.schedule(1, lambda: "a")
+        self.assertEqual(wheel.pending(), 1)
+        timer.cancel()
+        self.assertEqual(self.advance(wheel, 8), [])
+
+    def test_expiry_thread(self):
+        fired = threading.Event()
+        wheel = TimerWheel(tick=0.02)
+        wheel.start()
+        wheel.schedule(0.05, fired.set)
+        self.assertTrue(fired.wait(2))
+
+
+class FakeTimer:
+
+    cancelled = False
+
+    def __init__(self, delay, callback):
+        self.delay = delay
+        self.callback = callback
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class DeadlineTest(unittest.TestCase):
+
+    def setUp(self):
+        self.timers = []
+        self.aborted = []
+        self.deadline = Deadline(self.schedule, lambda: self.aborted.append(True),
+                                 {"header": 1, "body": 1, "write": 0, "keepalive": 5})
+
+    def schedule(self, delay, callback):
+        timer = FakeTimer(delay, callback)
+        self.timers.append(timer)
+        return timer
+
+    def test_expired_phase_aborts(self):
+        self.deadline.start("header")
+        self.timers[-1].callback()
+        self.assertEqual((self.aborted, self.deadline.expired), ([True], "header"))
+
+    def test_next_phase_replaces_the_timer(self):
+        self.deadline.start("keepalive")
+        self.deadline.start("header")
+        self.assertTrue(self.timers[0].cancelled)
+        self.assertEqual(self.timers[1].delay, 1)
+        # A timer firing after its phase ended does nothing
+        self.timers[0].callback()
+        self.deadline.stop()
+        self.timers[1].callback()
+        self.assertEqual(self.aborted, [])
+
+    def test_disabled_phase(self):
+        self.deadline.start("write")
+        self.assertEqual(self.timers, [])
+
+    def test_progress_rearms_an_idle_phase(self):
+        self.deadline.start("body")
+        time.sleep(0.2)
+        self.deadline.touch()
+        self.timers[-1].callback()
+        self.assertEqual(self.aborted, [])
+        # Only the rest of the timeout since the last progress
+        self.assertLess(self.timers[-1].delay, 1)
+
+    def test_progress_does_not_extend_the_header(self):
+        self.deadline.start("header")
+        self.deadline.touch()
+        self.timers[-1].callback()
+        self.assertEqual(self.aborted, [True])
+
+    def test_phase_timeouts(self):
+        self.assertEqual(phase_timeouts({"header_timeout": 1, "body_timeout": 2,
+                                         "write_timeout": 3, "keepalive_timeout": 4}),
+                         {"header": 1, "body": 2, "write": 3, "keepalive": 4})
+
+
+class ThreadTimeoutTest(ServerTestCase):
+
+    options = {"engine": "thread", "header_timeout": 1, "body_timeout": 1, "write_timeout": 1}
+
+    def test_trickled_upload_completes(self):
+        sock = self.connect()
+        sock.sendall("POST /echo HTTP/1.1\r\nHost: test\r\n"
+                     "Content-Length: {}\r\n\r\n".format(UPLOAD_SIZE).encode())
+        start = time.monotonic()
+        for _ in range(UPLOAD_SIZE // PIECE):
+            sock.sendall(b"a" * PIECE)
+            time.sleep(0.06)
+        self.assertGreater(time.monotonic() - start, 2)
+        status, _, body = read_response(sock)
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(body), {"size": UPLOAD_SIZE})
+
+    def test_slowly_read_download_completes(self):
+        sock = self.connect()
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 65536)
+        sock.sendall(b"GET /blob HTTP/1.1\r\nHost: test\r\n\r\n")
+        start = time.monotonic()
+        received = 0
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            received += len(chunk)
+            if received >= BLOB_SIZE:
+                break
+            time.sleep(0.025)
+        self.assertGreater(time.monotonic() - start, 2)
+        self.assertGreaterEqual(received, BLOB_SIZE)
+
+    def test_stalled_upload_is_cut(self):
+        sock = self.connect()
+        sock.sendall(b"POST /echo HTTP/1.1\r\nHost: test\r\n"
+                     b"Content-Length: 100\r\n\r\nabc")
+        self.assertEqual(sock.recv(65536), b"")
+
+    def test_trickled_header_is_cut(self):
+        sock = self.connect()
+        start = time.monotonic()
+        try:
+            for byte in b"GET /hello HTTP/1.1\r\nHost: test\r\n" + b"X" * 100:
+                sock.sendall(bytes([byte]))
+                time.sleep(0.05)
+        except OSError:
+            pass
+        self.assertLess(time.monotonic() - start, 4)
+
+    def test_silent_client_is_cut(self):
+        sock = self.connect()
+        start = time.monotonic()
+        self.assertEqual(sock.recv(65536), b"")
+        self.assertLess(time.monotonic() - start, 4)
+
+
+class AsyncTimeoutTest(ThreadTimeoutTest):
+
+    options = {"engine": "asyncio", "header_timeout": 1, "body_timeout": 1, "write_timeout": 1}
+
+
+if __name__ == '__main__':
+    unittest.main()
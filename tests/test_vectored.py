@@ -0,0 +1,154 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+Responses are written as lists of segments with vectored writes: the
+header is never joined with the body, and partial writes resume where the
+socket stopped.
+"""
+
+import asyncio
+import unittest
+
+import support  # noqa: F401, puts the daemon package on the path
+
+from daemon.request import Request
+from daemon.response import (MAX_SEGMENTS, WRITE_CHUNK, FileBody, Response,
+                             SegmentedResponse, next_chunk, send_vectored, write_async)
+
+
+class VectoredSocket:
+    """Socket stand-in accepting at most ``limit`` bytes per ``sendmsg``."""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.calls = []
+        self.data = b""
+
+    def sendmsg(self, buffers):
+        self.calls.append(len(buffers))
+        data = b"".join(bytes(buf) for buf in buffers)[:self.limit]
+        self.data += data
+        return len(data)
+
+
+class PlainSocket:
+    """Socket stand-in without ``sendmsg``."""
+
+    def __init__(self):
+        self.data = b""
+
+    def sendall(self, data):
+        self.data += bytes(data)
+
+
+class RecordingWriter:
+    """StreamWriter stand-in recording the buffers written."""
+
+    def __init__(self):
+        self.buffers = []
+        self.drains = 0
+
+    def writelines(self, buffers):
+        self.buffers.extend(buffers)
+
+    async def drain(self):
+        self.drains += 1
+
+
+class NextChunkTest(unittest.TestCase):
+
+    def test_segment_limit(self):
+        buffers = [b"x"] * (MAX_SEGMENTS + 10)
+        self.assertEqual(len(next_chunk(buffers, 0)), MAX_SEGMENTS)
+        self.assertEqual(len(next_chunk(buffers, MAX_SEGMENTS)), 10)
+
+    def test_byte_limit(self):
+        buffers = [b"a" * 10, b"b" * WRITE_CHUNK, b"c"]
+        chunk = next_chunk(buffers, 0)
+        self.assertEqual(len(chunk), 2)
+        self.assertIs(chunk[0], buffers[0])
+        self.assertEqual(sum(len(buf) for buf in chunk), WRITE_CHUNK)
+
+
+class SendVectoredTest(unittest.TestCase):
+
+    def test_partial_writes(self):
+        buffers = [b"HTTP/1.1 200 OK\r\n\r\n", b"hello ", memoryview(b"world"), b"", b"!"]
+        expected = b"".join(bytes(buf) for buf in buffers)
+        calls = []
+        conn = VectoredSocket(limit=7)
+        send_vectored(conn, list(buffers), lambda: calls.append(1))
+        self.assertEqual(conn.data, expected)
+        self.assertEqual(len(calls), len(conn.calls))
+        # Each write hands over the segments left, not one joined buffer
+        self.assertEqual(conn.calls[0], 4)
+
+    def test_one_write_when_the_socket_keeps_up(self):
+        conn = VectoredSocket(limit=1 << 30)
+        send_vectored(conn, [b"head", b"body", b"tail"])
+        self.assertEqual((conn.data, conn.calls), (b"headbodytail", [3]))
+
+    def test_large_segment_is_written_in_chunks(self):
+        data = bytes(i % 256 for i in range(WRITE_CHUNK * 2 + 5))
+        conn = VectoredSocket(limit=1 << 30)
+        send_vectored(conn, [b"head", data])
+        self.assertEqual(conn.data, b"head" + data)
+        self.assertEqual(len(conn.calls), 3)
+
+    def test_without_sendmsg(self):
+        conn = PlainSocket()
+        send_vectored(conn, [b"head", memoryview(b"body")])
+        self.assertEqual(conn.data, b"headbody")
+
+
+class WriteAsyncTest(unittest.TestCase):
+
+    def test_segments_are_written_as_they_are(self):
+        body = memoryview(b"b" * 100)
+        writer = RecordingWriter()
+        asyncio.run(write_async(writer, [b"head", body]))
+        self.assertIs(writer.buffers[1], body)
+        self.assertEqual(writer.drains, 1)
+
+    def test_large_segment_is_drained_in_chunks(self):
+        data = b"d" * (WRITE_CHUNK + 10)
+        calls = []
+        writer = RecordingWriter()
+        asyncio.run(write_async(writer, [b"head", data], lambda: calls.append(1)))
+        self.assertEqual(b"".join(bytes(buf) for buf in writer.buffers), b"head" + data)
+        self.assertEqual((writer.drains, len(calls)), (2, 2))
+
+
+class SegmentedResponseTest(unittest.TestCase):
+
+    def test_segments(self):
+        body = FileBody("/dev/null", 0)
+        resp = SegmentedResponse(b"HEAD", [b"a", body])
+        self.assertEqual(resp.segments(), [b"HEAD", b"a", body])
+        self.assertFalse(resp.in_memory())
+        self.assertTrue(SegmentedResponse(b"HEAD", [b"a"]).in_memory())
+
+    def test_cached_page_is_not_copied(self):
+        req = Request()
+        req.prepare("GET /index.html HTTP/1.1\r\nHost: test\r\n\r\n")
+        resp = Response()
+        segmented = resp.build_response(req)
+        self.assertIsInstance(segmented, SegmentedResponse)
+        self.assertTrue(segmented.header.endswith(b"\r\n\r\n"))
+        self.assertEqual(len(segmented.parts), 1)
+        # The part is the cached content itself
+        self.assertIs(segmented.parts[0], resp._entry.content)
+
+
+if __name__ == '__main__':
+    unittest.main()
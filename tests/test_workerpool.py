@@ -0,0 +1,130 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+The worker pool serves connections on a fixed set of threads, and a full
+accept queue is answered with a fast 503.
+"""
+
+import threading
+import time
+import unittest
+
+from support import ServerTestCase, read_response
+
+from daemon.workerpool import WorkerPool
+
+
+class FakeConn:
+
+    closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class WorkerPoolTest(unittest.TestCase):
+
+    def test_connections_are_served_by_the_workers(self):
+        served = []
+        done = threading.Event()
+
+        def handler(conn, addr):
+            served.append((addr, threading.current_thread().name))
+            if len(served) == 5:
+                done.set()
+
+        pool = WorkerPool(handler, size=2, queue_size=8)
+        pool.start()
+        for i in range(5):
+            self.assertTrue(pool.submit(FakeConn(), i))
+        self.assertTrue(done.wait(5))
+        self.assertEqual(sorted(addr for addr, _ in served), list(range(5)))
+        self.assertTrue(all(name.startswith("backend-worker-") for _, name in served))
+        self.assertEqual(pool.stats()["accepted"], 5)
+
+    def test_full_queue_rejects(self):
+        # Not started: nothing leaves the queue
+        pool = WorkerPool(lambda conn, addr: None, size=1, queue_size=2)
+        self.assertTrue(pool.submit(FakeConn(), 1))
+        self.assertTrue(pool.submit(FakeConn(), 2))
+        self.assertFalse(pool.submit(FakeConn(), 3))
+        self.assertEqual(pool.queue_depth(), 2)
+        stats = pool.stats()
+        self.assertEqual((stats["accepted"], stats["rejected"], stats["queue_depth"]), (2, 1, 2))
+
+    def test_expired_connection_is_not_served(self):
+        served, expired = [], []
+        done = threading.Event()
+
+        def on_expired(conn, addr):
+            expired.append(addr)
+            done.set()
+
+        pool = WorkerPool(lambda conn, addr: served.append(addr), size=1,
+                          queue_size=2, max_wait=0.05, on_expired=on_expired)
+        pool.submit(FakeConn(), 1)
+        time.sleep(0.1)
+        pool.start()
+        self.assertTrue(done.wait(5))
+        self.assertEqual((served, expired), ([], [1]))
+        self.assertEqual(pool.stats()["expired"], 1)
+
+    def test_handler_error_closes_the_connection(self):
+        conn = FakeConn()
+        done = threading.Event()
+
+        def handler(conn, addr):
+            if addr == 2:
+                done.set()
+                return
+            raise RuntimeError("boom")
+
+        pool = WorkerPool(handler, size=1, queue_size=2)
+        pool.start()
+        pool.submit(conn, 1)
+        pool.submit(FakeConn(), 2)
+        # The worker survived the error and served the next connection
+        self.assertTrue(done.wait(5))
+        self.assertTrue(conn.closed)
+
+
+class PoolEngineTest(ServerTestCase):
+
+    options = {"engine": "pool", "pool_size": 1, "queue_size": 1}
+
+    def test_full_queue_is_answered_with_503(self):
+        # The only worker holds an idle keep-alive connection, once the
+        # startup probe of the server left the queue
+        for _ in range(50):
+            busy = self.connect()
+            busy.sendall(b"GET /hello HTTP/1.1\r\nHost: test\r\n\r\n")
+            if read_response(busy)[0] == 200:
+                break
+            time.sleep(0.05)
+        else:
+            self.fail("No connection served")
+        queued = self.connect()
+        time.sleep(0.2)
+        shed = self.connect()
+        status, headers, body = read_response(shed)
+        self.assertEqual(status, 503)
+        self.assertIn('retry-after', headers)
+        self.assertEqual(body, b"503 Service Unavailable")
+        # The queued connection is served once the worker is free
+        busy.close()
+        queued.sendall(b"GET /hello HTTP/1.1\r\nHost: test\r\nConnection: close\r\n\r\n")
+        self.assertEqual(read_response(queued)[0], 200)
+
+
+if __name__ == '__main__':
+    unittest.main()